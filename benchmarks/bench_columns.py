@@ -0,0 +1,67 @@
+"""Benchmark des filtres et regroupements sur la vue en colonnes.
+
+Compare, sur un catalogue synthétique, le parcours attribut par attribut
+d'une liste de `Film` (ancien code de `get_approved_films`,
+`load_filter_data`, regroupement par genre de la grille) à `FilmColumns`,
+avec les tableaux `array` seuls puis avec NumPy s'il est installé.
+
+Usage : python benchmarks/bench_columns.py [taille1 taille2 ...]
+"""
+
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_search import make_catalogue
+from core.columns import HAVE_NUMPY, FilmColumns
+
+
+def median_ms(fn, repeat: int = 7) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def scenarios(films, columns):
+    """(nom, parcours de la liste, équivalent sur les colonnes)"""
+    return [
+        ("films approuvés", lambda: [f for f in films if f.approved],
+         lambda: columns.select_films(approved=True)),
+        ("nb par genre (approuvés)", lambda: Counter(f.genre for f in films if f.approved),
+         lambda: columns.count_by('genre', approved=True)),
+        ("années distinctes", lambda: sorted(set(f.release_date.year for f in films)),
+         lambda: columns.distinct('year')),
+        ("genre + décennie", lambda: [f for f in films if f.genre == "Drama" and 1990 <= f.release_date.year <= 1999],
+         lambda: columns.select_films(genre="Drama", start_year=1990, end_year=1999)),
+        ("nb genre + décennie", lambda: sum(1 for f in films if f.genre == "Drama" and 1990 <= f.release_date.year <= 1999),
+         lambda: columns.count(genre="Drama", start_year=1990, end_year=1999)),
+    ]
+
+
+def main(sizes):
+    modes = [False, True] if HAVE_NUMPY else [False]
+    header = f"{'films':>8} | {'opération':<26} | {'liste (ms)':>10} | {'array (ms)':>10}"
+    if HAVE_NUMPY:
+        header += f" | {'numpy (ms)':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        films = make_catalogue(size)
+        results = {}
+        for use_numpy in modes:
+            columns = FilmColumns(films, use_numpy=use_numpy)
+            for name, scan, vectorised in scenarios(films, columns):
+                results.setdefault(name, [median_ms(scan)]).append(median_ms(vectorised))
+        for name, timings in results.items():
+            print(f"{size:>8} | {name:<26} | " + " | ".join(f"{t:>10.2f}" for t in timings))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 300000])
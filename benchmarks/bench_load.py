@@ -0,0 +1,89 @@
+"""Benchmark du chargement du catalogue.
+
+Écrit un films.json synthétique (avec logs) puis compare l'ancien chargement
+(`json.load` du fichier entier, construction de tous les `Film` puis de
+l'index) au chargement en flux de `FilmController` : durée totale, délai
+avant le premier lot affichable et pic mémoire (tracemalloc, mesuré lors
+d'une seconde exécution pour ne pas fausser les durées).
+
+Usage : python benchmarks/bench_load.py [taille1 taille2 ...]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_search import make_catalogue
+from core.filmcontroller import FilmController
+from core.filmindex import FilmIndex
+from core.films import Film
+
+
+def write_catalogue(path: str, size: int) -> None:
+    films = make_catalogue(size)
+    for film in films:
+        for action in ("proposed", "approved", "updated: description updated"):
+            film.add_log(action, 1)
+    data = {'films': [film.to_dict() for film in films], 'next_film_id': size + 1}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def eager_load(path: str):
+    """Ancienne implémentation de _load_films (fichier décodé en entier, puis indexé)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    films = {film_data['id']: Film.from_dict(film_data) for film_data in data.get('films', [])}
+    return FilmIndex(films.values())
+
+
+def streaming_load(path: str):
+    """Retourne le contrôleur chargé et le délai avant le premier lot affichable"""
+    start = time.perf_counter()
+    controller = FilmController(path, storage='json', autoload=False)
+    first_batch = None
+    for _ in controller.iter_load():
+        if first_batch is None:
+            first_batch = time.perf_counter() - start
+    return controller, first_batch
+
+
+def profile(fn):
+    """Durée d'une exécution, puis pic mémoire d'une seconde exécution sous tracemalloc"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(sizes):
+    print(f"{'films':>8} | {'Mo':>6} | {'json.load (s)':>13} | {'pic (Mo)':>8} | "
+          f"{'flux (s)':>8} | {'1er lot (s)':>11} | {'pic (Mo)':>8}")
+    print("-" * 82)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            path = os.path.join(tmp_dir, "films.json")
+            write_catalogue(path, size)
+            file_mb = os.path.getsize(path) / 2**20
+
+            _, eager_s, eager_peak = profile(lambda: eager_load(path))
+            (_, first_batch), stream_s, stream_peak = profile(lambda: streaming_load(path))
+            print(f"{size:>8} | {file_mb:>6.1f} | {eager_s:>13.2f} | {eager_peak / 2**20:>8.1f} | "
+                  f"{stream_s:>8.2f} | {first_batch:>11.3f} | {stream_peak / 2**20:>8.1f}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 300000])
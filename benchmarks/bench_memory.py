@@ -0,0 +1,108 @@
+"""Benchmark de l'empreinte mémoire d'un film.
+
+Construit N films à partir de leur forme JSON (comme au chargement de
+films.json) et rapporte les octets par film mesurés par tracemalloc :
+- avant : ancien `Film` (objet avec __dict__, logs en liste de dicts,
+  genres et actions dupliqués film par film) ;
+- après : `Film` à __slots__, genre partagé, logs compacts (`FilmLogs`) ;
+- après, logs non consultés : logs gardés en texte JSON (chargement en flux).
+
+Usage : python benchmarks/bench_memory.py [taille1 taille2 ...]
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_search import GENRES, SYLLABLES
+from core.films import Film
+
+
+class LegacyFilm:
+    """Ancienne représentation (avant __slots__ et logs compacts)"""
+
+    def __init__(self, id, title, genre, release_date, poster_path="", trailer_url="",
+                 description="", approved=False, added_by_user_id=0, logs=None):
+        self.id = id
+        self.title = title
+        self.genre = genre
+        self.release_date = release_date
+        self.poster_path = poster_path
+        self.trailer_url = trailer_url
+        self.description = description
+        self.approved = approved
+        self.added_by_user_id = added_by_user_id
+        self.logs = logs or []
+        self._listeners = []
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['id'], data['title'], data['genre'], date.fromisoformat(data['release_date']),
+                   data.get('poster_path', ''), data.get('trailer_url', ''), data.get('description', ''),
+                   data.get('approved', False), data.get('added_by_user_id', 0), data.get('logs', []))
+
+
+def film_documents(size: int, seed: int = 42):
+    """Textes JSON des films, générés avant la mesure"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(1, size + 1):
+        title = ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                         for _ in range(rng.randint(1, 4))).title()
+        moment = start + timedelta(seconds=rng.randint(0, 10**7), microseconds=rng.randint(0, 999999))
+        logs = [{'action': action, 'user_id': rng.randint(1, 50),
+                 'timestamp': (moment + timedelta(hours=n)).isoformat(), 'film_id': i}
+                for n, action in enumerate(("proposed", "approved", "updated: description updated"))]
+        yield json.dumps({
+            'id': i, 'title': title, 'genre': rng.choice(GENRES),
+            'release_date': date(rng.randint(1930, 2025), rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+            'poster_path': '', 'trailer_url': '', 'description': '', 'approved': rng.random() < 0.9,
+            'added_by_user_id': rng.randint(1, 50), 'logs': logs
+        })
+
+
+def bytes_per_film(documents, build) -> float:
+    """Mémoire encore allouée une fois les films construits (les textes JSON ne sont pas comptés)"""
+    gc.collect()
+    tracemalloc.start()
+    films = [build(document) for document in documents]
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del films
+    return current / len(documents)
+
+
+def compact_film(document: str) -> Film:
+    film = Film.from_dict(json.loads(document))
+    film.logs  # logs décodés (et compactés), comme après consultation
+    return film
+
+
+def raw_logs_film(document: str) -> Film:
+    # Forme produite par le chargement en flux : logs conservés en texte JSON
+    data = json.loads(document)
+    data['logs'] = json.dumps(data['logs'], separators=(',', ':'))
+    return Film.from_dict(data)
+
+
+def main(sizes):
+    print(f"{'films':>8} | {'avant (o/film)':>14} | {'après (o/film)':>14} | "
+          f"{'gain':>5} | {'logs non lus (o/film)':>21}")
+    print("-" * 76)
+    for size in sizes:
+        documents = list(film_documents(size))
+        before = bytes_per_film(documents, lambda document: LegacyFilm.from_dict(json.loads(document)))
+        after = bytes_per_film(documents, compact_film)
+        raw = bytes_per_film(documents, raw_logs_film)
+        print(f"{size:>8} | {before:>14.0f} | {after:>14.0f} | {before / after:>4.1f}x | {raw:>21.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,66 @@
+"""Benchmark du rendu des affiches et du cache à deux niveaux.
+
+Pour chaque affiche de assets/posters, au format des cartes (160x240 et
+180x270, coins arrondis), compare :
+- à froid : décodage du JPEG pleine taille, mise à l'échelle et arrondi
+  (`render_poster`, ce que faisait chaque carte sur le thread graphique) ;
+- cache disque : relecture de la vignette déjà mise à l'échelle ;
+- cache mémoire : pixmap terminée retrouvée dans la LRU.
+
+Nécessite PyQt5 (plateforme « offscreen » si aucun affichage).
+
+Usage : python benchmarks/bench_posters.py [répétitions]
+"""
+
+import glob
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtGui import QGuiApplication, QPixmap
+from ui.poster_cache import PosterDiskCache, PosterMemoryCache, memory_key, poster_key
+from ui.poster_loader import render_poster
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(repeat):
+    app = QGuiApplication(sys.argv)
+    posters = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'assets', 'posters', '*')))
+    cache_dir = tempfile.mkdtemp()
+    try:
+        disk = PosterDiskCache(cache_dir)
+        memory = PosterMemoryCache()
+        print(f"{'format':>8} | {'affiches':>8} | {'à froid (ms)':>12} | {'disque (ms)':>11} | {'mémoire (ms)':>12}")
+        print("-" * 64)
+        for width, height in ((160, 240), (180, 270)):
+            keys = [poster_key(path, width, height, 8) for path in posters]
+            for key in keys:
+                image = render_poster(key[0], width, height, 8)
+                disk.store(key, image)
+                memory.put(memory_key(key[0], width, height, 8), QPixmap.fromImage(image))
+
+            cold = median_ms(lambda: [render_poster(key[0], width, height, 8) for key in keys], repeat)
+            warm_disk = median_ms(lambda: [disk.load(key) for key in keys], repeat)
+            warm_memory = median_ms(lambda: [memory.get(memory_key(key[0], width, height, 8)) for key in keys], repeat)
+            print(f"{width:>4}x{height:<3} | {len(keys):>8} | {cold:>12.1f} | {warm_disk:>11.1f} | {warm_memory:>12.3f}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    del app
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,73 @@
+"""Benchmark de la recherche par sous-chaîne de titre.
+
+Compare, pour plusieurs tailles de catalogue, la latence d'une recherche par
+parcours linéaire (ancien `search_films`) et celle de l'index de trigrammes
+de `FilmIndex`.
+
+Usage : python benchmarks/bench_search.py [taille1 taille2 ...]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.films import Film
+from core.filmindex import FilmIndex
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "to", "ne", "su", "vi", "da", "po",
+             "re", "zu", "fa", "ti", "go", "be", "xo", "ly", "qu", "an"]
+GENRES = ["Action", "Comedy", "Drama", "Science-Fiction", "Horror",
+          "Romance", "Thriller", "Animation", "Documentary", "Adventure"]
+QUERIES = ["kalo", "mira ne", "suvi", "dapo re", "xoly", "quan"]
+
+
+def make_catalogue(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    films = []
+    for i in range(1, size + 1):
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 4))]
+        films.append(Film(
+            id=i,
+            title=' '.join(words).title(),
+            genre=rng.choice(GENRES),
+            release_date=date(rng.randint(1930, 2025), rng.randint(1, 12), rng.randint(1, 28)),
+            approved=rng.random() < 0.9,
+        ))
+    return films
+
+
+def linear_search(films, q):
+    """Ancienne implémentation : parcours complet et lower() à chaque appel"""
+    q = q.strip().lower()
+    return [f for f in films if f.approved and q in f.title.lower()]
+
+
+def measure(fn, repeat: int = 7) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(sizes):
+    print(f"{'films':>10} | {'linéaire (ms)':>14} | {'index (ms)':>11} | {'résultats':>9}")
+    print("-" * 54)
+    for size in sizes:
+        films = make_catalogue(size)
+        index = FilmIndex(films)
+        linear_ms = sum(measure(lambda: linear_search(films, q)) for q in QUERIES) / len(QUERIES)
+        index_ms = sum(measure(lambda: index.search(title=q)) for q in QUERIES) / len(QUERIES)
+        hits = sum(len(index.search(title=q)) for q in QUERIES) // len(QUERIES)
+        print(f"{size:>10} | {linear_ms:>14.2f} | {index_ms:>11.3f} | {hits:>9}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000, 500000])
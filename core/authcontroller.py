@@ -1,24 +1,27 @@
-import json
-import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from core.users import User
 from core.admins import Admin
+from core.storage import StorageBackend, open_storage
 
 class AuthController:
-    def __init__(self, users_file: str = "data/users.json"):
+    def __init__(self, users_file: str = "data/users.json",
+                 storage: Union[str, StorageBackend, None] = None):
         self.users_file = users_file
         self.current_user: Optional[User] = None
         self.users: Dict[int, User] = {}
+
+        # Même moteur de stockage que le catalogue (voir core/storage.py)
+        self.storage = open_storage(users_file, 'users', storage)
+
         self._load_users()
 
     def _load_users(self) -> None:
-        """Charge les utilisateurs depuis le fichier JSON"""
+        """Charge les utilisateurs depuis le moteur de stockage configuré"""
         try:
-            if os.path.exists(self.users_file):
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            data = self.storage.load()
 
+            if data:
                 for user_data in data.get('users', []):
                     if user_data.get('user_type') == 'admin':
                         user = Admin.from_dict(user_data)
@@ -30,39 +33,28 @@ class AuthController:
             print(f"Erreur chargement utilisateurs: {e}")
             self.users = {}
 
-    def _save_users(self) -> bool:
-        """Sauvegarde les utilisateurs dans le fichier JSON"""
-        try:
-            # If NO_AUTO_SAVE is set, skip saving to avoid accidental overwrites
-            if os.environ.get('NO_AUTO_SAVE') == '1':
-                # Log the attempted save for debugging
-                try:
-                    os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-                    with open(os.path.join(os.path.dirname(self.users_file), 'save_log.txt'), 'a', encoding='utf-8') as logf:
-                        logf.write(f"SKIP SAVE_USERS {self.users_file} at {datetime.now().isoformat()}\n")
-                except Exception:
-                    pass
-                return False
-            # Créer le dossier si nécessaire
-            os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-
-            data = {
-                'users': [user.to_dict() for user in self.users.values()],
-                'last_updated': datetime.now().isoformat()
-            }
-
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            # Log successful save
-            try:
-                with open(os.path.join(os.path.dirname(self.users_file), 'save_log.txt'), 'a', encoding='utf-8') as logf:
-                    logf.write(f"SAVE_USERS {self.users_file} at {datetime.now().isoformat()}\n")
-            except Exception:
-                pass
-            return True
-        except Exception as e:
-            print(f"Erreur sauvegarde utilisateurs: {e}")
-            return False
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Construit le document complet des utilisateurs (contenu de users.json)"""
+        return {
+            'users': [user.to_dict() for user in list(self.users.values())],
+            'last_updated': datetime.now().isoformat()
+        }
+
+    def _save_users(self, changed: Optional[List[User]] = None) -> bool:
+        """
+        Sauvegarde les utilisateurs via le moteur de stockage
+        (les moteurs incrémentaux n'écrivent que les utilisateurs `changed`)
+        """
+        users = changed if changed is not None else list(self.users.values())
+        return self.storage.save(self._snapshot_data, upserts=[user.to_dict() for user in users])
+
+    def flush(self) -> bool:
+        """Écrit immédiatement les mutations en attente"""
+        return self.storage.flush()
+
+    def close(self) -> None:
+        """Termine proprement les écritures en cours"""
+        self.storage.close()
 
     def _get_next_user_id(self) -> int:
         """Génère le prochain ID utilisateur"""
@@ -94,7 +86,7 @@ class AuthController:
 
         if user:
             self.users[user_id] = user
-            if self._save_users():
+            if self._save_users(changed=[user]):
                 return user
             else:
                 # Rollback en cas d'erreur de sauvegarde
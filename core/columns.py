@@ -0,0 +1,318 @@
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from core.films import Film
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# Colonnes dont les comptages (facettes) sont exposés par facets()
+FACETS = ('genre', 'year', 'approved')
+# Types des codes d'une colonne, élargis quand le nombre de valeurs distinctes dépasse leur capacité
+_CODE_TYPES = (('B', 1 << 8), ('H', 1 << 16), ('i', 1 << 31))
+
+
+class DictColumn:
+    """
+    Colonne encodée par dictionnaire : chaque valeur distincte reçoit un code
+    et chaque ligne ne stocke que ce code, dans un tableau d'octets tant
+    qu'il y a moins de 256 valeurs distinctes (genres, années, statut...).
+    Un filtre est évalué une fois par valeur distincte puis appliqué à toute
+    la colonne par table de correspondance.
+    """
+
+    __slots__ = ('values', '_codes', 'codes', 'totals', 'approved_totals')
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self.codes = array('B')
+        # Facettes : nombre de lignes occupées par code, parmi tous les films et parmi
+        # les films approuvés, tenus à jour à chaque mutation (lecture en O(valeurs distinctes))
+        self.totals: List[int] = []
+        self.approved_totals: List[int] = []
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+            self.totals.append(0)
+            self.approved_totals.append(0)
+            for typecode, capacity in _CODE_TYPES:
+                if code < capacity:
+                    if typecode != self.codes.typecode:
+                        self.codes = array(typecode, self.codes)
+                    break
+        return code
+
+    def append(self, value: Any, approved: bool) -> None:
+        code = self._codes.get(value)
+        if code is None:
+            code = self.code(value)
+        self.codes.append(code)
+        self.totals[code] += 1
+        if approved:
+            self.approved_totals[code] += 1
+
+    def set(self, row: int, value: Any, was_approved: bool, approved: bool) -> None:
+        self.discard(row, was_approved)
+        code = self.code(value)
+        self.codes[row] = code
+        self.totals[code] += 1
+        if approved:
+            self.approved_totals[code] += 1
+
+    def discard(self, row: int, approved: bool) -> None:
+        """Ligne devenue morte (ou sur le point de changer) : retirée des totaux"""
+        code = self.codes[row]
+        self.totals[code] -= 1
+        if approved:
+            self.approved_totals[code] -= 1
+
+    def facet(self, approved_only: bool = False) -> Dict[Any, int]:
+        """Nombre de films par valeur (valeurs sans film omises)"""
+        totals = self.approved_totals if approved_only else self.totals
+        return {value: n for value, n in zip(self.values, totals) if n}
+
+    def keep(self, rows: bytes) -> None:
+        """Ne garde que les lignes marquées 1 dans `rows`"""
+        self.codes = array(self.codes.typecode, compress(self.codes, rows))
+
+    def table(self, predicate: Callable[[Any], bool]) -> bytes:
+        """1 pour chaque code dont la valeur vérifie le prédicat, 0 sinon"""
+        return bytes(1 if predicate(value) else 0 for value in self.values)
+
+    def mask(self, predicate: Callable[[Any], bool], use_numpy: bool):
+        """Masque des lignes vérifiant le prédicat (tableau NumPy ou bytes de 0/1)"""
+        table = self.table(predicate)
+        if use_numpy:
+            return np.frombuffer(table, dtype=np.uint8)[np.frombuffer(self.codes, dtype=self.codes.typecode)]
+        if self.codes.typecode == 'B':
+            # Une seule passe en C : chaque octet (code) est remplacé par 0 ou 1
+            return self.codes.tobytes().translate(table.ljust(256, b'\0'))
+        return bytes(table[code] for code in self.codes)
+
+    def counts(self, mask, use_numpy: bool) -> Dict[Any, int]:
+        """Nombre de lignes par valeur parmi les lignes du masque"""
+        if use_numpy:
+            codes = np.frombuffer(self.codes, dtype=self.codes.typecode)[mask.astype(bool)]
+            counts = np.bincount(codes, minlength=len(self.values)).tolist()
+            return {value: n for value, n in zip(self.values, counts) if n}
+        if self.codes.typecode == 'B' and len(self.values) <= 32:
+            # Peu de valeurs (genres, statut) : un comptage en C par valeur
+            selected = bytes(compress(self.codes.tobytes(), mask))
+            counts = [selected.count(code) for code in range(len(self.values))]
+            return {value: n for value, n in zip(self.values, counts) if n}
+        return {self.values[code]: n for code, n in Counter(compress(self.codes, mask)).items()}
+
+
+class FilmColumns:
+    """
+    Vue en colonnes du catalogue pour les filtres, comptages et regroupements.
+
+    Une ligne par film, dans l'ordre d'ajout : id (tableau typé), genre, année,
+    statut d'approbation et id de l'auteur (colonnes encodées par
+    dictionnaire). Les filtres sont évalués colonne par colonne avec NumPy
+    s'il est installé, sinon avec les opérations C de `bytes`/`array`
+    (translate, count, compress) : pas de boucle Python sur les films.
+    Un film retiré laisse une ligne morte, supprimée lors d'un compactage
+    périodique. Le genre est comparé tel quel (sensible à la casse), comme
+    dans les listes de genres de l'interface.
+    """
+
+    # Colonnes disponibles pour les critères, count_by() et distinct()
+    COLUMNS = ('genre', 'year', 'approved', 'user_id')
+
+    def __init__(self, films: Iterable[Film] = (), use_numpy: Optional[bool] = None):
+        self.use_numpy = HAVE_NUMPY if use_numpy is None else use_numpy and HAVE_NUMPY
+        self.clear()
+        for film in films:
+            self.add(film)
+
+    def clear(self) -> None:
+        self.ids = array('q')
+        self.columns: Dict[str, DictColumn] = {name: DictColumn() for name in self.COLUMNS}
+        # Films alignés sur les lignes (None pour une ligne morte) : sélection sans recherche par id
+        self.films: List[Optional[Film]] = []
+        # 1 pour une ligne occupée, 0 pour une ligne morte (film retiré)
+        self.alive = bytearray()
+        self._rows: Dict[int, int] = {}
+        self._dead = 0
+
+    @staticmethod
+    def _values(film: Film) -> Tuple[Any, ...]:
+        """Valeurs du film dans l'ordre de COLUMNS"""
+        return film.genre, film.release_date.year, bool(film.approved), film.added_by_user_id
+
+    # --- Synchronisation avec le catalogue ---
+
+    def add(self, film: Film) -> None:
+        """Ajoute un film en fin de table (ou remet à jour sa ligne s'il est déjà présent)"""
+        if film.id in self._rows:
+            self.update(film)
+            return
+        self._rows[film.id] = len(self.ids)
+        self.ids.append(film.id)
+        self.films.append(film)
+        self.alive.append(1)
+        # Déroulé (chargement de catalogues entiers)
+        genre, year, approved, user_id = self.columns.values()
+        flag = bool(film.approved)
+        genre.append(film.genre, flag)
+        year.append(film.release_date.year, flag)
+        approved.append(flag, flag)
+        user_id.append(film.added_by_user_id, flag)
+
+    def update(self, film: Film) -> None:
+        row = self._rows.get(film.id)
+        if row is None:
+            self.add(film)
+            return
+        was_approved = self._is_approved(row)
+        for column, value in zip(self.columns.values(), self._values(film)):
+            column.set(row, value, was_approved, bool(film.approved))
+
+    def remove(self, film_id: int) -> None:
+        row = self._rows.pop(film_id, None)
+        if row is None:
+            return
+        was_approved = self._is_approved(row)
+        self.alive[row] = 0
+        self.films[row] = None
+        for column in self.columns.values():
+            column.discard(row, was_approved)
+        self._dead += 1
+        if self._dead > max(1024, len(self._rows)):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Supprime les lignes mortes (l'ordre des lignes restantes est conservé)"""
+        alive = bytes(self.alive)
+        self.ids = array('q', compress(self.ids, alive))
+        self.films = list(compress(self.films, alive))
+        for column in self.columns.values():
+            column.keep(alive)
+        self.alive = bytearray(b'\x01' * len(self.ids))
+        self._rows = {film_id: row for row, film_id in enumerate(self.ids)}
+        self._dead = 0
+
+    def _is_approved(self, row: int) -> bool:
+        column = self.columns['approved']
+        return column.values[column.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # --- Requêtes ---
+
+    def _mask(self, genre: Optional[str] = None, approved: Optional[bool] = None,
+              start_year: Optional[int] = None, end_year: Optional[int] = None,
+              user_id: Optional[int] = None):
+        """
+        Masque des lignes retenues par tous les critères : tableau NumPy
+        d'uint8 ou bytes de 0/1 (ET octet par octet fait sur de grands entiers)
+        """
+        predicates = []
+        if genre is not None:
+            predicates.append(('genre', lambda value: value == genre))
+        if approved is not None:
+            predicates.append(('approved', lambda value: value == bool(approved)))
+        if start_year is not None or end_year is not None:
+            predicates.append(('year', lambda value: (start_year is None or value >= start_year)
+                               and (end_year is None or value <= end_year)))
+        if user_id is not None:
+            predicates.append(('user_id', lambda value: value == user_id))
+
+        if self.use_numpy:
+            mask = np.frombuffer(self.alive, dtype=np.uint8).copy()
+            for name, predicate in predicates:
+                mask &= self.columns[name].mask(predicate, True)
+            return mask
+
+        size = len(self.alive)
+        mask = int.from_bytes(self.alive, 'little')
+        for name, predicate in predicates:
+            mask &= int.from_bytes(self.columns[name].mask(predicate, False), 'little')
+        return mask.to_bytes(size, 'little')
+
+    def select(self, **criteria) -> List[int]:
+        """
+        Ids des films correspondant à tous les critères (genre, approved,
+        start_year, end_year, user_id), dans l'ordre d'ajout
+        """
+        return [film.id for film in self.select_films(**criteria)]
+
+    def select_films(self, **criteria) -> List[Film]:
+        """Comme select(), mais retourne directement les films"""
+        mask = self._mask(**criteria)
+        films = self.films
+        if self.use_numpy:
+            if np.count_nonzero(mask) * 8 > len(mask):
+                return list(compress(films, mask.tobytes()))
+            return [films[row] for row in np.flatnonzero(mask).tolist()]
+        if mask.count(1) * 8 > len(mask):
+            return list(compress(films, mask))
+        # Sélection peu dense : on saute directement d'une ligne retenue à la suivante
+        selected, find = [], mask.find
+        row = find(1)
+        while row >= 0:
+            selected.append(films[row])
+            row = find(1, row + 1)
+        return selected
+
+    def count(self, **criteria) -> int:
+        """Nombre de films correspondant aux critères"""
+        mask = self._mask(**criteria)
+        return int(np.count_nonzero(mask)) if self.use_numpy else mask.count(1)
+
+    def count_by(self, column: str, **criteria) -> Dict[Any, int]:
+        """
+        Nombre de films par valeur d'une colonne ('genre', 'year', 'approved'
+        ou 'user_id') parmi les films correspondant aux critères.
+        Ex. count_by('genre', approved=True) -> {'Drame': 1204, 'Action': 980, ...}
+        """
+        if column not in self.columns:
+            raise ValueError(f"Colonne inconnue: {column} (attendu: {', '.join(self.COLUMNS)})")
+        values = self.columns[column]
+        # Sans critère (ou avec approved=True seul) : facettes tenues à jour, pas de passe sur les lignes
+        others = {name: value for name, value in criteria.items() if value is not None}
+        if not others:
+            return values.facet()
+        if others == {'approved': True}:
+            return values.facet(approved_only=True)
+        if others == {'approved': False}:
+            pending = zip(values.values, values.totals, values.approved_totals)
+            return {value: total - approved for value, total, approved in pending if total > approved}
+        return values.counts(self._mask(**criteria), self.use_numpy)
+
+    def facets(self, approved_only: bool = False) -> Dict[str, Dict[Any, int]]:
+        """
+        Comptages par genre, par année et par statut d'approbation, lus sur les
+        totaux incrémentaux (aucune passe sur le catalogue)
+        Ex. {'genre': {'Thriller': 1204, ...}, 'year': {1999: 87, ...}, 'approved': {True: 9000, False: 12}}
+        """
+        return {name: self.columns[name].facet(approved_only) for name in FACETS}
+
+    def facets_for(self, film_ids: Iterable[int]) -> Dict[str, Dict[Any, int]]:
+        """Mêmes comptages, restreints à un ensemble de films (ex. résultats d'une recherche)"""
+        rows = [self._rows[film_id] for film_id in film_ids if film_id in self._rows]
+        facets = {}
+        for name in FACETS:
+            column = self.columns[name]
+            if self.use_numpy and rows:
+                codes = np.frombuffer(column.codes, dtype=column.codes.typecode)[np.array(rows, dtype=np.int64)]
+                counts = enumerate(np.bincount(codes, minlength=len(column.values)).tolist())
+            else:
+                codes = column.codes
+                counts = Counter(codes[row] for row in rows).items()
+            facets[name] = {column.values[code]: n for code, n in counts if n}
+        return facets
+
+    def distinct(self, column: str, **criteria) -> List[Any]:
+        """Valeurs distinctes (triées) d'une colonne parmi les films correspondant aux critères"""
+        return sorted(self.count_by(column, **criteria))
@@ -1,27 +1,145 @@
 import json
 import os
 import shutil
+import stat
+import tempfile
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Microsecondes : deux sauvegardes rapprochées n'ont jamais le même nom
+BACKUP_TIME_FORMAT = '%Y%m%d_%H%M%S_%f'
+LEGACY_BACKUP_TIME_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def fsync_directory(directory: str) -> None:
+    """Rend durable un renommage dans `directory` (sans effet si non supporté)"""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _file_mode(filename: str) -> int:
+    """Droits du fichier existant, sinon ceux d'un fichier créé normalement (0666 moins l'umask)"""
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_json(filename: str, data: Dict[str, Any], indent: Optional[int] = 2,
+                      before_replace: Optional[Callable[[], Any]] = None) -> None:
+    """
+    Écrit `data` dans un fichier temporaire du même dossier, le synchronise
+    sur disque puis remplace `filename` en une opération atomique : en cas
+    d'arrêt brutal, on retrouve l'ancienne ou la nouvelle version, jamais
+    un fichier absent ou tronqué
+    """
+    directory = os.path.dirname(filename)
+    fd, tmp_file = tempfile.mkstemp(dir=directory or '.', prefix=f"{os.path.basename(filename)}.", suffix='.tmp')
+    try:
+        separators = (',', ':') if indent is None else None
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, separators=separators, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp crée le fichier en 0600 : on garde les droits du fichier remplacé
+        os.chmod(tmp_file, _file_mode(filename))
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmp_file, filename)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    fsync_directory(directory)
+
 
 class Database:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", keep_last: int = 5,
+                 keep_hourly: int = 24, keep_daily: int = 7):
         self.data_dir = data_dir
         self.backup_dir = os.path.join(data_dir, "backups")
+        # Rétention des sauvegardes : les N dernières, puis une par heure et une par jour
+        self.keep_last = keep_last
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
         os.makedirs(self.backup_dir, exist_ok=True)
 
     def create_backup(self, filename: str) -> bool:
-        """Crée une sauvegarde du fichier"""
+        """Crée une sauvegarde du fichier puis applique la politique de rétention"""
         try:
             if os.path.exists(filename):
-                backup_name = f"{os.path.basename(filename)}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                backup_name = f"{os.path.basename(filename)}.backup.{datetime.now().strftime(BACKUP_TIME_FORMAT)}"
                 backup_path = os.path.join(self.backup_dir, backup_name)
-                shutil.copy2(filename, backup_path)
+                try:
+                    # Le fichier est toujours remplacé (os.replace), jamais réécrit sur place :
+                    # un lien physique conserve l'ancienne version sans la recopier
+                    os.link(filename, backup_path)
+                except OSError:
+                    shutil.copy2(filename, backup_path)
+                self.prune_backups(filename)
                 return True
         except Exception as e:
             print(f"Erreur création backup: {e}")
         return False
 
+    def list_backups(self, filename: str) -> List[Tuple[datetime, str]]:
+        """Retourne les sauvegardes de `filename`, de la plus récente à la plus ancienne"""
+        prefix = f"{os.path.basename(filename)}.backup."
+        backups = []
+        # data_dir : sauvegardes des anciennes versions, écrites à côté du fichier
+        for directory in (self.backup_dir, self.data_dir):
+            for name in os.listdir(directory):
+                if not name.startswith(prefix):
+                    continue
+                stamp = name[len(prefix):]
+                for time_format in (BACKUP_TIME_FORMAT, LEGACY_BACKUP_TIME_FORMAT):
+                    try:
+                        backups.append((datetime.strptime(stamp, time_format), os.path.join(directory, name)))
+                        break
+                    except ValueError:
+                        continue
+        backups.sort(reverse=True)
+        return backups
+
+    def prune_backups(self, filename: str) -> int:
+        """
+        Supprime les sauvegardes hors politique de rétention : les `keep_last`
+        plus récentes sont gardées, ainsi que la plus récente de chacune des
+        `keep_hourly` dernières heures et des `keep_daily` derniers jours.
+        Retourne le nombre de fichiers supprimés
+        """
+        backups = self.list_backups(filename)
+        keep = {path for _, path in backups[:self.keep_last]}
+        hours, days = set(), set()
+        for stamp, path in backups:
+            hour = stamp.replace(minute=0, second=0, microsecond=0)
+            if hour not in hours and len(hours) < self.keep_hourly:
+                hours.add(hour)
+                keep.add(path)
+            if stamp.date() not in days and len(days) < self.keep_daily:
+                days.add(stamp.date())
+                keep.add(path)
+
+        removed = 0
+        for _, path in backups:
+            if path not in keep:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    print(f"Erreur suppression backup {path}: {e}")
+        return removed
+
     def load_json(self, filename: str) -> Dict[str, Any]:
         """Charge un fichier JSON"""
         try:
@@ -32,18 +150,16 @@ class Database:
             print(f"Erreur chargement {filename}: {e}")
         return {}
 
-    def save_json(self, filename: str, data: Dict[str, Any]) -> bool:
-        """Sauvegarde des données dans un fichier JSON"""
+    def save_json(self, filename: str, data: Dict[str, Any], indent: Optional[int] = 2) -> bool:
+        """Sauvegarde atomique dans un fichier JSON (`indent=None` : format compact)"""
         try:
             # Créer le dossier si nécessaire
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-            # Créer une sauvegarde
-            self.create_backup(filename)
-
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if os.path.dirname(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
 
+            # La sauvegarde est prise juste avant le remplacement, une fois le nouveau contenu écrit
+            atomic_write_json(filename, data, indent=indent,
+                              before_replace=lambda: self.create_backup(filename))
             return True
         except Exception as e:
             print(f"Erreur sauvegarde {filename}: {e}")
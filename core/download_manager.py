@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.downloads import Downloader, YtDlpDownloader
+from core.trailer_cache import TrailerCache
+from core.trailer_stream import StreamingDownload, TrailerStreamServer
+
+
+class DownloadJob:
+    """État d'un téléchargement, partagé par tous ceux qui l'ont demandé"""
+
+    QUEUED = 'queued'
+    DOWNLOADING = 'downloading'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, url: str, quality: str = "", label: str = ""):
+        self.url = url
+        self.quality = quality
+        self.label = label or url
+        self.status = self.QUEUED
+        self.downloaded = 0
+        self.total: Optional[int] = None
+        # Url locale lisible pendant le téléchargement, puis chemin dans le cache
+        # (None une fois DONE tant que la publication est différée : lire stream_url)
+        self.stream_url: Optional[str] = None
+        self.path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.stop = threading.Event()
+        self._listeners: List[Callable[['DownloadJob'], None]] = []
+        self._stream: Optional[StreamingDownload] = None
+
+    @property
+    def percent(self) -> Optional[int]:
+        if self.status == self.DONE:
+            return 100
+        return self.downloaded * 100 // self.total if self.total else None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def __repr__(self):
+        return f"DownloadJob({self.url!r}, {self.status}, {self.percent}%)"
+
+
+class DownloadManager:
+    """
+    Téléchargements de bandes-annonces partagés par toute l'application.
+
+    Au plus `max_workers` téléchargements simultanés, les autres attendent
+    en file. Deux demandes de la même bande-annonce (url, qualité)
+    partagent le même `DownloadJob` ; chaque demandeur enregistre un
+    écouteur, appelé (depuis le thread du téléchargement) à chaque
+    changement d'état ou de pourcentage. Quand le dernier écouteur se
+    retire (`release`), le téléchargement est annulé de façon coopérative
+    et son fichier partiel supprimé. Tant qu'un téléchargement est en file
+    ou en cours, le préchargement en arrière-plan est suspendu.
+    """
+
+    def __init__(self, cache: TrailerCache, downloader: Optional[Downloader] = None,
+                 max_workers: int = 2, server: Optional[TrailerStreamServer] = None,
+                 buffer_bytes: int = 2 * 2**20, prefetcher=None, history: int = 20):
+        self.cache = cache
+        self.downloader = downloader or YtDlpDownloader()
+        self.server = server
+        self.buffer_bytes = buffer_bytes
+        self.prefetcher = prefetcher
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="trailer-download")
+        self._cond = threading.Condition()
+        self._active: Dict[Tuple[str, str], DownloadJob] = {}
+        self._history = deque(maxlen=history)
+        self._closed = False
+
+    def request(self, url: str, quality: str = "",
+                listener: Optional[Callable[[DownloadJob], None]] = None, label: str = "") -> DownloadJob:
+        """Téléchargement de url (existant, en cache ou nouveau) ; listener reçoit l'état initial"""
+        path = self.cache.get(url, quality)
+        if path:
+            job = DownloadJob(url, quality, label)
+            job.status, job.path = DownloadJob.DONE, path
+        else:
+            with self._cond:
+                job = self._active.get((url, quality))
+                if job is not None and job.stop.is_set():
+                    if job.status == DownloadJob.QUEUED:
+                        job.stop.clear()  # abandonné puis redemandé avant d'avoir démarré
+                    else:
+                        job = None  # en cours d'annulation : on recommence à côté
+                if job is None:
+                    if self._closed:
+                        raise RuntimeError("Gestionnaire de téléchargements fermé")
+                    job = DownloadJob(url, quality, label)
+                    was_idle = not self._active
+                    self._active[(url, quality)] = job
+                    if was_idle and self.prefetcher:
+                        self.prefetcher.begin_foreground()
+                    self._executor.submit(self._run, job)
+                if listener:
+                    job._listeners.append(listener)
+        if listener:
+            listener(job)
+        return job
+
+    def release(self, job: DownloadJob, listener: Optional[Callable[[DownloadJob], None]] = None) -> None:
+        """Le demandeur ne suit plus job ; s'il était le dernier, le téléchargement est annulé"""
+        with self._cond:
+            if listener in job._listeners:
+                job._listeners.remove(listener)
+            if job._listeners:
+                return
+            stream = job._stream
+            if not job.finished:
+                job.stop.set()
+                return
+        # Terminé : l'url locale n'est plus utile (et la publication différée a lieu)
+        if stream is not None:
+            self._close_stream(job)
+
+    def cancel(self, job: DownloadJob) -> None:
+        """Annule job même si d'autres le suivent (ils reçoivent l'état CANCELLED)"""
+        job.stop.set()
+
+    def jobs(self) -> List[DownloadJob]:
+        """Téléchargements en file ou en cours, puis les derniers terminés (vue de la file)"""
+        with self._cond:
+            return list(self._active.values()) + list(reversed(self._history))
+
+    def queue_position(self, job: DownloadJob) -> int:
+        """Nombre de téléchargements en file avant job"""
+        with self._cond:
+            queued = [other for other in self._active.values() if other.status == DownloadJob.QUEUED]
+        return queued.index(job) if job in queued else 0
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, wait: bool = False) -> None:
+        """Annule tout ; les threads s'arrêtent au bloc suivant"""
+        with self._cond:
+            self._closed = True
+            for job in self._active.values():
+                job.stop.set()
+        self._executor.shutdown(wait=wait)
+
+    def _notify(self, job: DownloadJob) -> None:
+        with self._cond:
+            listeners = list(job._listeners)
+        for listener in listeners:
+            try:
+                listener(job)
+            except Exception as e:
+                print(f"Erreur dans un écouteur de téléchargement: {e}")
+
+    def _run(self, job: DownloadJob) -> None:
+        with self._cond:
+            cancelled = job.stop.is_set()
+            if not cancelled:
+                job.status = DownloadJob.DOWNLOADING
+        if cancelled:
+            self._finish(job, DownloadJob.CANCELLED)
+            return
+        self._notify(job)
+
+        def on_ready(stream_url: str) -> None:
+            job.stream_url = stream_url
+            self._notify(job)
+
+        def on_progress(done: int, total: Optional[int]) -> None:
+            # Un appel par pourcentage (par Mo si la taille est inconnue), pas par bloc
+            before = job.percent, job.downloaded // 2**20
+            job.downloaded, job.total = done, total
+            if (job.percent, job.downloaded // 2**20) != before:
+                self._notify(job)
+
+        stream = StreamingDownload(self.cache, job.url, job.quality, self.downloader, self.server,
+                                   self.buffer_bytes, on_ready=on_ready, on_progress=on_progress)
+        stream.stop = job.stop
+        job._stream = stream
+        try:
+            job.path = stream.run()
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+        # Sans chemin si la publication est différée (fichier encore ouvert sous
+        # Windows) : terminé quand même, publié au `release` du dernier écouteur
+        if stream.succeeded:
+            self._finish(job, DownloadJob.DONE)
+        else:
+            stream.close()
+            self._finish(job, DownloadJob.CANCELLED if job.stop.is_set() else DownloadJob.FAILED)
+
+    def _finish(self, job: DownloadJob, status: str) -> None:
+        with self._cond:
+            job.status = status
+            if self._active.get((job.url, job.quality)) is job:
+                del self._active[(job.url, job.quality)]
+                if not self._active and self.prefetcher:
+                    self.prefetcher.end_foreground()
+            self._history.append(job)
+            release = not job._listeners and job._stream is not None and status == DownloadJob.DONE
+            self._cond.notify_all()
+        self._notify(job)
+        if release:
+            self._close_stream(job)
+
+    def _close_stream(self, job: DownloadJob) -> None:
+        job._stream.close()
+        if job.path is None and job.status == DownloadJob.DONE:
+            job.path = job._stream.path
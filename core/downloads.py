@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    import yt_dlp
+    HAVE_YT_DLP = True
+except ImportError:
+    HAVE_YT_DLP = False
+
+# Signature d'un téléchargeur : (url, qualité, fichier de destination, on_progress).
+# on_progress(octets reçus, taille totale exacte ou None) est appelé à chaque bloc écrit ;
+# il peut lever DownloadCancelled, ce qui doit interrompre le téléchargement.
+Downloader = Callable[[str, str, str, Callable[[int, Optional[int]], None]], None]
+
+
+class DownloadCancelled(Exception):
+    """Téléchargement interrompu à la demande (annulation coopérative)"""
+
+
+class RateLimiter:
+    """
+    Débit maximal (octets/s) partagé entre plusieurs téléchargements.
+
+    Seau à jetons : chaque bloc reçu réserve sa part du débit et l'appelant
+    attend si la réserve est épuisée. L'attente est interrompue (levée de
+    DownloadCancelled) dès que l'évènement `stop` est positionné.
+    """
+
+    def __init__(self, bytes_per_second: float, burst_seconds: float = 0.5):
+        self.bytes_per_second = bytes_per_second
+        self.burst_seconds = burst_seconds
+        self._next_free = 0.0
+        self._lock = threading.Lock()
+
+    def consume(self, size: int, stop: Optional[threading.Event] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_free, now - self.burst_seconds)
+            self._next_free = start + size / self.bytes_per_second
+            wait = self._next_free - now
+        if wait <= 0:
+            return
+        if stop is None:
+            time.sleep(wait)
+        elif stop.wait(wait):
+            raise DownloadCancelled()
+
+
+class YtDlpDownloader:
+    """Téléchargeur yt-dlp écrivant directement dans le fichier de destination"""
+
+    def __init__(self, rate_limit: Optional[int] = None):
+        self.rate_limit = rate_limit
+
+    def __call__(self, url: str, quality: str, dest: str,
+                 on_progress: Callable[[int, Optional[int]], None]) -> None:
+        if not HAVE_YT_DLP:
+            raise RuntimeError("yt-dlp n'est pas installé")
+        cancelled = []
+
+        def hook(status):
+            if status.get('status') != 'downloading':
+                return
+            try:
+                on_progress(status.get('downloaded_bytes') or 0, status.get('total_bytes'))
+            except DownloadCancelled:
+                cancelled.append(True)
+                raise
+
+        ydl_opts = {
+            'format': quality,
+            'outtmpl': dest,
+            'quiet': True,
+            'noprogress': True,
+            # Pas de .part renommé à la fin : le fichier grandit à sa place définitive
+            'nopart': True,
+            'overwrites': True,
+            'progress_hooks': [hook],
+        }
+        if self.rate_limit:
+            ydl_opts['ratelimit'] = self.rate_limit
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([url])
+        except Exception:
+            # yt-dlp enveloppe les exceptions levées dans les hooks
+            if cancelled:
+                raise DownloadCancelled()
+            raise
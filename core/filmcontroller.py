@@ -1,85 +1,156 @@
-import json
-import os
-from typing import List, Optional, Dict, Any
+import gc
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, date
 from core.films import Film
+from core.filmindex import FilmIndex, SearchPage, decode_cursor, encode_cursor
+from core.jsonstream import Progress
+from core.storage import StorageBackend, open_storage
 from core.users import User
 from core.admins import Admin
 
 class FilmController:
-    def __init__(self, films_file: str = "data/films.json"):
+    def __init__(self, films_file: str = "data/films.json",
+                 storage: Union[str, StorageBackend, None] = None, autoload: bool = True):
         self.films_file = films_file
-        self.films: List[Film] = []
-        self._load_films()
+        # Films indexés par ID (l'ordre d'insertion est conservé)
+        self.films: Dict[int, Film] = {}
+        self._next_film_id = 1
+        self.index = FilmIndex()
+        # Chargement progressif en cours (voir iter_load)
+        self._loader: Optional[Iterator[List[Film]]] = None
+
+        # Moteur de stockage : "json" (défaut), "compact", "journal", "sqlite", "memory"
+        # ou instance de StorageBackend (voir core/storage.py)
+        self.storage = open_storage(films_file, 'films', storage)
+
+        # autoload=False : l'appelant charge le catalogue lui-même avec iter_load()
+        if autoload:
+            self.load()
+
+    def load(self, progress: Optional[Progress] = None) -> None:
+        """Charge tout le catalogue depuis le moteur de stockage"""
+        for _ in self.iter_load(progress=progress):
+            pass
+
+    def iter_load(self, batch_size: int = 2000, progress: Optional[Progress] = None) -> Iterator[List[Film]]:
+        """
+        Charge le catalogue par lots, en flux : chaque lot produit est déjà
+        consultable (films, recherche), ce qui permet d'afficher les premiers
+        films avant la fin du chargement. Les logs ne sont décodés qu'au premier
+        accès. Toute mutation termine d'abord le chargement
+        """
+        self._loader = self._load_batches(batch_size, progress)
+        return self._loader
 
-    def _load_films(self) -> None:
-        """Charge les films depuis le fichier JSON"""
-        try:
-            if os.path.exists(self.films_file):
-                with open(self.films_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+    def is_loading(self) -> bool:
+        return self._loader is not None
 
-                self.films = [Film.from_dict(film_data) for film_data in data.get('films', [])]
+    def _ensure_loaded(self) -> None:
+        if self._loader is not None:
+            for _ in self._loader:
+                pass
 
+    def _load_batches(self, batch_size: int, progress: Optional[Progress]) -> Iterator[List[Film]]:
+        self.films = {}
+        self._next_film_id = 1
+        self.index.rebuild(())
+        batch: List[Film] = []
+        # Le ramasse-miettes cyclique, déclenché sans cesse par les milliers d'objets
+        # créés, est suspendu pendant la construction de chaque lot (pas entre les lots)
+        gc_enabled = gc.isenabled()
+        try:
+            gc.disable()
+            meta: Dict[str, Any] = {}
+            # Liste triée des titres reconstruite une seule fois, à la fin du chargement
+            with self.index.bulk():
+                for film_data in self.storage.stream(meta, progress):
+                    film = Film.from_dict(film_data)
+                    self.films[film.id] = film
+                    self.index.add(film)
+                    batch.append(film)
+                    if len(batch) >= batch_size:
+                        if gc_enabled:
+                            gc.enable()
+                        yield batch
+                        gc.disable()
+                        batch = []
+
+            # Compteur monotone : un ID n'est jamais réutilisé, même après suppression
+            highest_id = max(self.films) if self.films else 0
+            self._next_film_id = max(meta.get('next_film_id', 1), highest_id + 1)
+
+        except GeneratorExit:
+            # Chargement abandonné par l'appelant
+            self._loader = None
+            raise
         except Exception as e:
             print(f"Erreur chargement films: {e}")
-            self.films = []
+            self.films = {}
+            self._next_film_id = 1
+            self.index.rebuild(())
+            batch = []
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        self._loader = None
+        if batch:
+            yield batch
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Construit le document complet du catalogue (contenu de films.json)"""
+        # list() copie les valeurs de manière atomique : utilisable depuis le thread de compaction
+        films = list(self.films.values())
+        return {
+            'films': [film.to_dict() for film in films],
+            'last_updated': datetime.now().isoformat(),
+            'total_films': len(films),
+            'approved_films': len([f for f in films if f.approved]),
+            'next_film_id': self._next_film_id
+        }
+
+    def _persist(self, changed: List[Film] = (), deleted: List[int] = ()) -> bool:
+        """
+        Enregistre une mutation via le moteur de stockage : les moteurs
+        incrémentaux n'écrivent que les films modifiés/supprimés
+        """
+        self._ensure_loaded()
+        return self.storage.save(self._snapshot_data,
+                                 upserts=[film.to_dict() for film in changed],
+                                 deletes=deleted,
+                                 meta={'next_film_id': self._next_film_id})
 
-    def _save_films(self) -> bool:
-        """Sauvegarde les films dans le fichier JSON"""
-        try:
-            # If NO_AUTO_SAVE is set, skip saving to avoid accidental overwrites
-            if os.environ.get('NO_AUTO_SAVE') == '1':
-                try:
-                    os.makedirs(os.path.dirname(self.films_file), exist_ok=True)
-                    with open(os.path.join(os.path.dirname(self.films_file), 'save_log.txt'), 'a', encoding='utf-8') as logf:
-                        logf.write(f"SKIP SAVE_FILMS {self.films_file} at {datetime.now().isoformat()}\n")
-                except Exception:
-                    pass
-                return False
-            # Créer le dossier si nécessaire
-            os.makedirs(os.path.dirname(self.films_file), exist_ok=True)
-
-            # Sauvegarde de sécurité
-            if os.path.exists(self.films_file):
-                backup_file = f"{self.films_file}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                os.rename(self.films_file, backup_file)
-
-            data = {
-                'films': [film.to_dict() for film in self.films],
-                'last_updated': datetime.now().isoformat(),
-                'total_films': len(self.films),
-                'approved_films': len([f for f in self.films if f.approved])
-            }
-
-            with open(self.films_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            # Log successful save
-            try:
-                with open(os.path.join(os.path.dirname(self.films_file), 'save_log.txt'), 'a', encoding='utf-8') as logf:
-                    logf.write(f"SAVE_FILMS {self.films_file} at {datetime.now().isoformat()}\n")
-            except Exception:
-                pass
+    def batch(self):
+        """
+        Regroupe les mutations du bloc en une seule écriture :
+            with controller.batch():
+                for film_id in ids: controller.validate_film(film_id, admin)
+        """
+        return self.storage.batch()
 
-            return True
-        except Exception as e:
-            print(f"Erreur sauvegarde films: {e}")
-            return False
+    def flush(self) -> bool:
+        """Écrit immédiatement les mutations en attente (mode "deferred" ou bloc batch())"""
+        return self.storage.flush()
+
+    def compact(self, background: bool = True) -> None:
+        """Replie le journal dans films.json (sans effet pour les autres moteurs)"""
+        self.storage.compact(self._snapshot_data, background=background)
+
+    def close(self) -> None:
+        """Termine proprement les écritures en cours (mutations en attente, compaction, base SQLite)"""
+        self.storage.close()
 
     def _get_next_film_id(self) -> int:
         """Génère le prochain ID film"""
-        if not self.films:
-            return 1
-        return max(film.id for film in self.films) + 1
+        self._ensure_loaded()
+        film_id = self._next_film_id
+        self._next_film_id += 1
+        return film_id
 
     def _film_exists(self, title: str, release_date: date) -> bool:
-        """Vérifie si un film existe déjà"""
-        for film in self.films:
-            if (film.title.lower() == title.lower() and
-                film.release_date == release_date):
-                return True
-        return False
+        """Vérifie si un film existe déjà (titres comparés sous forme canonique)"""
+        self._ensure_loaded()
+        return self.index.has_duplicate(title, release_date)
 
     def add_film(self, film_data: Dict[str, Any], by_user: User) -> bool:
         """
@@ -108,14 +179,16 @@ class FilmController:
             # Ajouter le log de création
             film.add_log("proposed", by_user.id)
 
-            self.films.append(film)
+            self.films[film.id] = film
+            self.index.add(film)
 
-            if self._save_films():
+            if self._persist(changed=[film]):
                 print(f"Film '{film.title}' proposé avec succès (en attente de validation)")
                 return True
             else:
                 # Rollback en cas d'erreur
-                self.films.remove(film)
+                del self.films[film.id]
+                self.index.remove(film)
                 return False
 
         except Exception as e:
@@ -135,14 +208,16 @@ class FilmController:
             # Ajouter un log avant suppression
             film.add_log("deleted", by_admin.id)
 
-            self.films = [f for f in self.films if f.id != film_id]
+            del self.films[film_id]
+            self.index.remove(film)
 
-            if self._save_films():
+            if self._persist(deleted=[film_id]):
                 print(f"Film '{film.title}' supprimé par {by_admin.username}")
                 return True
             else:
                 # Rollback en cas d'erreur
-                self.films.append(film)
+                self.films[film_id] = film
+                self.index.add(film)
                 return False
 
         except Exception as e:
@@ -168,14 +243,16 @@ class FilmController:
                 return False
 
             film.add_log("withdrawn", by_user.id)
-            self.films = [f for f in self.films if f.id != film_id]
+            del self.films[film_id]
+            self.index.remove(film)
 
-            if self._save_films():
+            if self._persist(deleted=[film_id]):
                 print(f"Film '{film.title}' retiré par {by_user.username}")
                 return True
             else:
                 # rollback
-                self.films.append(film)
+                self.films[film_id] = film
+                self.index.add(film)
                 return False
 
         except Exception as e:
@@ -192,9 +269,9 @@ class FilmController:
                 print("Film non trouvé")
                 return False
 
-            # Appliquer les mises à jour
+            # Appliquer les mises à jour (l'index est notifié par le film lui-même)
             if film.update_info(user_id=by_admin.id, **updates):
-                if self._save_films():
+                if self._persist(changed=[film]):
                     print(f"Film '{film.title}' mis à jour par {by_admin.username}")
                     return True
                 else:
@@ -223,7 +300,7 @@ class FilmController:
 
             film.approve(by_admin.id)
 
-            if self._save_films():
+            if self._persist(changed=[film]):
                 print(f"Film '{film.title}' validé par {by_admin.username}")
                 return True
             else:
@@ -233,73 +310,200 @@ class FilmController:
             print(f"Erreur validation film: {e}")
             return False
 
+    # --- Opérations groupées (une mise à jour d'index et une seule écriture) ---
+
+    def _apply_to_films(self, film_ids: Iterable[int], action: Callable[[Film], Optional[bool]]) -> Dict[int, bool]:
+        """
+        Applique `action` à chaque film puis persiste en une fois les films modifiés.
+        `action` retourne True (modifié), None (déjà dans l'état voulu) ou False (refusé).
+        Retourne le résultat par ID
+        """
+        self._ensure_loaded()
+        results: Dict[int, bool] = {}
+        changed: List[Film] = []
+        with self.index.bulk():
+            for film_id in film_ids:
+                film = self.films.get(film_id)
+                try:
+                    outcome = action(film) if film else False
+                except Exception as e:
+                    # Un film en erreur n'empêche pas de traiter (et d'écrire) les autres
+                    print(f"Erreur sur le film {film_id}: {e}")
+                    outcome = False
+                if outcome:
+                    changed.append(film)
+                results[film_id] = outcome is not False
+
+        if changed and not self._persist(changed=changed):
+            for film in changed:
+                results[film.id] = False
+        return results
+
+    def validate_films(self, film_ids: Iterable[int], by_admin: Admin) -> Dict[int, bool]:
+        """Valide plusieurs films proposés (admin seulement)"""
+        def approve(film: Film) -> Optional[bool]:
+            if film.approved:
+                return None
+            film.approve(by_admin.id)
+            return True
+
+        results = self._apply_to_films(film_ids, approve)
+        print(f"{sum(results.values())}/{len(results)} film(s) validé(s) par {by_admin.username}")
+        return results
+
+    def reject_films(self, film_ids: Iterable[int], by_admin: Admin) -> Dict[int, bool]:
+        """Rejette plusieurs films : ils repassent en attente de validation (admin seulement)"""
+        def reject(film: Film) -> bool:
+            film.reject(by_admin.id)
+            return True
+
+        results = self._apply_to_films(film_ids, reject)
+        print(f"{sum(results.values())}/{len(results)} film(s) rejeté(s) par {by_admin.username}")
+        return results
+
+    def update_films(self, patches: Dict[int, Dict[str, Any]], by_admin: Admin) -> Dict[int, bool]:
+        """
+        Met à jour plusieurs films, chacun avec ses propres champs :
+        {film_id: {'genre': 'Drame'}, ...} (admin seulement).
+        Un film sans modification effective est compté en échec, comme update_film
+        """
+        def update(film: Film) -> bool:
+            # Patch vérifié avant d'y toucher : jamais appliqué à moitié
+            unknown = set(patches[film.id]) - Film.UPDATABLE_FIELDS
+            if unknown:
+                print(f"Champ(s) inconnu(s) pour le film {film.id}: {', '.join(sorted(unknown))}")
+                return False
+            return film.update_info(user_id=by_admin.id, **patches[film.id])
+
+        results = self._apply_to_films(patches, update)
+        print(f"{sum(results.values())}/{len(results)} film(s) mis à jour par {by_admin.username}")
+        return results
+
+    def delete_films(self, film_ids: Iterable[int], by_admin: Admin) -> Dict[int, bool]:
+        """Supprime plusieurs films (admin seulement)"""
+        self._ensure_loaded()
+        results: Dict[int, bool] = {}
+        removed: List[Film] = []
+        with self.index.bulk():
+            for film_id in film_ids:
+                film = self.films.pop(film_id, None)
+                results[film_id] = film is not None
+                if film:
+                    film.add_log("deleted", by_admin.id)
+                    self.index.remove(film)
+                    removed.append(film)
+
+        if removed and not self._persist(deleted=[film.id for film in removed]):
+            # Rollback en cas d'erreur
+            with self.index.bulk():
+                for film in removed:
+                    self.films[film.id] = film
+                    self.index.add(film)
+                    results[film.id] = False
+        print(f"{sum(results.values())}/{len(results)} film(s) supprimé(s) par {by_admin.username}")
+        return results
+
     def search_films(self, title: Optional[str] = None, genre: Optional[str] = None,
                     start_year: Optional[int] = None, end_year: Optional[int] = None,
                     date_filter: Optional[date] = None, approved_only: bool = True) -> List[Film]:
         """
         Recherche des films selon les critères
         """
-        results = []
-
-        q = title.strip().lower() if title else None
-
-        for film in self.films:
-            # Filtrer par statut d'approbation
-            if approved_only and not film.approved:
-                continue
-
-            # Appliquer les filtres basés sur titre/genre
-            if q:
-                t = film.title.lower()
-                # Prefer prefix match like Netflix (user typed start of title)
-                if not (t.startswith(q) or q in t):
-                    continue
-            if genre and genre.lower() != film.genre.lower():
-                continue
-
-            # Date range filtering if given
-            if start_year is not None or end_year is not None:
-                y = film.release_date.year
-                if start_year is not None and y < start_year:
-                    continue
-                if end_year is not None and y > end_year:
-                    continue
-            else:
-                # fallback to single date_filter for backward compatibility
-                if date_filter:
-                    if isinstance(date_filter, date):
-                        if film.release_date != date_filter:
-                            continue
-                    else:
-                        if film.release_date.year != date_filter:
-                            continue
+        return self.index.search(title=title, genre=genre, start_year=start_year,
+                                 end_year=end_year, date_filter=date_filter,
+                                 approved_only=approved_only)
+
+    def search_page(self, title: Optional[str] = None, genre: Optional[str] = None,
+                    start_year: Optional[int] = None, end_year: Optional[int] = None,
+                    date_filter: Optional[date] = None, approved_only: bool = True,
+                    limit: int = 50, offset: int = 0, cursor: Optional[str] = None) -> SearchPage:
+        """
+        Recherche paginée : mêmes critères et même ordre que search_films,
+        mais seuls les `limit` films de la page sont construits.
+        `cursor` (next_cursor de la page précédente) reprend là où elle
+        s'arrêtait, `offset` saute des résultats en plus.
+        Lève ValueError si le curseur ne correspond pas à ces critères.
+        """
+        if limit < 1 or offset < 0:
+            raise ValueError("limit doit être >= 1 et offset >= 0")
+        criteria = {'title': title, 'genre': genre, 'start_year': start_year, 'end_year': end_year,
+                    'date_filter': date_filter, 'approved_only': approved_only}
+        after_rank = decode_cursor(cursor, criteria) if cursor else None
+        films, total, next_rank = self.index.search_page(limit=limit, offset=offset, after_rank=after_rank,
+                                                         **criteria)
+        next_cursor = encode_cursor(next_rank, criteria) if next_rank is not None else None
+        return SearchPage(films, total, next_cursor)
+
+    def search_with_facets(self, title: Optional[str] = None, genre: Optional[str] = None,
+                           start_year: Optional[int] = None, end_year: Optional[int] = None,
+                           date_filter: Optional[date] = None,
+                           approved_only: bool = True) -> Tuple[List[Film], Dict[str, Dict[Any, int]]]:
+        """
+        Comme search_films, avec en plus les comptages par genre, année et
+        statut des résultats (voir get_facets)
+        """
+        films = self.search_films(title=title, genre=genre, start_year=start_year, end_year=end_year,
+                                  date_filter=date_filter, approved_only=approved_only)
+        return films, self.index.columns.facets_for(film.id for film in films)
 
-            results.append(film)
+    def get_facets(self, approved_only: bool = True) -> Dict[str, Dict[Any, int]]:
+        """
+        Nombre de films par genre, par année et par statut d'approbation,
+        maintenus à chaque modification du catalogue : lecture instantanée
+        Ex. get_facets()['genre'] -> {'Thriller': 1204, 'Drame': 980, ...}
+        """
+        return self.index.columns.facets(approved_only=approved_only)
 
-        return results
+    def suggest_titles(self, prefix: str, limit: int = 10, approved_only: bool = True) -> List[str]:
+        """
+        Retourne au plus `limit` titres pour la saisie semi-automatique,
+        les correspondances par préfixe en premier
+        """
+        titles: List[str] = []
+        for film in self.index.suggest(prefix, limit=limit * 2, approved_only=approved_only):
+            if film.title not in titles:
+                titles.append(film.title)
+                if len(titles) >= limit:
+                    break
+        return titles
 
     def get_film_by_id(self, film_id: int) -> Optional[Film]:
         """Retourne un film par son ID"""
-        for film in self.films:
-            if film.id == film_id:
-                return film
-        return None
+        self._ensure_loaded()
+        return self.films.get(film_id)
 
     def get_pending_films(self) -> List[Film]:
         """Retourne les films en attente de validation"""
-        return [film for film in self.films if not film.approved]
+        return self.filter_films(approved=False)
 
     def get_approved_films(self) -> List[Film]:
         """Retourne les films approuvés"""
-        return [film for film in self.films if film.approved]
+        return self.filter_films(approved=True)
 
     def get_films_by_user(self, user_id: int) -> List[Film]:
         """Retourne les films proposés par un utilisateur"""
-        return [film for film in self.films if film.added_by_user_id == user_id]
+        return self.filter_films(user_id=user_id)
+
+    def filter_films(self, genre: Optional[str] = None, approved: Optional[bool] = None,
+                     start_year: Optional[int] = None, end_year: Optional[int] = None,
+                     user_id: Optional[int] = None) -> List[Film]:
+        """
+        Films correspondant exactement aux critères (genre tel quel, sans
+        recherche de titre), évalués sur la vue en colonnes de l'index
+        """
+        return self.index.columns.select_films(genre=genre, approved=approved, start_year=start_year,
+                                               end_year=end_year, user_id=user_id)
+
+    def count_films_by(self, column: str, **criteria) -> Dict[Any, int]:
+        """
+        Nombre de films par genre, année, statut ou auteur ('genre', 'year',
+        'approved', 'user_id'), avec les mêmes critères que filter_films
+        """
+        return self.index.columns.count_by(column, **criteria)
 
     def get_all_films(self) -> List[Film]:
         """Retourne tous les films"""
-        return self.films.copy()
+        return list(self.films.values())
 
     def get_films_count(self) -> int:
         """Retourne le nombre total de films"""
@@ -0,0 +1,509 @@
+import base64
+import bisect
+import hashlib
+import heapq
+import json
+import re
+import unicodedata
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from core.columns import FilmColumns
+from core.films import Film
+
+# Clé de détection des doublons : (titre canonique, date de sortie)
+DuplicateKey = Tuple[str, date]
+# Entrée indexée d'un film : (titre normalisé, genre normalisé, année, approuvé, clé doublon)
+IndexEntry = Tuple[str, str, int, bool, DuplicateKey]
+
+# Articles ignorés en tête de titre pour la détection des doublons
+LEADING_ARTICLES = {"the", "a", "an", "le", "la", "les", "l", "un", "une", "des"}
+_BRACKETS_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+# Tout ce qui n'est pas lettre ou chiffre, quelle que soit l'écriture (cyrillique, CJK...)
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
+def canonical_title(title: str) -> str:
+    """
+    Forme canonique d'un titre pour comparer des quasi-doublons :
+    sans accents, casse, ponctuation, texte entre parenthèses ni article initial.
+    Ex. "Les Dents de la Mer (Jaws)" et "les dents de la mer" -> "dents de la mer"
+    """
+    text = unicodedata.normalize('NFKD', title)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    words = _NON_ALNUM_RE.sub(' ', _BRACKETS_RE.sub(' ', text)).split()
+    if not words:
+        # Titre entièrement entre parenthèses : on garde son contenu
+        words = _NON_ALNUM_RE.sub(' ', text).split()
+    if len(words) > 1 and words[0] in LEADING_ARTICLES:
+        words = words[1:]
+    # Titre sans lettre ni chiffre (ex. "!!!") : comparé tel quel
+    return ' '.join(words) or title.casefold().strip()
+
+
+class SearchPage(NamedTuple):
+    """Une page de résultats de recherche"""
+    films: List[Film]
+    # Nombre total de résultats pour ces critères (toutes pages confondues)
+    total: int
+    # Curseur opaque de la page suivante (None : dernière page)
+    next_cursor: Optional[str]
+
+
+def _criteria_fingerprint(criteria: Dict[str, Any]) -> str:
+    text = json.dumps(criteria, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(rank: int, criteria: Dict[str, Any]) -> str:
+    """Curseur opaque : position (rang du dernier film lu) liée aux critères de la recherche"""
+    payload = json.dumps({'r': rank, 'c': _criteria_fingerprint(criteria)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, criteria: Dict[str, Any]) -> int:
+    """Retourne le rang contenu dans le curseur ; ValueError s'il est invalide ou issu d'autres critères"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        rank, fingerprint = payload['r'], payload['c']
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Curseur de recherche invalide: {cursor!r}") from e
+    if fingerprint != _criteria_fingerprint(criteria) or not isinstance(rank, int):
+        raise ValueError("Curseur de recherche issu d'autres critères")
+    return rank
+
+
+def title_trigrams(text: str) -> Set[str]:
+    """Retourne les trigrammes (sous-chaînes de 3 caractères) d'un titre normalisé"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _bisect_after(ids: List[int], order: Dict[int, int], rank: int) -> int:
+    """Position du premier ID de rang > rank dans ids (triés par rang)"""
+    lo, hi = 0, len(ids)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if order[ids[mid]] <= rank:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class FilmIndex:
+    def __init__(self, films: Iterable[Film] = ()):
+        self._films: Dict[int, Film] = {}
+        self._order: Dict[int, int] = {}
+        self._next_rank = 0
+        self._entries: Dict[int, IndexEntry] = {}
+        self._by_genre: Dict[str, Set[int]] = {}
+        self._by_year: Dict[int, Set[int]] = {}
+        self._years: List[int] = []
+        self._approved: Set[int] = set()
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._duplicates: Dict[DuplicateKey, Set[int]] = {}
+        # Titres triés (titre normalisé, id) pour la recherche par préfixe
+        self._sorted_titles: List[Tuple[str, int]] = []
+        # Mode bulk() : modifications de la liste triée accumulées puis fusionnées en une passe
+        self._bulk_depth = 0
+        self._bulk_inserted: Set[Tuple[str, int]] = set()
+        self._bulk_deleted: Set[Tuple[str, int]] = set()
+        # Vue en colonnes (filtres, comptages et regroupements), tenue à jour avec l'index
+        self.columns = FilmColumns()
+        self.rebuild(films)
+
+    def rebuild(self, films: Iterable[Film]) -> None:
+        """Reconstruit entièrement l'index à partir d'une liste de films"""
+        for film in self._films.values():
+            film.remove_listener(self.update)
+        self._films.clear()
+        self._order.clear()
+        self._next_rank = 0
+        self._entries.clear()
+        self._by_genre.clear()
+        self._by_year.clear()
+        self._years = []
+        self._approved.clear()
+        self._trigrams.clear()
+        self._duplicates.clear()
+        self._bulk_inserted.clear()
+        self._bulk_deleted.clear()
+        self.columns.clear()
+        for film in films:
+            self._add(film, keep_sorted=False)
+        # Un seul tri global plutôt qu'une insertion triée par film
+        self._sorted_titles = sorted((entry[0], film_id) for film_id, entry in self._entries.items())
+
+    @staticmethod
+    def _make_entry(film: Film) -> IndexEntry:
+        return (film.title.lower(), film.genre.lower(), film.release_date.year, bool(film.approved),
+                (canonical_title(film.title), film.release_date))
+
+    # --- Maintenance des listes de postings ---
+
+    def _index_title(self, film_id: int, title_key: str) -> None:
+        for gram in title_trigrams(title_key):
+            self._trigrams.setdefault(gram, set()).add(film_id)
+
+    def _unindex_title(self, film_id: int, title_key: str) -> None:
+        for gram in title_trigrams(title_key):
+            ids = self._trigrams[gram]
+            ids.discard(film_id)
+            if not ids:
+                del self._trigrams[gram]
+
+    def _insert_sorted_title(self, film_id: int, title_key: str) -> None:
+        if self._bulk_depth:
+            if (title_key, film_id) in self._bulk_deleted:
+                self._bulk_deleted.discard((title_key, film_id))
+            else:
+                self._bulk_inserted.add((title_key, film_id))
+            return
+        bisect.insort(self._sorted_titles, (title_key, film_id))
+
+    def _delete_sorted_title(self, film_id: int, title_key: str) -> None:
+        if self._bulk_depth:
+            if (title_key, film_id) in self._bulk_inserted:
+                self._bulk_inserted.discard((title_key, film_id))
+            else:
+                self._bulk_deleted.add((title_key, film_id))
+            return
+        i = bisect.bisect_left(self._sorted_titles, (title_key, film_id))
+        if i < len(self._sorted_titles) and self._sorted_titles[i] == (title_key, film_id):
+            del self._sorted_titles[i]
+
+    def _index_duplicate(self, film_id: int, key: DuplicateKey) -> None:
+        self._duplicates.setdefault(key, set()).add(film_id)
+
+    def _unindex_duplicate(self, film_id: int, key: DuplicateKey) -> None:
+        ids = self._duplicates[key]
+        ids.discard(film_id)
+        if not ids:
+            del self._duplicates[key]
+
+    def _index_genre(self, film_id: int, genre_key: str) -> None:
+        self._by_genre.setdefault(genre_key, set()).add(film_id)
+
+    def _unindex_genre(self, film_id: int, genre_key: str) -> None:
+        ids = self._by_genre[genre_key]
+        ids.discard(film_id)
+        if not ids:
+            del self._by_genre[genre_key]
+
+    def _index_year(self, film_id: int, year: int) -> None:
+        if year not in self._by_year:
+            self._by_year[year] = set()
+            bisect.insort(self._years, year)
+        self._by_year[year].add(film_id)
+
+    def _unindex_year(self, film_id: int, year: int) -> None:
+        ids = self._by_year[year]
+        ids.discard(film_id)
+        if not ids:
+            del self._by_year[year]
+            del self._years[bisect.bisect_left(self._years, year)]
+
+    # --- API publique ---
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Regroupe de nombreux ajouts/retraits/mises à jour : la liste triée des
+        titres (insertion et suppression en O(n) chacune) est corrigée en une
+        seule passe à la sortie du bloc. suggest() n'est à jour qu'après le bloc
+        """
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth and (self._bulk_inserted or self._bulk_deleted):
+                titles = self._sorted_titles
+                if self._bulk_deleted:
+                    deleted = self._bulk_deleted
+                    titles = [item for item in titles if item not in deleted]
+                if self._bulk_inserted:
+                    # Timsort fusionne en temps linéaire la liste triée et les ajouts triés
+                    titles = sorted(titles + sorted(self._bulk_inserted))
+                self._sorted_titles = titles
+                self._bulk_inserted = set()
+                self._bulk_deleted = set()
+
+    def add(self, film: Film) -> None:
+        """Ajoute un film à l'index (ou le réindexe s'il est déjà présent)"""
+        self._add(film, keep_sorted=True)
+
+    def _add(self, film: Film, keep_sorted: bool) -> None:
+        if film.id in self._entries:
+            self.remove(film)
+
+        entry = self._make_entry(film)
+        title_key, genre_key, year, approved, dup_key = entry
+
+        self._films[film.id] = film
+        self._order[film.id] = self._next_rank
+        self._next_rank += 1
+        self._entries[film.id] = entry
+
+        self._index_title(film.id, title_key)
+        if keep_sorted:
+            self._insert_sorted_title(film.id, title_key)
+        self._index_genre(film.id, genre_key)
+        self._index_year(film.id, year)
+        self._index_duplicate(film.id, dup_key)
+        if approved:
+            self._approved.add(film.id)
+        self.columns.add(film)
+
+        film.add_listener(self.update)
+
+    def remove(self, film: Film) -> None:
+        """Retire un film de l'index"""
+        entry = self._entries.pop(film.id, None)
+        if entry is None:
+            return
+        title_key, genre_key, year, _, dup_key = entry
+
+        film.remove_listener(self.update)
+        del self._films[film.id]
+        del self._order[film.id]
+
+        self._unindex_title(film.id, title_key)
+        self._delete_sorted_title(film.id, title_key)
+        self._unindex_genre(film.id, genre_key)
+        self._unindex_year(film.id, year)
+        self._unindex_duplicate(film.id, dup_key)
+        self._approved.discard(film.id)
+        self.columns.remove(film.id)
+
+    def update(self, film: Film) -> None:
+        """
+        Met à jour sur place les entrées d'un film modifié.
+        Appelée automatiquement quand le film notifie un changement.
+        """
+        old_entry = self._entries.get(film.id)
+        if old_entry is None:
+            self.add(film)
+            return
+
+        # Le genre y est gardé tel quel : mis à jour même si l'entrée normalisée ne change pas
+        self.columns.update(film)
+        new_entry = self._make_entry(film)
+        if old_entry == new_entry:
+            return
+        old_title, old_genre, old_year, _, old_dup_key = old_entry
+        new_title, new_genre, new_year, approved, new_dup_key = new_entry
+
+        if old_title != new_title:
+            # Seuls les trigrammes qui changent sont déplacés
+            old_grams = title_trigrams(old_title)
+            new_grams = title_trigrams(new_title)
+            for gram in old_grams - new_grams:
+                ids = self._trigrams[gram]
+                ids.discard(film.id)
+                if not ids:
+                    del self._trigrams[gram]
+            for gram in new_grams - old_grams:
+                self._trigrams.setdefault(gram, set()).add(film.id)
+            self._delete_sorted_title(film.id, old_title)
+            self._insert_sorted_title(film.id, new_title)
+        if old_genre != new_genre:
+            self._unindex_genre(film.id, old_genre)
+            self._index_genre(film.id, new_genre)
+        if old_year != new_year:
+            self._unindex_year(film.id, old_year)
+            self._index_year(film.id, new_year)
+        if old_dup_key != new_dup_key:
+            self._unindex_duplicate(film.id, old_dup_key)
+            self._index_duplicate(film.id, new_dup_key)
+        if approved:
+            self._approved.add(film.id)
+        else:
+            self._approved.discard(film.id)
+
+        self._entries[film.id] = new_entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, film_id: int) -> bool:
+        return film_id in self._entries
+
+    def has_duplicate(self, title: str, release_date: date) -> bool:
+        """Vérifie en O(1) si un film de même titre canonique et même date existe"""
+        return (canonical_title(title), release_date) in self._duplicates
+
+    def _years_in_range(self, start_year: Optional[int], end_year: Optional[int]) -> List[int]:
+        lo = 0 if start_year is None else bisect.bisect_left(self._years, start_year)
+        hi = len(self._years) if end_year is None else bisect.bisect_right(self._years, end_year)
+        return self._years[lo:hi]
+
+    def _title_postings(self, q: str) -> Optional[List[Set[int]]]:
+        """
+        Retourne les listes de postings des trigrammes de la requête,
+        une liste vide si un trigramme est absent (aucun résultat possible),
+        ou None si la requête est trop courte pour l'index
+        """
+        if len(q) < 3:
+            return None
+        postings = []
+        for gram in title_trigrams(q):
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        return postings
+
+    def _match_ids(self, title: Optional[str], genre: Optional[str], start_year: Optional[int],
+                   end_year: Optional[int], date_filter: Optional[date],
+                   approved_only: bool) -> Tuple[Iterable[int], bool]:
+        """
+        Ids des films correspondant aux critères. Les critères titre
+        (trigrammes)/genre/année/approbation sont combinés par intersection
+        d'ensembles, le titre exact n'est vérifié que sur les candidats restants.
+        Retourne aussi True si les ids sont déjà dans l'ordre d'insertion.
+        """
+        q = title.strip().lower() if title else None
+        genre_key = genre.lower() if genre else None
+
+        exact_date = None
+        if start_year is not None or end_year is not None:
+            years = self._years_in_range(start_year, end_year)
+        elif date_filter:
+            if isinstance(date_filter, date):
+                exact_date = date_filter
+                years = [date_filter.year] if date_filter.year in self._by_year else []
+            else:
+                years = [date_filter] if date_filter in self._by_year else []
+        else:
+            years = None
+
+        sets: List[Set[int]] = []
+        if genre_key:
+            sets.append(self._by_genre.get(genre_key, set()))
+        if q:
+            postings = self._title_postings(q)
+            if postings is not None:
+                if not postings:
+                    return [], True
+                sets.extend(postings)
+
+        candidates: Optional[Set[int]] = None
+        if sets:
+            # Intersection en partant de la liste la plus courte
+            sets.sort(key=len)
+            candidates = sets[0]
+            for ids in sets[1:]:
+                if not candidates:
+                    break
+                candidates = candidates & ids
+        if years is not None:
+            year_sets = [self._by_year[y] for y in years]
+            if candidates is not None:
+                # Intersection année par année : ne parcourt que le plus petit ensemble
+                candidates = set().union(*(candidates & ids for ids in year_sets))
+            else:
+                candidates = set().union(*year_sets)
+        if approved_only and candidates is not None:
+            candidates = candidates & self._approved
+
+        # Sans critère sélectif, parcours dans l'ordre (évite un tri inutile)
+        ordered = candidates is None or len(candidates) * 4 > len(self._entries)
+        if candidates is None:
+            source = self._approved if approved_only else self._entries
+            ids: Iterable[int] = (film_id for film_id in self._entries if film_id in source)
+        elif ordered:
+            ids = (film_id for film_id in self._entries if film_id in candidates)
+        else:
+            ids = candidates
+
+        if q:
+            entries = self._entries
+            ids = [film_id for film_id in ids if q in entries[film_id][0]]
+        if exact_date is not None:
+            ids = [film_id for film_id in ids if self._films[film_id].release_date == exact_date]
+
+        return ids, ordered
+
+    def search(self, title: Optional[str] = None, genre: Optional[str] = None,
+               start_year: Optional[int] = None, end_year: Optional[int] = None,
+               date_filter: Optional[date] = None, approved_only: bool = True) -> List[Film]:
+        """
+        Recherche des films via l'index.
+        L'ordre des résultats suit l'ordre d'insertion.
+        """
+        ids, ordered = self._match_ids(title, genre, start_year, end_year, date_filter, approved_only)
+        if ordered:
+            matches = list(ids)
+        else:
+            matches = sorted(ids, key=self._order.__getitem__)
+        return [self._films[film_id] for film_id in matches]
+
+    def search_page(self, title: Optional[str] = None, genre: Optional[str] = None,
+                    start_year: Optional[int] = None, end_year: Optional[int] = None,
+                    date_filter: Optional[date] = None, approved_only: bool = True,
+                    limit: int = 50, offset: int = 0,
+                    after_rank: Optional[int] = None) -> Tuple[List[Film], int, Optional[int]]:
+        """
+        Une page de résultats, dans l'ordre de search(), sans trier ni
+        construire la liste complète : les `limit` films qui suivent le rang
+        `after_rank` (curseur) après en avoir sauté `offset`.
+        Retourne (films de la page, nombre total de résultats, rang du dernier
+        film de la page ou None s'il n'y a pas de page suivante).
+        Les films ajoutés entre deux pages ont un rang plus élevé : ils
+        apparaissent en fin de parcours, sans décaler les pages déjà lues.
+        """
+        ids, ordered = self._match_ids(title, genre, start_year, end_year, date_filter, approved_only)
+        order = self._order
+        wanted = offset + limit
+        if ordered:
+            matches = ids if isinstance(ids, list) else list(ids)
+            total = len(matches)
+            # Rangs croissants : le curseur se retrouve par dichotomie
+            start = 0 if after_rank is None else _bisect_after(matches, order, after_rank)
+            remaining = total - start
+            page = matches[start + offset:start + wanted]
+        else:
+            matches = ids if isinstance(ids, (list, set)) else list(ids)
+            total = len(matches)
+            if after_rank is not None:
+                matches = [film_id for film_id in matches if order[film_id] > after_rank]
+            remaining = len(matches)
+            # Sélection partielle en O(n log k) plutôt qu'un tri complet
+            page = heapq.nsmallest(wanted, matches, key=order.__getitem__)[offset:]
+
+        next_rank = order[page[-1]] if page and remaining > wanted else None
+        return [self._films[film_id] for film_id in page], total, next_rank
+
+    def suggest(self, prefix: str, limit: int = 10, approved_only: bool = True) -> List[Film]:
+        """
+        Suggestions pour la saisie semi-automatique.
+        Les titres commençant par le préfixe viennent en premier (ordre
+        alphabétique), complétés si besoin par les titres qui le contiennent.
+        Le nombre de résultats est toujours plafonné à `limit`.
+        """
+        q = prefix.lstrip().lower() if prefix else ""
+        if not q or limit <= 0:
+            return []
+
+        results: List[Film] = []
+        seen: Set[int] = set()
+        titles = self._sorted_titles
+        i = bisect.bisect_left(titles, (q,))
+        while i < len(titles) and len(results) < limit:
+            title_key, film_id = titles[i]
+            if not title_key.startswith(q):
+                break
+            if not approved_only or film_id in self._approved:
+                results.append(self._films[film_id])
+                seen.add(film_id)
+            i += 1
+
+        # Compléter avec les correspondances internes (via les trigrammes uniquement)
+        if len(results) < limit and len(q.strip()) >= 3:
+            for film in self.search(title=q, approved_only=approved_only):
+                if film.id not in seen:
+                    results.append(film)
+                    if len(results) >= limit:
+                        break
+        return results
@@ -1,15 +1,185 @@
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, date, timedelta
+from enum import IntEnum
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple, Union
 import json
+import sys
+
+
+class FilmAction(IntEnum):
+    """Actions enregistrées dans les logs d'un film (codées sur un entier dans FilmLogs)"""
+    OTHER = 0
+    PROPOSED = 1
+    APPROVED = 2
+    REJECTED = 3
+    UPDATED = 4
+    DELETED = 5
+    WITHDRAWN = 6
+    CREATED_BY_ADMIN = 7
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+_ACTION_CODES = {action.label: action for action in FilmAction if action is not FilmAction.OTHER}
+# Code d'une entrée conservée telle quelle (clés en plus, horodatage non canonique...)
+_RAW_ENTRY = 0xFF
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_action(action: str) -> Tuple[FilmAction, Optional[str]]:
+    """Sépare un libellé d'action en code et détail : "updated: title..." -> (UPDATED, "title...")"""
+    name, sep, detail = action.partition(': ')
+    code = _ACTION_CODES.get(name)
+    if code is None:
+        return FilmAction.OTHER, action
+    return code, detail if sep else None
+
+
+def decode_action(code: FilmAction, detail: Optional[str]) -> str:
+    if code is FilmAction.OTHER:
+        return detail
+    return code.label if detail is None else f"{code.label}: {detail}"
+
+
+class FilmLogs(Sequence):
+    """
+    Logs d'un film sous forme compacte.
+
+    Chaque entrée occupe trois entiers dans un seul tableau : code d'action,
+    id de l'utilisateur et horodatage en microsecondes. film_id n'est pas
+    répété (c'est celui du film) ; le détail éventuel d'une action
+    ("updated: ...") est rangé dans une liste à part, référencée par les bits
+    hauts du code. Lecture comme une liste de dicts {'action', 'user_id',
+    'timestamp', 'film_id'}, construits à la demande ; une entrée qui ne suit
+    pas ce format est conservée telle quelle.
+    """
+
+    __slots__ = ('film_id', '_data', '_objects')
+
+    def __init__(self, film_id: int, entries: Iterable[Dict[str, Any]] = ()):
+        self.film_id = film_id
+        # Détails d'action (str) et entrées conservées telles quelles (dict)
+        self._objects: Optional[List[Any]] = None
+        values: List[int] = []
+        for entry in entries:
+            values.extend(self._encode(entry))
+        # Construit en une fois : pas de surallocation du tableau
+        self._data = array('q', values)
+
+    def _store(self, code: int, value: Any) -> int:
+        """Range un objet associé à une entrée et retourne le code qui le référence"""
+        if self._objects is None:
+            self._objects = []
+        self._objects.append(value)
+        return code | len(self._objects) << 8
+
+    def _encode(self, entry: Dict[str, Any]) -> Tuple[int, int, int]:
+        action, user_id, timestamp = entry.get('action'), entry.get('user_id'), entry.get('timestamp')
+        moment = None
+        if (len(entry) == 4 and entry.get('film_id') == self.film_id and type(action) is str
+                and type(user_id) is int and -1 << 63 <= user_id < 1 << 63 and type(timestamp) is str):
+            try:
+                moment = datetime.fromisoformat(timestamp)
+            except ValueError:
+                pass
+        # Seules les entrées reconstruites à l'identique depuis leur forme compacte sont compactées
+        if moment is None or moment.tzinfo is not None or moment.isoformat() != timestamp:
+            return self._store(_RAW_ENTRY, dict(entry)), 0, 0
+
+        code, detail = encode_action(action)
+        if detail is not None:
+            # Détails très répétés ("description updated"...) : une seule chaîne partagée
+            code = self._store(code, sys.intern(detail))
+        return code, user_id, (moment - _EPOCH) // _MICROSECOND
+
+    def _entry(self, index: int) -> Dict[str, Any]:
+        code, user_id, micros = self._data[3 * index:3 * index + 3]
+        value = self._objects[(code >> 8) - 1] if code >> 8 else None
+        code &= 0xFF
+        if code == _RAW_ENTRY:
+            return dict(value)
+        return {
+            'action': decode_action(FilmAction(code), value),
+            'user_id': user_id,
+            'timestamp': (_EPOCH + micros * _MICROSECOND).isoformat(),
+            'film_id': self.film_id
+        }
+
+    def add(self, action: str, user_id: int, timestamp: str) -> None:
+        """Ajoute une entrée de log (même contenu qu'un dict de log, sans film_id)"""
+        self.append({'action': action, 'user_id': user_id, 'timestamp': timestamp,
+                     'film_id': self.film_id})
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self._data.extend(self._encode(entry))
+
+    def __len__(self) -> int:
+        return len(self._data) // 3
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FilmLogs index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self._entry(index)
+
+    def actions(self) -> List[FilmAction]:
+        """Codes d'action des entrées, sans construire les dicts"""
+        return [FilmAction.OTHER if code & 0xFF == _RAW_ENTRY else FilmAction(code & 0xFF)
+                for code in self._data[::3]]
+
+    def keep_last(self, limit: int) -> None:
+        """Ne garde que les `limit` dernières entrées"""
+        dropped = len(self) - limit
+        if dropped <= 0:
+            return
+        del self._data[:3 * dropped]
+        if self._objects:
+            # Renumérotation des objets encore référencés
+            objects, self._objects = self._objects, None
+            for i in range(0, len(self._data), 3):
+                code = self._data[i]
+                if code >> 8:
+                    self._data[i] = self._store(code & 0xFF, objects[(code >> 8) - 1])
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (FilmLogs, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FilmLogs({self.to_list()!r})"
+
 
 class Film:
+    # Pas de __dict__ par instance : les catalogues peuvent compter des centaines de milliers de films
+    __slots__ = ('id', 'title', 'genre', 'release_date', 'poster_path', 'trailer_url', 'description',
+                 'approved', 'added_by_user_id', '_logs', '_raw_logs', '_listeners')
+
+    # Champs modifiables par update_info
+    UPDATABLE_FIELDS = frozenset({'title', 'genre', 'release_date', 'poster_path', 'trailer_url', 'description'})
+
     def __init__(self, id: int, title: str, genre: str, release_date: date,
                  poster_path: str = "", trailer_url: str = "", description: str = "",
                  approved: bool = False, added_by_user_id: int = 0,
-                 logs: Optional[List[Dict]] = None):
+                 logs: Union[List[Dict], FilmLogs, str, None] = None):
         self.id = id
         self.title = title
-        self.genre = genre
+        # Quelques genres pour tout le catalogue : une seule chaîne partagée par genre
+        self.genre = sys.intern(genre)
         self.release_date = release_date
         self.poster_path = poster_path
         self.trailer_url = trailer_url
@@ -17,6 +187,43 @@ class Film:
         self.approved = approved
         self.added_by_user_id = added_by_user_id
         self.logs = logs or []
+        # Créée au premier add_listener
+        self._listeners: Optional[List[Callable[['Film'], None]]] = None
+
+    @property
+    def logs(self) -> FilmLogs:
+        # Logs reçus sous forme de texte JSON (chargement en flux) : décodés au premier accès
+        if self._raw_logs is not None:
+            self._logs = FilmLogs(self.id, json.loads(self._raw_logs))
+            self._raw_logs = None
+        elif self._logs is None:
+            self._logs = FilmLogs(self.id)
+        return self._logs
+
+    @logs.setter
+    def logs(self, value: Union[List[Dict], FilmLogs, str]) -> None:
+        if isinstance(value, str):
+            self._raw_logs, self._logs = value, None
+        elif isinstance(value, FilmLogs) and value.film_id == self.id:
+            self._raw_logs, self._logs = None, value
+        else:
+            self._raw_logs, self._logs = None, FilmLogs(self.id, value) if value else None
+
+    def add_listener(self, callback: Callable[['Film'], None]) -> None:
+        """Enregistre une fonction appelée après chaque modification du film"""
+        if self._listeners is None:
+            self._listeners = []
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[['Film'], None]) -> None:
+        """Retire une fonction enregistrée avec add_listener"""
+        if self._listeners and callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify_change(self) -> None:
+        for callback in list(self._listeners or ()):
+            callback(self)
 
     def matches_filter(self, title: Optional[str] = None, genre: Optional[str] = None,
                       date_filter: Optional[date] = None) -> bool:
@@ -48,27 +255,22 @@ class Film:
         """
         Ajoute une entrée de log pour le film
         """
-        log_entry = {
-            'action': action,
-            'user_id': user_id,
-            'timestamp': datetime.now().isoformat(),
-            'film_id': self.id
-        }
-        self.logs.append(log_entry)
+        self.logs.add(action, user_id, datetime.now().isoformat())
 
         # Garder seulement les 100 derniers logs pour éviter la surcharge
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
+        self.logs.keep_last(100)
 
     def approve(self, admin_id: int) -> None:
         """Approuve le film et ajoute un log"""
         self.approved = True
         self.add_log("approved", admin_id)
+        self._notify_change()
 
     def reject(self, admin_id: int) -> None:
         """Rejette le film et ajoute un log"""
         self.approved = False
         self.add_log("rejected", admin_id)
+        self._notify_change()
 
     def update_info(self, title: Optional[str] = None, genre: Optional[str] = None,
                    release_date: Optional[date] = None, poster_path: Optional[str] = None,
@@ -86,7 +288,7 @@ class Film:
 
         if genre and genre != self.genre:
             modifications.append(f"genre: {self.genre} -> {genre}")
-            self.genre = genre
+            self.genre = sys.intern(genre)
 
         if release_date and release_date != self.release_date:
             modifications.append(f"release_date: {self.release_date} -> {release_date}")
@@ -107,6 +309,7 @@ class Film:
         if modifications:
             modification_text = ", ".join(modifications)
             self.add_log(f"updated: {modification_text}", user_id)
+            self._notify_change()
             return True
 
         return False
@@ -127,7 +330,9 @@ class Film:
             'description': self.description,
             'approved': self.approved,
             'added_by_user_id': self.added_by_user_id,
-            'logs': self.logs
+            # Sauvegarde complète : les logs non consultés sont décodés sans être conservés
+            'logs': json.loads(self._raw_logs) if self._raw_logs is not None else
+                    self._logs.to_list() if self._logs is not None else []
         }
 
     @classmethod
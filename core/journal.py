@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from core.database import atomic_write_json
+
+
+class Journal:
+    """
+    Journal en ajout seul pour une collection (films ou utilisateurs).
+
+    Chaque mutation est écrite sur une ligne JSON compacte dans
+    `<fichier>.journal` ; le coût d'écriture ne dépend donc pas de la taille
+    de la collection. Une compaction en arrière-plan réécrit périodiquement
+    l'instantané complet (`<fichier>`, même format que films.json/users.json)
+    et vide le journal. Au démarrage : instantané + journal(aux) rejoués.
+    """
+
+    def __init__(self, snapshot_file: str, collection: str = 'films', compact_threshold: int = 1000):
+        self.snapshot_file = snapshot_file
+        self.collection = collection
+        self.journal_file = f"{snapshot_file}.journal"
+        # Journal gelé pendant une compaction (rejoué si elle a été interrompue)
+        self.compacting_file = f"{snapshot_file}.journal.compacting"
+        self.compact_threshold = compact_threshold
+        self.records = 0
+        self._handle = None
+        self._lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+
+    # --- Lecture ---
+
+    @staticmethod
+    def _read_records(path: str) -> Iterable[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal : ignorée
+                    print(f"Entrée de journal illisible ignorée dans {path}")
+
+    def replay(self) -> Dict[str, Any]:
+        """
+        Reconstruit le document de la collection (instantané + journaux rejoués).
+        Le résultat a la même forme que le contenu du fichier JSON.
+        """
+        data: Dict[str, Any] = {}
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        items = {item['id']: item for item in data.get(self.collection, [])}
+
+        self.records = 0
+        for path in (self.compacting_file, self.journal_file):
+            for record in self._read_records(path):
+                if record.get('op') == 'put':
+                    item = record['data']
+                    items[item['id']] = item
+                elif record.get('op') == 'del':
+                    items.pop(record['id'], None)
+                # Métadonnées (ex. next_film_id) : la dernière valeur l'emporte
+                data.update(record.get('meta', {}))
+                self.records += 1
+
+        data[self.collection] = list(items.values())
+        return data
+
+    # --- Écriture ---
+
+    def append(self, upserts: List[Dict[str, Any]] = (), deletes: List[int] = (),
+               meta: Optional[Dict[str, Any]] = None) -> None:
+        """Ajoute une entrée compacte par élément modifié ou supprimé"""
+        extra = {'meta': meta} if meta else {}
+        lines = [json.dumps({'op': 'put', 'data': item, **extra}, ensure_ascii=False, separators=(',', ':'))
+                 for item in upserts]
+        lines += [json.dumps({'op': 'del', 'id': item_id, **extra}, separators=(',', ':'))
+                  for item_id in deletes]
+        if not lines:
+            return
+
+        with self._lock:
+            if self._handle is None:
+                directory = os.path.dirname(self.journal_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._handle = open(self.journal_file, 'a', encoding='utf-8')
+            self._handle.write('\n'.join(lines) + '\n')
+            self._handle.flush()
+            self.records += len(lines)
+
+    def needs_compaction(self) -> bool:
+        return self.records >= self.compact_threshold and not self.is_compacting()
+
+    def is_compacting(self) -> bool:
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def compact(self, snapshot: Callable[[], Dict[str, Any]], background: bool = True) -> None:
+        """
+        Replie le journal dans un nouvel instantané.
+        `snapshot` construit le document complet à partir de l'état en mémoire ;
+        il est appelé après la rotation du journal, les mutations suivantes
+        vont donc dans le nouveau journal et seront rejouées par-dessus.
+        """
+        if self.is_compacting():
+            return
+
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if os.path.exists(self.journal_file):
+                if os.path.exists(self.compacting_file):
+                    # Compaction précédente interrompue : on concatène
+                    with open(self.journal_file, 'r', encoding='utf-8') as src, \
+                            open(self.compacting_file, 'a', encoding='utf-8') as dst:
+                        dst.write(src.read())
+                    os.remove(self.journal_file)
+                else:
+                    os.replace(self.journal_file, self.compacting_file)
+            self.records = 0
+
+        if background:
+            self._compaction = threading.Thread(target=self._write_snapshot, args=(snapshot,),
+                                                name=f"{self.collection}-journal-compaction", daemon=True)
+            self._compaction.start()
+        else:
+            self._write_snapshot(snapshot)
+
+    def _write_snapshot(self, snapshot: Callable[[], Dict[str, Any]]) -> None:
+        try:
+            atomic_write_json(self.snapshot_file, snapshot(), indent=None)
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+        except Exception as e:
+            # Le journal gelé est conservé : il sera rejoué au prochain démarrage
+            print(f"Erreur compaction journal: {e}")
+
+    def close(self) -> None:
+        """Attend la fin d'une compaction en cours et ferme le journal"""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,209 @@
+import codecs
+import json
+import os
+import re
+from json.decoder import scanstring
+from json.scanner import make_scanner
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Progression : (octets lus, taille totale du fichier)
+Progress = Callable[[int, int], None]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Tableau sans tableau imbriqué (ex. liste de logs : objets plats), reconnu sans être décodé.
+# Boucle « déroulée » : chaque répétition commence par un délimiteur distinct ("),
+# ce qui évite tout retour arrière exponentiel en cas d'échec
+_FLAT_ARRAY = re.compile(r'\[[^"\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]]*)*\]', re.DOTALL)
+
+
+class JsonCollectionReader:
+    """
+    Lecture en flux d'un document JSON {collection: [...], autres clés}.
+
+    Le fichier est lu par blocs et chaque élément du tableau `collection`
+    est décodé puis produit aussitôt : la mémoire utilisée dépend de la taille
+    d'un élément, pas de celle du fichier. Les autres clés (ex. next_film_id)
+    sont placées dans `meta`, complet une fois l'itération terminée.
+    Si `raw_key` est donné, la valeur de cette clé dans chaque élément est
+    conservée sous forme de texte JSON, sans être décodée.
+    """
+
+    def __init__(self, path: str, collection: str, raw_key: Optional[str] = None,
+                 chunk_size: int = 1 << 20, max_item_size: int = 64 << 20,
+                 progress: Optional[Progress] = None):
+        self.path = path
+        self.collection = collection
+        self.raw_key = raw_key
+        self.chunk_size = chunk_size
+        # Au-delà, un élément qui ne se décode pas est considéré comme invalide (et non incomplet)
+        self.max_item_size = max_item_size
+        self.progress = progress
+        self.meta: Dict[str, Any] = {}
+        self._scan = make_scanner(json.JSONDecoder())
+        self._raw_key_re = re.compile(r'"%s"\s*:\s*' % re.escape(raw_key)) if raw_key else None
+        self._file = None
+        self._decoder = None
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._bytes_read = 0
+        self._total = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.path, 'rb') as f:
+            self._file = f
+            self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            self._buf, self._pos, self._eof = '', 0, False
+            self._bytes_read, self._total = 0, os.fstat(f.fileno()).st_size
+            self.meta = {}
+
+            tok = self._parse(self._object_start)
+            while tok != '}':
+                key = self._parse(self._key)
+                if key == self.collection:
+                    tok = self._parse(self._array_start)
+                    while tok != ']':
+                        item, tok = self._parse(self._element)
+                        yield item
+                    tok = self._parse(self._delimiter)
+                else:
+                    self.meta[key], tok = self._parse(self._value)
+                if tok not in (',', '}'):
+                    raise ValueError(f"JSON invalide dans {self.path}: ',' ou '}}' attendu")
+            self._file = None
+
+    # --- Gestion du tampon ---
+
+    def _fill(self) -> bool:
+        """Ajoute un bloc au tampon en abandonnant la partie déjà lue ; False en fin de fichier"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        self._eof = not chunk
+        self._bytes_read += len(chunk)
+        self._buf = self._buf[self._pos:] + self._decoder.decode(chunk, final=self._eof)
+        self._pos = 0
+        if self.progress:
+            self.progress(self._bytes_read, self._total)
+        return bool(chunk)
+
+    def _parse(self, step: Callable[[str, int], Tuple[Any, int]]) -> Any:
+        """
+        Exécute une étape d'analyse sur le tampon ; si les données sont
+        incomplètes (fin de bloc), lit le bloc suivant et recommence l'étape
+        """
+        while True:
+            try:
+                value, pos = step(self._buf, self._pos)
+                self._pos = pos
+                return value
+            except (IndexError, ValueError, StopIteration) as e:
+                if len(self._buf) - self._pos > self.max_item_size or not self._fill():
+                    offset = self._bytes_read - len(self._buf.encode('utf-8')) + self._pos
+                    raise ValueError(f"JSON invalide dans {self.path} (vers l'octet {offset}): {e!r}")
+
+    # --- Étapes (chacune ne valide qu'une fois suivie d'un délimiteur) ---
+
+    @staticmethod
+    def _token(buf: str, pos: int) -> Tuple[str, int]:
+        pos = _WHITESPACE.match(buf, pos).end()
+        return buf[pos], pos + 1
+
+    def _object_start(self, buf: str, pos: int) -> Tuple[str, int]:
+        tok, pos = self._token(buf, pos)
+        if tok != '{':
+            raise ValueError("objet attendu")
+        tok, end = self._token(buf, pos)
+        return ('}', end) if tok == '}' else (',', pos)
+
+    def _key(self, buf: str, pos: int) -> Tuple[str, int]:
+        tok, pos = self._token(buf, pos)
+        if tok != '"':
+            raise ValueError("clé attendue")
+        key, pos = scanstring(buf, pos)
+        tok, pos = self._token(buf, pos)
+        if tok != ':':
+            raise ValueError("':' attendu")
+        return key, pos
+
+    def _array_start(self, buf: str, pos: int) -> Tuple[str, int]:
+        tok, pos = self._token(buf, pos)
+        if tok != '[':
+            raise ValueError("tableau attendu")
+        tok, end = self._token(buf, pos)
+        return (']', end) if tok == ']' else (',', pos)
+
+    def _delimiter(self, buf: str, pos: int) -> Tuple[str, int]:
+        return self._token(buf, pos)
+
+    def _value(self, buf: str, pos: int) -> Tuple[Tuple[Any, str], int]:
+        value, pos = self._scan(buf, _WHITESPACE.match(buf, pos).end())
+        tok, pos = self._token(buf, pos)
+        return (value, tok), pos
+
+    def _element(self, buf: str, pos: int) -> Tuple[Tuple[Any, str], int]:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if self.raw_key and buf[pos] == '{':
+            value, pos = self._object_fast(buf, pos) or self._object(buf, pos)
+        else:
+            value, pos = self._scan(buf, pos)
+        tok, pos = self._token(buf, pos)
+        if tok not in (',', ']'):
+            raise ValueError("',' ou ']' attendu")
+        return (value, tok), pos
+
+    def _object_fast(self, buf: str, pos: int) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Cas courant (format écrit par l'application) : `raw_key` est la dernière
+        clé de l'objet. Le début de l'objet est décodé d'un bloc par le décodeur C
+        et le tableau est repéré par expression régulière. None si le cas ne
+        s'applique pas : décodage clé par clé avec _object
+        """
+        match = self._raw_key_re.search(buf, pos, pos + 65536)
+        if not match:
+            return None
+        head = buf[pos:match.start()].rstrip()
+        if not head.endswith(','):
+            return None
+        try:
+            obj, end = self._scan(head[:-1] + '}', 0)
+        except (ValueError, StopIteration):
+            return None
+        # La clé trouvée doit appartenir à cet objet (et non à un élément suivant)
+        if end != len(head) or not isinstance(obj, dict):
+            return None
+        array = _FLAT_ARRAY.match(buf, match.end())
+        if not array:
+            return None
+        close = _WHITESPACE.match(buf, array.end()).end()
+        if buf[close:close + 1] != '}':
+            return None
+        obj[self.raw_key] = array.group()
+        return obj, close + 1
+
+    def _object(self, buf: str, pos: int) -> Tuple[Dict[str, Any], int]:
+        """Décode un objet en gardant la valeur de `raw_key` sous forme de texte JSON"""
+        obj: Dict[str, Any] = {}
+        tok, pos = self._token(buf, pos + 1)
+        if tok == '}':
+            return obj, pos
+        while True:
+            if tok != '"':
+                raise ValueError("clé attendue")
+            key, pos = scanstring(buf, pos)
+            tok, pos = self._token(buf, pos)
+            if tok != ':':
+                raise ValueError("':' attendu")
+            pos = _WHITESPACE.match(buf, pos).end()
+            match = _FLAT_ARRAY.match(buf, pos) if key == self.raw_key else None
+            if match:
+                obj[key], pos = match.group(), match.end()
+            else:
+                # Tableau imbriqué ou tampon incomplet : décodage normal
+                obj[key], pos = self._scan(buf, pos)
+            tok, pos = self._token(buf, pos)
+            if tok == '}':
+                return obj, pos
+            if tok != ',':
+                raise ValueError("',' ou '}' attendu")
+            tok, pos = self._token(buf, pos)
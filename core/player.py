@@ -0,0 +1,232 @@
+import os
+import shutil
+import socket
+import queue
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+# Emplacements habituels de VLC lorsqu'il n'est pas dans le PATH
+KNOWN_PLAYER_PATHS = [
+    # Windows
+    "C:\\Program Files\\VideoLAN\\VLC\\vlc.exe",
+    "C:\\Program Files (x86)\\VideoLAN\\VLC\\vlc.exe",
+    # Linux
+    "/usr/bin/vlc",
+    "/usr/local/bin/vlc",
+    # WSL
+    "/mnt/c/Program Files/VideoLAN/VLC/vlc.exe",
+    "/mnt/c/Program Files (x86)/VideoLAN/VLC/vlc.exe",
+]
+
+
+def find_player(configured: Optional[str] = None) -> Optional[str]:
+    """
+    Exécutable du lecteur : celui configuré (argument ou variable
+    FILM_FINDER_PLAYER), sinon vlc dans le PATH, sinon un emplacement connu.
+    """
+    configured = configured or os.environ.get('FILM_FINDER_PLAYER')
+    if configured:
+        found = shutil.which(configured)
+        if found:
+            return found
+        print(f"Erreur: lecteur configuré introuvable: {configured}")
+    for name in ('vlc', 'vlc.exe'):
+        found = shutil.which(name)
+        if found:
+            return found
+    for path in KNOWN_PLAYER_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+class PlayerService:
+    """
+    Lecteur VLC unique, réutilisé d'une lecture à l'autre.
+
+    L'exécutable est résolu une seule fois (`find_player`). La première
+    lecture démarre VLC avec son interface de contrôle à distance (rc) sur
+    un port local ; les suivantes s'y connectent et envoient simplement
+    `add <fichier>`, sans payer le démarrage. Si le lecteur a été fermé
+    entre-temps, il est relancé. Si l'interface rc ne répond pas (VLC
+    Windows lancé depuis WSL, par exemple), chaque lecture relance le
+    lecteur comme avant. Les commandes sont exécutées par un thread dédié :
+    `play` et `stop` rendent la main immédiatement.
+    """
+
+    def __init__(self, executable: Optional[str] = None, host: str = '127.0.0.1',
+                 start_timeout: float = 5.0):
+        self._executable = executable
+        self._resolved = executable is not None
+        self.host = host
+        self.start_timeout = start_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._socket: Optional[socket.socket] = None
+        self._port: Optional[int] = None
+        self._started = 0.0
+        self._remote = True  # False si l'interface rc s'est révélée injoignable
+        # Commandes exécutées dans l'ordre par un thread dédié : démarrage,
+        # connexion et arrêt du lecteur ne bloquent jamais l'appelant
+        self._commands: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executable(self) -> Optional[str]:
+        if not self._resolved:
+            self._executable = find_player()
+            self._resolved = True
+        return self._executable
+
+    def play(self, target: str, on_error: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Lit target (fichier ou url) sans attendre le lecteur ; lève
+        FileNotFoundError si aucun lecteur n'est installé. on_error reçoit
+        (depuis le thread du lecteur) le message d'un échec de lancement.
+        """
+        if self.executable is None:
+            raise FileNotFoundError("VLC introuvable")
+        self._submit(self._play, self._player_path(target), on_error)
+
+    def stop(self) -> None:
+        """Arrête la lecture en gardant le lecteur prêt pour la suivante"""
+        self._submit(self._stop)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Ferme le lecteur après les commandes en attente"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is None:
+                return
+            self._commands.put((self._quit, ()))
+            self._commands.put(None)
+        worker.join(timeout)
+
+    def _submit(self, command: Callable, *args) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, args=(self._commands,),
+                                                name="player", daemon=True)
+                self._worker.start()
+            self._commands.put((command, args))
+
+    def _run(self, commands: queue.Queue) -> None:
+        while True:
+            item = commands.get()
+            if item is None:
+                return
+            command, args = item
+            try:
+                command(*args)
+            except Exception as e:
+                print(f"Erreur du lecteur: {e}")
+
+    def _play(self, target: str, on_error: Optional[Callable[[str], None]]) -> None:
+        if self._running():
+            try:
+                self._send(f"add {target}")
+                return
+            except OSError:
+                pass  # pas d'interface rc : on relance le lecteur
+        self._shutdown()
+        try:
+            self._start(target)
+        except OSError as e:
+            if on_error is None:
+                raise
+            on_error(str(e))
+
+    def _stop(self) -> None:
+        if self._running():
+            try:
+                self._send("stop")
+            except OSError:
+                pass
+
+    def _quit(self) -> None:
+        graceful = False
+        if self._running():
+            try:
+                self._send("quit")
+                graceful = True
+            except OSError:
+                pass
+        self._shutdown(graceful)
+
+    def _running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self, target: str) -> None:
+        args = [self.executable]
+        self._port = None
+        if self._remote:
+            self._port = _free_port(self.host)
+            args += ['--extraintf', 'rc', '--rc-host', f'{self.host}:{self._port}']
+        # La cible est passée en argument : pas d'attente du démarrage, et elle
+        # joue même sans interface rc. La connexion se fait à la lecture suivante.
+        self._process = subprocess.Popen(args + [target], stdin=subprocess.DEVNULL,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._started = time.monotonic()
+
+    def _connect(self) -> socket.socket:
+        if self._socket is not None:
+            return self._socket
+        if self._port is None:
+            raise OSError("Lecteur sans interface de contrôle")
+        deadline = self._started + self.start_timeout
+        while True:
+            try:
+                self._socket = socket.create_connection((self.host, self._port), timeout=1)
+                return self._socket
+            except OSError:
+                if not self._running() or time.monotonic() >= deadline:
+                    if self._running():
+                        print("Erreur: l'interface de contrôle du lecteur ne répond pas, une instance par lecture")
+                        self._remote = False
+                    raise
+                time.sleep(0.05)
+
+    def _send(self, command: str) -> None:
+        connection = self._connect()
+        try:
+            connection.sendall(command.encode('utf-8') + b"\n")
+            # Les réponses ne servent pas : on les vide pour ne jamais bloquer le lecteur
+            connection.setblocking(False)
+            try:
+                while connection.recv(4096):
+                    pass
+            except BlockingIOError:
+                pass
+            connection.settimeout(1)
+        except OSError:
+            connection.close()
+            self._socket = None
+            raise
+
+    def _shutdown(self, graceful: bool = False) -> None:
+        """Ferme la connexion et le processus (laissé quitter seul après `quit` si graceful)"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._process is not None:
+            if not graceful and self._process.poll() is None:
+                self._process.terminate()
+            try:
+                self._process.wait(2)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+    def _player_path(self, target: str) -> str:
+        # VLC Windows lancé depuis WSL : chemins /mnt/c/... vers C:\...
+        if os.name == 'posix' and self.executable.endswith('.exe') and target.startswith('/mnt/c/'):
+            return target.replace("/mnt/c/", "C:\\").replace("/", "\\")
+        return target
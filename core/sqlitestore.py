@@ -0,0 +1,203 @@
+import json
+import sqlite3
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+FILM_LOGS_TABLE = """
+CREATE TABLE IF NOT EXISTS film_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    film_id INTEGER NOT NULL,
+    entry TEXT NOT NULL
+)"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS films (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    genre_key TEXT NOT NULL,
+    release_date TEXT NOT NULL,
+    release_year INTEGER NOT NULL,
+    poster_path TEXT NOT NULL DEFAULT '',
+    trailer_url TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    approved INTEGER NOT NULL DEFAULT 0,
+    added_by_user_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_films_title ON films(title_key);
+CREATE INDEX IF NOT EXISTS idx_films_genre ON films(genre_key);
+CREATE INDEX IF NOT EXISTS idx_films_year ON films(release_year);
+CREATE INDEX IF NOT EXISTS idx_films_approved ON films(approved);
+CREATE INDEX IF NOT EXISTS idx_films_added_by ON films(added_by_user_id);
+
+{FILM_LOGS_TABLE};
+CREATE INDEX IF NOT EXISTS idx_film_logs_film ON film_logs(film_id);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at TEXT,
+    user_type TEXT NOT NULL DEFAULT 'user',
+    admin_level INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+FILM_COLUMNS = ('id', 'title', 'genre', 'release_date', 'poster_path', 'trailer_url',
+                'description', 'approved', 'added_by_user_id')
+USER_COLUMNS = ('id', 'first_name', 'last_name', 'email', 'username', 'password_hash',
+                'created_at', 'user_type', 'admin_level')
+
+
+class SqliteStore:
+    """
+    Stockage SQLite des films, de leurs logs et des utilisateurs (data/film.db).
+    Les écritures portent uniquement sur les lignes modifiées.
+    """
+
+    def __init__(self, db_path: str = "data/film.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Connexion partagée, protégée par un verrou (écritures possibles hors thread principal)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate_film_logs()
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _migrate_film_logs(self) -> None:
+        """Anciennes bases : une colonne par champ de log, remplacée par l'entrée JSON complète"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(film_logs)")}
+        if not columns or 'entry' in columns:
+            return
+        # Une seule transaction : l'ancienne table n'est supprimée qu'une fois copiée
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("ALTER TABLE film_logs RENAME TO film_logs_old")
+            self.conn.execute(FILM_LOGS_TABLE)
+            rows = self.conn.execute("SELECT film_id, action, user_id, timestamp "
+                                     "FROM film_logs_old ORDER BY id").fetchall()
+            self.conn.executemany(
+                "INSERT INTO film_logs(film_id, entry) VALUES (?, ?)",
+                [(row['film_id'], json.dumps({'action': row['action'], 'user_id': row['user_id'],
+                                              'timestamp': row['timestamp'], 'film_id': row['film_id']},
+                                             ensure_ascii=False))
+                 for row in rows])
+            self.conn.execute("DROP TABLE film_logs_old")
+
+    # --- Métadonnées ---
+
+    def _get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self.conn.execute("INSERT INTO meta(key, value) VALUES (?, ?) "
+                          "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    # --- Films ---
+
+    def has_catalogue(self) -> bool:
+        """Vrai si le catalogue a déjà été écrit en base (même vide depuis)"""
+        with self._lock:
+            return self._get_meta('next_film_id') is not None
+
+    def load_films(self) -> Dict[str, Any]:
+        """Retourne le catalogue sous la même forme que le contenu de films.json"""
+        with self._lock:
+            logs: Dict[int, List[Dict[str, Any]]] = {}
+            for row in self.conn.execute("SELECT film_id, entry FROM film_logs ORDER BY id"):
+                logs.setdefault(row['film_id'], []).append(json.loads(row['entry']))
+
+            films = []
+            for row in self.conn.execute(f"SELECT {', '.join(FILM_COLUMNS)} FROM films ORDER BY id"):
+                film_data = dict(row)
+                film_data['approved'] = bool(film_data['approved'])
+                film_data['logs'] = logs.get(film_data['id'], [])
+                films.append(film_data)
+
+            return {'films': films, 'next_film_id': int(self._get_meta('next_film_id', '1'))}
+
+    def save_films(self, upserts: List[Dict[str, Any]] = (), deletes: List[int] = (),
+                   next_id: Optional[int] = None) -> None:
+        """Écrit les films modifiés et supprime les films retirés dans une seule transaction"""
+        with self._lock, self.conn:
+            for film_data in upserts:
+                release_date = film_data['release_date']
+                if isinstance(release_date, str):
+                    release_date = date.fromisoformat(release_date)
+                self.conn.execute(
+                    "INSERT INTO films(id, title, title_key, genre, genre_key, release_date, release_year, "
+                    "poster_path, trailer_url, description, approved, added_by_user_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET title = excluded.title, title_key = excluded.title_key, "
+                    "genre = excluded.genre, genre_key = excluded.genre_key, "
+                    "release_date = excluded.release_date, release_year = excluded.release_year, "
+                    "poster_path = excluded.poster_path, trailer_url = excluded.trailer_url, "
+                    "description = excluded.description, approved = excluded.approved, "
+                    "added_by_user_id = excluded.added_by_user_id",
+                    (film_data['id'], film_data['title'], film_data['title'].lower(),
+                     film_data['genre'], film_data['genre'].lower(),
+                     release_date.isoformat(), release_date.year,
+                     film_data.get('poster_path') or '', film_data.get('trailer_url') or '',
+                     film_data.get('description') or '', int(bool(film_data.get('approved'))),
+                     film_data.get('added_by_user_id', 0)))
+                # Les logs d'un film sont bornés (100 entrées) : on les remplace en bloc.
+                # Chaque entrée est gardée telle quelle (JSON), y compris hors format standard
+                self.conn.execute("DELETE FROM film_logs WHERE film_id = ?", (film_data['id'],))
+                self.conn.executemany(
+                    "INSERT INTO film_logs(film_id, entry) VALUES (?, ?)",
+                    [(film_data['id'], json.dumps(log, ensure_ascii=False))
+                     for log in film_data.get('logs', [])])
+            for film_id in deletes:
+                self.conn.execute("DELETE FROM films WHERE id = ?", (film_id,))
+                self.conn.execute("DELETE FROM film_logs WHERE film_id = ?", (film_id,))
+            if next_id is not None:
+                self._set_meta('next_film_id', next_id)
+
+    # --- Utilisateurs ---
+
+    def has_users(self) -> bool:
+        """Vrai si les utilisateurs ont déjà été écrits en base"""
+        with self._lock:
+            return self._get_meta('users_initialized') is not None
+
+    def load_users(self) -> Dict[str, Any]:
+        """Retourne les utilisateurs sous la même forme que le contenu de users.json"""
+        with self._lock:
+            users = []
+            for row in self.conn.execute(f"SELECT {', '.join(USER_COLUMNS)} FROM users ORDER BY id"):
+                user_data = dict(row)
+                if user_data['created_at'] is None:
+                    del user_data['created_at']
+                if user_data['admin_level'] is None:
+                    del user_data['admin_level']
+                users.append(user_data)
+            return {'users': users}
+
+    def save_users(self, upserts: List[Dict[str, Any]], deletes: List[int] = ()) -> None:
+        """Écrit uniquement les utilisateurs fournis (et supprime ceux retirés)"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO users({', '.join(USER_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(user_data['id'], user_data['first_name'], user_data['last_name'], user_data['email'],
+                  user_data['username'], user_data['password_hash'], user_data.get('created_at'),
+                  user_data.get('user_type', 'user'), user_data.get('admin_level'))
+                 for user_data in upserts])
+            self.conn.executemany("DELETE FROM users WHERE id = ?", [(user_id,) for user_id in deletes])
+            self._set_meta('users_initialized', 1)
@@ -0,0 +1,361 @@
+import atexit
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from core.database import Database
+from core.journal import Journal
+from core.jsonstream import JsonCollectionReader, Progress
+from core.sqlitestore import SqliteStore
+
+Snapshot = Callable[[], Dict[str, Any]]
+
+# Garanties de durabilité (FILM_FINDER_DURABILITY) :
+#   "immediate" : chaque save() est écrit avant de retourner, sauf dans un bloc
+#                 batch() où les mutations sont écrites en une fois à la sortie du bloc
+#   "deferred"  : les mutations sont regroupées et écrites au plus toutes les
+#                 `flush_interval` secondes, ainsi qu'à flush()/close() et à la sortie
+#                 du processus ; un arrêt brutal peut perdre cette dernière fenêtre
+DURABILITY_MODES = ('immediate', 'deferred')
+
+# Clé dont la valeur reste du texte JSON lors d'une lecture en flux (décodée à la demande)
+RAW_KEYS = {'films': 'logs'}
+
+
+class StorageBackend:
+    """
+    Interface commune des moteurs de stockage d'une collection ("films" ou "users").
+
+    `load()` retourne le document sous la même forme que le fichier JSON
+    historique ({collection: [...], ...}). `save()` reçoit une fonction
+    construisant l'instantané complet, appelée seulement par les moteurs qui
+    réécrivent tout, ainsi que les éléments modifiés/supprimés : les moteurs
+    incrémentaux n'écrivent que ce delta.
+    """
+
+    kind = 'base'
+
+    def __init__(self, path: str, collection: str):
+        self.path = path
+        self.collection = collection
+        self.durability = 'immediate'
+        self.flush_interval = 0.5
+        self.set_durability(os.environ.get('FILM_FINDER_DURABILITY', 'immediate'),
+                            float(os.environ.get('FILM_FINDER_FLUSH_INTERVAL', 0.5)))
+
+        # Mutations en attente d'écriture (regroupées par ID : la dernière l'emporte)
+        self._pending_lock = threading.RLock()
+        self._pending_snapshot: Optional[Snapshot] = None
+        self._pending_upserts: Dict[int, Dict[str, Any]] = {}
+        self._pending_deletes: Dict[int, None] = {}
+        self._pending_meta: Dict[str, Any] = {}
+        self._batch_depth = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
+
+    def set_durability(self, mode: str, flush_interval: Optional[float] = None) -> None:
+        """Choisit le mode de durabilité (voir DURABILITY_MODES)"""
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Mode de durabilité inconnu: {mode}")
+        self.durability = mode
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+
+    def load(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def stream(self, meta: Dict[str, Any], progress: Optional[Progress] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Produit les éléments de la collection un par un ; `meta` reçoit les
+        autres clés du document. Par défaut load() puis parcours, la progression
+        étant comptée en éléments
+        """
+        data = self.load()
+        items = data.pop(self.collection, [])
+        meta.update(data)
+        for done, item in enumerate(items, 1):
+            yield item
+            if progress and (done % 1000 == 0 or done == len(items)):
+                progress(done, len(items))
+
+    def save(self, snapshot: Snapshot, upserts: List[Dict[str, Any]] = (), deletes: List[int] = (),
+             meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Enregistre une mutation ; retourne False si rien n'a été écrit.
+        Dans un bloc batch() ou en mode "deferred", la mutation est mise en
+        attente et True est retourné : une erreur d'écriture est alors signalée
+        par flush(), qui conserve les mutations pour une nouvelle tentative
+        """
+        # If NO_AUTO_SAVE is set, skip saving to avoid accidental overwrites
+        if os.environ.get('NO_AUTO_SAVE') == '1':
+            self._log(f"SKIP SAVE_{self.collection.upper()} {self.path}")
+            return False
+
+        with self._pending_lock:
+            if self._batch_depth or self.durability == 'deferred':
+                self._queue(snapshot, upserts, deletes, meta or {})
+                if not self._batch_depth:
+                    self._schedule_flush()
+                return True
+            if self._pending_snapshot is not None:
+                # Mutations restées en attente après un échec : écrites avec celle-ci
+                self._queue(snapshot, upserts, deletes, meta or {})
+                return self.flush()
+            return self._write_safely(snapshot, list(upserts), list(deletes), meta or {})
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Regroupe toutes les mutations du bloc en une seule écriture à sa sortie"""
+        with self._pending_lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._pending_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                if self.durability == 'deferred':
+                    self._schedule_flush()
+                else:
+                    self.flush()
+
+    def has_pending(self) -> bool:
+        with self._pending_lock:
+            return self._pending_snapshot is not None
+
+    def flush(self) -> bool:
+        """Écrit immédiatement les mutations en attente ; True si tout est écrit"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending_snapshot is None:
+                return True
+            if not self._write_safely(self._pending_snapshot, list(self._pending_upserts.values()),
+                                      list(self._pending_deletes), self._pending_meta):
+                # Échec : les mutations restent en attente pour la prochaine tentative
+                return False
+            self._pending_snapshot = None
+            self._pending_upserts, self._pending_deletes, self._pending_meta = {}, {}, {}
+            return True
+
+    def _queue(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> None:
+        self._pending_snapshot = snapshot
+        for item in upserts:
+            self._pending_deletes.pop(item['id'], None)
+            self._pending_upserts[item['id']] = item
+        for item_id in deletes:
+            self._pending_upserts.pop(item_id, None)
+            self._pending_deletes[item_id] = None
+        self._pending_meta.update(meta)
+
+    def _schedule_flush(self) -> None:
+        with self._pending_lock:
+            if self._flush_timer is not None or self._pending_snapshot is None:
+                return
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _write_safely(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+                      meta: Dict[str, Any]) -> bool:
+        try:
+            return self._write(snapshot, upserts, deletes, meta)
+        except Exception as e:
+            print(f"Erreur sauvegarde {self.collection} ({self.kind}): {e}")
+            return False
+
+    def _write(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+    def compact(self, snapshot: Snapshot, background: bool = True) -> None:
+        """Replie les écritures incrémentales dans un instantané (sans effet par défaut)"""
+
+    def close(self) -> None:
+        """Écrit les mutations en attente et termine proprement les écritures en cours"""
+        self.flush()
+
+    def _log(self, message: str) -> None:
+        """Ajoute une ligne dans save_log.txt, à côté du fichier de données"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, 'save_log.txt'), 'a', encoding='utf-8') as logf:
+                logf.write(f"{message} at {datetime.now().isoformat()}\n")
+        except Exception:
+            pass
+
+
+class JsonBackend(StorageBackend):
+    """Fichier JSON indenté réécrit à chaque sauvegarde (format historique)"""
+
+    kind = 'json'
+    indent: Optional[int] = 2
+
+    def __init__(self, path: str, collection: str):
+        super().__init__(path, collection)
+        self.database = Database(os.path.dirname(path) or '.')
+
+    def load(self) -> Dict[str, Any]:
+        return self.database.load_json(self.path)
+
+    def stream(self, meta: Dict[str, Any], progress: Optional[Progress] = None) -> Iterator[Dict[str, Any]]:
+        """Lecture en flux du fichier (progression en octets), sans le charger en entier"""
+        if not os.path.exists(self.path):
+            return
+        reader = JsonCollectionReader(self.path, self.collection, raw_key=RAW_KEYS.get(self.collection),
+                                      progress=progress)
+        yield from reader
+        meta.update(reader.meta)
+
+    def _write(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> bool:
+        if not self.database.save_json(self.path, snapshot(), indent=self.indent):
+            return False
+        self._log(f"SAVE_{self.collection.upper()} {self.path}")
+        return True
+
+
+class CompactJsonBackend(JsonBackend):
+    """Même fichier JSON, sans indentation ni espaces (plus petit, plus rapide à écrire)"""
+
+    kind = 'compact'
+    indent = None
+
+
+class JournalBackend(StorageBackend):
+    """Instantané JSON + journal en ajout seul, compacté en arrière-plan"""
+
+    kind = 'journal'
+
+    def __init__(self, path: str, collection: str):
+        super().__init__(path, collection)
+        self.journal = Journal(path, collection)
+
+    def load(self) -> Dict[str, Any]:
+        return self.journal.replay()
+
+    def _write(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> bool:
+        self.journal.append(upserts, deletes, meta)
+        if self.journal.needs_compaction():
+            self.compact(snapshot)
+        return True
+
+    def compact(self, snapshot: Snapshot, background: bool = True) -> None:
+        self.journal.compact(snapshot, background=background)
+        self._log(f"COMPACT_{self.collection.upper()} {self.path}")
+
+    def close(self) -> None:
+        super().close()
+        self.journal.close()
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Tables de data/film.db (à côté du fichier JSON) ; seules les lignes
+    modifiées sont écrites. Le JSON existant est importé à la première ouverture.
+    """
+
+    kind = 'sqlite'
+
+    def __init__(self, path: str, collection: str):
+        if collection not in ('films', 'users'):
+            raise ValueError(f"Collection non gérée par SQLite: {collection}")
+        super().__init__(path, collection)
+        self.store = SqliteStore(os.path.join(os.path.dirname(path), 'film.db'))
+
+    def load(self) -> Dict[str, Any]:
+        if self.collection == 'films' and self.store.has_catalogue():
+            return self.store.load_films()
+        if self.collection == 'users' and self.store.has_users():
+            return self.store.load_users()
+        if not os.path.exists(self.path):
+            return {}
+
+        # Première ouverture de la base : import du fichier JSON existant
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = data.get(self.collection, [])
+        if self.collection == 'films':
+            highest_id = max((film_data['id'] for film_data in items), default=0)
+            self.store.save_films(items, next_id=max(data.get('next_film_id', 1), highest_id + 1))
+        else:
+            self.store.save_users(items)
+        return data
+
+    def _write(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> bool:
+        if self.collection == 'films':
+            self.store.save_films(upserts, deletes, meta.get('next_film_id'))
+        else:
+            self.store.save_users(upserts, deletes)
+        return True
+
+    def close(self) -> None:
+        super().close()
+        self.store.close()
+
+
+class MemoryBackend(StorageBackend):
+    """Stockage en mémoire, sans aucune entrée/sortie (tests)"""
+
+    kind = 'memory'
+
+    def __init__(self, path: str = '', collection: str = 'films',
+                 initial: Optional[Dict[str, Any]] = None):
+        super().__init__(path, collection)
+        initial = copy.deepcopy(initial or {})
+        self.items: Dict[int, Dict[str, Any]] = {item['id']: item for item in initial.pop(collection, [])}
+        self.meta: Dict[str, Any] = initial
+        self.saves = 0
+
+    def load(self) -> Dict[str, Any]:
+        return copy.deepcopy({**self.meta, self.collection: list(self.items.values())})
+
+    def _write(self, snapshot: Snapshot, upserts: List[Dict[str, Any]], deletes: List[int],
+               meta: Dict[str, Any]) -> bool:
+        for item in upserts:
+            self.items[item['id']] = copy.deepcopy(item)
+        for item_id in deletes:
+            self.items.pop(item_id, None)
+        self.meta.update(meta)
+        self.saves += 1
+        return True
+
+    def _log(self, message: str) -> None:
+        pass
+
+
+STORAGE_BACKENDS = {
+    'json': JsonBackend,
+    'compact': CompactJsonBackend,
+    'journal': JournalBackend,
+    'sqlite': SqliteBackend,
+    'memory': MemoryBackend,
+}
+
+
+def open_storage(path: str, collection: str,
+                 storage: Union[str, StorageBackend, None] = None) -> StorageBackend:
+    """
+    Retourne le moteur de stockage d'une collection.
+    `storage` : instance déjà construite, nom de moteur, ou None pour
+    utiliser FILM_FINDER_STORAGE (défaut : "json")
+    """
+    if isinstance(storage, StorageBackend):
+        return storage
+    kind = storage or os.environ.get('FILM_FINDER_STORAGE', 'json')
+    if kind not in STORAGE_BACKENDS:
+        raise ValueError(f"Moteur de stockage inconnu: {kind}")
+    return STORAGE_BACKENDS[kind](path, collection)
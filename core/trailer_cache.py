@@ -0,0 +1,153 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import List, Optional, Set, Tuple
+
+
+class TrailerCache:
+    """
+    Cache disque des bandes-annonces téléchargées.
+
+    Une entrée est identifiée par sha256(`url|qualité`) et stockée sous
+    `<clé>.mp4` dans `cache_dir`. Les téléchargements écrivent dans un
+    fichier partiel propre à chacun (`<clé>.<jeton>.part.mp4`), renommé
+    atomiquement (os.replace) par `commit` : une entrée visible est
+    toujours complète et deux téléchargements ne s'écrasent pas. Une
+    lecture rafraîchit la date de modification ; au-delà du budget, les
+    entrées les moins récemment utilisées sont supprimées (sauf celles
+    épinglées, en cours de lecture).
+    """
+
+    SUFFIX = '.mp4'
+    # Marque des fichiers partiels (les nôtres et les .part de yt-dlp)
+    PARTIAL_MARK = '.part.'
+
+    def __init__(self, cache_dir: str = "data/cache/trailers", budget_bytes: int = 2 * 2**30):
+        self.cache_dir = cache_dir
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._pinned: Set[str] = set()
+        self._size_bytes: Optional[int] = None  # mesurée au premier commit
+
+    @staticmethod
+    def key(url: str, quality: str = "") -> str:
+        return hashlib.sha256(f"{url}|{quality}".encode('utf-8')).hexdigest()
+
+    def path_for(self, url: str, quality: str = "") -> str:
+        return os.path.join(self.cache_dir, self.key(url, quality) + self.SUFFIX)
+
+    def get(self, url: str, quality: str = "") -> Optional[str]:
+        """Chemin de la bande-annonce en cache, ou None"""
+        path = self.path_for(url, quality)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def contains(self, url: str, quality: str = "") -> bool:
+        """Comme get, sans compter comme une utilisation"""
+        return os.path.exists(self.path_for(url, quality))
+
+    def partial_path(self, url: str, quality: str = "") -> str:
+        """Fichier temporaire (unique) où écrire un téléchargement"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir,
+                            f"{self.key(url, quality)}.{uuid.uuid4().hex[:8]}.part{self.SUFFIX}")
+
+    def commit(self, url: str, quality: str, partial_path: str) -> Optional[str]:
+        """Publie un téléchargement terminé ; retourne le chemin final"""
+        path = self.path_for(url, quality)
+        with self._lock:
+            try:
+                size = os.path.getsize(partial_path)
+                # Deux téléchargements de la même clé : le second remplace le premier
+                try:
+                    replaced = os.path.getsize(path)
+                except OSError:
+                    replaced = 0
+                os.replace(partial_path, path)
+            except OSError as e:
+                print(f"Erreur lors de la mise en cache de la bande-annonce: {e}")
+                self.discard(partial_path)
+                return None
+            if self._size_bytes is None:
+                self._size_bytes = sum(entry_size for _, entry_size, _ in self._entries())
+            else:
+                self._size_bytes += size - replaced
+            if self._size_bytes > self.budget_bytes:
+                self._evict(keep=path)
+        return path
+
+    def discard(self, partial_path: str) -> None:
+        """Supprime un téléchargement abandonné"""
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+
+    def pin(self, path: str) -> None:
+        with self._lock:
+            self._pinned.add(path)
+
+    def unpin(self, path: str) -> None:
+        with self._lock:
+            self._pinned.discard(path)
+
+    def _entries(self) -> List[Tuple[int, int, str]]:
+        """(date de modification, taille, chemin) des entrées complètes"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(self.SUFFIX) and self.PARTIAL_MARK not in entry.name:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            if path == keep or path in self._pinned:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # encore ouverte par un lecteur (Windows)
+            total -= size
+        self._size_bytes = total
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._size_bytes = sum(size for _, size, _ in self._entries())
+            return self._size_bytes
+
+    def clean_partials(self, max_age: float = 3600) -> int:
+        """Supprime les fichiers partiels inactifs depuis max_age secondes (arrêt brutal)"""
+        removed = 0
+        limit = time.time() - max_age
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if self.PARTIAL_MARK not in entry.name:
+                        continue
+                    try:
+                        if entry.stat().st_mtime > limit:
+                            continue
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return removed
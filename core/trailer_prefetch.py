@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from core.downloads import Downloader, DownloadCancelled, RateLimiter, YtDlpDownloader
+from core.trailer_cache import TrailerCache
+
+
+class TrailerPrefetcher:
+    """
+    Préchargement en arrière-plan des bandes-annonces susceptibles d'être regardées.
+
+    Les demandes (url, priorité : plus petite = plus probable) sont placées
+    dans une file de priorité sans doublon et traitées par `max_workers`
+    threads, au débit global `rate_limit` (octets/s) ; le résultat va dans
+    le `TrailerCache`. Pendant un téléchargement au premier plan
+    (`foreground`), les préchargements en cours sont interrompus et remis
+    en file, et aucun autre ne démarre.
+    """
+
+    def __init__(self, cache: TrailerCache, downloader: Optional[Downloader] = None,
+                 quality: str = "", max_workers: int = 1, rate_limit: Optional[float] = None,
+                 max_pending: int = 50):
+        self.cache = cache
+        self.downloader = downloader or YtDlpDownloader()
+        self.quality = quality
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.stats = {'downloaded': 0, 'failed': 0, 'interrupted': 0}
+
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._queued: Dict[str, int] = {}  # url -> priorité courante (entrées du tas plus anciennes ignorées)
+        self._active: Dict[str, threading.Event] = {}
+        self._seq = itertools.count()
+        self._foreground = 0
+        self._closed = False
+        self._workers: List[threading.Thread] = []
+
+    def request(self, url: str, priority: int = 10) -> bool:
+        """Demande le préchargement de url ; False si inutile (déjà en cache, en cours ou fermé)"""
+        if not url or self.cache.contains(url, self.quality):
+            return False
+        with self._cond:
+            if self._closed or url in self._active:
+                return False
+            current = self._queued.get(url)
+            if current is not None and current <= priority:
+                return False
+            if current is None and len(self._queued) >= self.max_pending:
+                worst = max(self._queued, key=self._queued.get)
+                if self._queued[worst] <= priority:
+                    return False
+                del self._queued[worst]
+            self._queued[url] = priority
+            heapq.heappush(self._heap, (priority, next(self._seq), url))
+            self._start_workers()
+            self._cond.notify()
+        return True
+
+    def pending(self) -> List[str]:
+        """Urls en attente, par priorité"""
+        with self._cond:
+            return sorted(self._queued, key=self._queued.get)
+
+    def begin_foreground(self) -> None:
+        """Un téléchargement au premier plan commence : les préchargements cèdent la place"""
+        with self._cond:
+            self._foreground += 1
+            for stop in self._active.values():
+                stop.set()
+
+    def end_foreground(self) -> None:
+        with self._cond:
+            self._foreground = max(0, self._foreground - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def foreground(self):
+        self.begin_foreground()
+        try:
+            yield
+        finally:
+            self.end_foreground()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Attend que la file soit vide et qu'aucun préchargement ne tourne"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queued or self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, wait: bool = False) -> None:
+        """Arrête les threads ; les préchargements en cours sont interrompus"""
+        with self._cond:
+            self._closed = True
+            self._queued.clear()
+            self._heap.clear()
+            for stop in self._active.values():
+                stop.set()
+            self._cond.notify_all()
+            workers = list(self._workers)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._run, name="trailer-prefetch", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next(self) -> Optional[Tuple[int, str, threading.Event]]:
+        with self._cond:
+            while True:
+                while not self._closed and (self._foreground or not self._heap):
+                    self._cond.wait()
+                if self._closed:
+                    return None
+                priority, _, url = heapq.heappop(self._heap)
+                if self._queued.get(url) != priority:
+                    continue  # entrée remplacée par une priorité plus forte, ou abandonnée
+                del self._queued[url]
+                stop = threading.Event()
+                self._active[url] = stop
+                return priority, url, stop
+
+    def _run(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            priority, url, stop = job
+            outcome = None
+            try:
+                if not self.cache.contains(url, self.quality):
+                    self._download(url, stop)
+                    outcome = 'downloaded'
+            except DownloadCancelled:
+                outcome = 'interrupted'
+            except Exception as e:
+                outcome = 'failed'
+                print(f"Erreur lors du préchargement de la bande-annonce {url}: {e}")
+            finally:
+                with self._cond:
+                    self._active.pop(url, None)
+                    if outcome:
+                        self.stats[outcome] += 1
+                    if outcome == 'interrupted' and not self._closed and url not in self._queued:
+                        # Remis en file pour après le téléchargement au premier plan
+                        self._queued[url] = priority
+                        heapq.heappush(self._heap, (priority, next(self._seq), url))
+                    self._cond.notify_all()
+
+    def _download(self, url: str, stop: threading.Event) -> None:
+        partial_path = self.cache.partial_path(url, self.quality)
+        received = [0]
+
+        def on_progress(done: int, total: Optional[int]) -> None:
+            if stop.is_set():
+                raise DownloadCancelled()
+            delta, received[0] = done - received[0], done
+            if self.limiter and delta > 0:
+                self.limiter.consume(delta, stop)
+
+        try:
+            self.downloader(url, self.quality, partial_path, on_progress)
+            if stop.is_set():
+                raise DownloadCancelled()
+            self.cache.commit(url, self.quality, partial_path)
+        finally:
+            self.cache.discard(partial_path)
@@ -0,0 +1,304 @@
+import os
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from core.downloads import Downloader, DownloadCancelled, YtDlpDownloader
+from core.trailer_cache import TrailerCache
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class GrowingFile:
+    """
+    Fichier en cours de téléchargement, lisible pendant qu'il grandit.
+
+    Le téléchargeur signale sa progression (`update`) puis la fin
+    (`finish`) ; les lecteurs attendent (`wait_for`) que les octets dont ils
+    ont besoin soient écrits.
+    """
+
+    def __init__(self, path: str, total: Optional[int] = None):
+        self.path = path
+        self.total = total
+        self.size = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self.readers = 0
+        self._cond = threading.Condition()
+
+    def update(self, size: int, total: Optional[int] = None) -> None:
+        with self._cond:
+            self.size = max(self.size, size)
+            if total:
+                self.total = total
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self._cond:
+            self.done = True
+            self.error = error
+            if error is None:
+                try:
+                    self.size = os.path.getsize(self.path)
+                except OSError:
+                    pass
+                self.total = self.size
+            self._cond.notify_all()
+
+    def add_reader(self, delta: int) -> None:
+        with self._cond:
+            self.readers += delta
+
+    def moved(self, path: str) -> None:
+        """Le fichier complet a été déplacé (publication dans le cache)"""
+        with self._cond:
+            self.path = path
+
+    def wait_for(self, offset: int, timeout: Optional[float] = None) -> int:
+        """Attend que des octets au-delà de offset existent ; retourne la taille écrite
+
+        Retourne une taille <= offset si le fichier est terminé avant offset.
+        Lève IOError si le téléchargement a échoué ou si rien n'arrive avant timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.size > offset or self.done, timeout):
+                raise IOError("Téléchargement interrompu (délai dépassé)")
+            if self.error and self.size <= offset:
+                raise IOError(self.error)
+            return self.size
+
+    def wait_total(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Taille totale (attend qu'elle soit connue, au plus tard à la fin du téléchargement)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.total is not None or self.done, timeout)
+            return self.total
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Attente maximale de nouvelles données avant d'abandonner la réponse
+    read_timeout = 60
+    chunk_size = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool) -> None:
+        growing = self.server.files.get(self.path.lstrip('/'))
+        if growing is None:
+            self.send_error(404)
+            return
+
+        range_header = self.headers.get('Range')
+        match = _RANGE.match(range_header.strip()) if range_header else None
+        total = growing.total
+        # Une plage ne peut être servie qu'une fois la taille totale connue ; mais
+        # « bytes=0- » (première requête des lecteurs) est servi aussitôt en 200
+        if match and total is None and match.groups() != ('0', ''):
+            total = growing.wait_total(self.read_timeout)
+        start, end = 0, None
+        if match and total is not None:
+            first, last = match.groups()
+            if first:
+                start, end = int(first), int(last) if last else total - 1
+            elif last:
+                start, end = max(0, total - int(last)), total - 1
+            end = min(end, total - 1)
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{total}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{total}')
+            self.send_header('Content-Length', str(end - start + 1))
+        else:
+            self.send_response(200)
+            if total is not None:
+                end = total - 1
+                self.send_header('Content-Length', str(total))
+            else:
+                # Taille inconnue : corps délimité par la fermeture de la connexion
+                self.close_connection = True
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        if send_body:
+            self._copy(growing, start, end)
+
+    def _copy(self, growing: GrowingFile, start: int, end: Optional[int]) -> None:
+        growing.add_reader(1)
+        try:
+            with open(growing.path, 'rb') as f:
+                f.seek(start)
+                position = start
+                while end is None or position <= end:
+                    available = growing.wait_for(position, self.read_timeout)
+                    if available <= position:
+                        break  # fin du fichier
+                    limit = available if end is None else min(available, end + 1)
+                    data = f.read(min(self.chunk_size, limit - position))
+                    if not data:
+                        break
+                    self.wfile.write(data)
+                    position += len(data)
+        except OSError:
+            # Lecteur parti (fermeture, saut ailleurs) ou téléchargement échoué
+            self.close_connection = True
+        finally:
+            growing.add_reader(-1)
+
+
+class TrailerStreamServer:
+    """Serveur HTTP local (127.0.0.1 uniquement) des bandes-annonces en cours de téléchargement"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.files = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def publish(self, growing: GrowingFile) -> str:
+        """Rend le fichier accessible ; retourne son url"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._server.serve_forever,
+                                                name="trailer-stream", daemon=True)
+                self._thread.start()
+        token = uuid.uuid4().hex
+        self._server.files[token] = growing
+        return self.base_url + token
+
+    def unpublish(self, url: str) -> None:
+        self._server.files.pop(url.rsplit('/', 1)[-1], None)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+
+class StreamingDownload:
+    """
+    Téléchargement d'une bande-annonce lisible avant la fin.
+
+    Le fichier partiel est servi par le `TrailerStreamServer` ; `on_ready`
+    reçoit l'url locale (une seule fois) dès que `buffer_bytes` octets sont
+    écrits, ou à la fin si le fichier est plus petit. Une fois complet, il
+    est publié dans le `TrailerCache` (au plus tard à `close`, si un lecteur
+    l'a encore ouvert sous Windows). Les rappels sont appelés depuis le
+    thread du téléchargement.
+    """
+
+    def __init__(self, cache: TrailerCache, url: str, quality: str = "",
+                 downloader: Optional[Downloader] = None, server: Optional[TrailerStreamServer] = None,
+                 buffer_bytes: int = 2 * 2**20,
+                 on_ready: Optional[Callable[[str], None]] = None,
+                 on_progress: Optional[Callable[[int, Optional[int]], None]] = None):
+        self.cache = cache
+        self.url = url
+        self.quality = quality
+        self.downloader = downloader or YtDlpDownloader()
+        self.server = server
+        self.buffer_bytes = buffer_bytes
+        self.on_ready = on_ready
+        self.on_progress = on_progress
+        self.stream_url: Optional[str] = None
+        self.path: Optional[str] = None  # chemin dans le cache une fois publié
+        self.growing: Optional[GrowingFile] = None
+        self.stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'StreamingDownload':
+        self._thread = threading.Thread(target=self.run, name="trailer-stream-download", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> Optional[str]:
+        self._ready.wait(timeout)
+        return self.stream_url
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self) -> Optional[str]:
+        """Télécharge (bloquant) ; retourne le chemin dans le cache, ou None (échec,
+        annulation ou publication différée : voir `succeeded`)"""
+        partial_path = self.cache.partial_path(self.url, self.quality)
+        growing = self.growing = GrowingFile(partial_path)
+        if self.server is not None:
+            self.stream_url = self.server.publish(growing)
+
+        def progress(done: int, total: Optional[int]) -> None:
+            if self.stop.is_set():
+                raise DownloadCancelled()
+            growing.update(done, total)
+            if self.on_progress:
+                self.on_progress(done, total)
+            if done >= self.buffer_bytes:
+                self._signal_ready()
+
+        try:
+            self.downloader(self.url, self.quality, partial_path, progress)
+            if self.stop.is_set():
+                raise DownloadCancelled()
+        except Exception as e:
+            growing.finish(error=str(e) or type(e).__name__)
+            self.cache.discard(partial_path)
+            if not isinstance(e, DownloadCancelled):
+                raise
+            return None
+
+        growing.finish()
+        self._signal_ready()
+        if not self._defer_publish():
+            self._publish()
+        return self.path
+
+    @property
+    def succeeded(self) -> bool:
+        """Téléchargement complet (même si sa publication dans le cache attend `close`)"""
+        return self.growing is not None and self.growing.done and not self.growing.error
+
+    def _defer_publish(self) -> bool:
+        # Sous Windows, un fichier encore ouvert par un lecteur ne peut pas être déplacé
+        return bool(self.growing.readers) and os.name == 'nt'
+
+    def _signal_ready(self) -> None:
+        if self._ready.is_set():
+            return
+        self._ready.set()
+        if self.on_ready:
+            self.on_ready(self.stream_url or self.growing.path)
+
+    def _publish(self) -> None:
+        if self.path is None and self.growing and self.growing.done and not self.growing.error:
+            self.path = self.cache.commit(self.url, self.quality, self.growing.path)
+            if self.path:
+                self.growing.moved(self.path)
+
+    def close(self) -> None:
+        """Interrompt le téléchargement s'il tourne encore et retire l'url du serveur"""
+        self.stop.set()
+        self.join()
+        self._publish()
+        if self.server is not None and self.stream_url:
+            self.server.unpublish(self.stream_url)
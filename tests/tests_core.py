@@ -6,14 +6,36 @@ proposition de film, validation par admin, recherche et vérification des logs.
 """
 
 import os
+import shutil
+import sqlite3
+import stat
 import sys
+import tempfile
+import threading
+import time
 import unittest
+import urllib.request
+from unittest import mock
 from datetime import date
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.authcontroller import AuthController
+from core.columns import FilmColumns
 from core.filmcontroller import FilmController
+from core.admins import Admin
+from core.database import Database
+from core.films import Film, FilmAction
+from core.filmindex import FilmIndex
+from core.download_manager import DownloadJob, DownloadManager
+from core.downloads import DownloadCancelled, RateLimiter
+from core.player import PlayerService, find_player
+from core.sqlitestore import SqliteStore
+from core.storage import MemoryBackend
+from core.trailer_cache import TrailerCache
+from core.trailer_prefetch import TrailerPrefetcher
+from core.trailer_stream import StreamingDownload, TrailerStreamServer
+from core.users import User
 
 
 class CoreWorkflowTests(unittest.TestCase):
@@ -94,5 +116,718 @@ class CoreWorkflowTests(unittest.TestCase):
         self.assertIn('approved', actions)
 
 
+class FilmTests(unittest.TestCase):
+    def test_compact_logs_round_trip_through_to_dict(self):
+        logs = [
+            {'action': 'proposed', 'user_id': 2, 'timestamp': '2024-03-01T10:00:00.123456', 'film_id': 7},
+            {'action': 'updated: title: A -> B', 'user_id': 1, 'timestamp': '2024-03-02T08:30:00', 'film_id': 7},
+            {'action': 'archived', 'user_id': 1, 'timestamp': '1965-01-01T00:00:00', 'film_id': 7},
+            # Entrée hors format (horodatage avec fuseau, clé en plus) : conservée telle quelle
+            {'action': 'approved', 'user_id': 1, 'timestamp': '2024-03-03T09:00:00+01:00', 'film_id': 7, 'note': 'x'},
+        ]
+        film = Film.from_dict({'id': 7, 'title': 'Alien', 'genre': ''.join(['Hor', 'reur']),
+                               'release_date': '1979-05-25', 'logs': logs})
+
+        self.assertEqual(film.to_dict()['logs'], logs)
+        self.assertEqual(film.logs.actions(), [FilmAction.PROPOSED, FilmAction.UPDATED,
+                                               FilmAction.OTHER, FilmAction.OTHER])
+        self.assertIs(film.genre, Film(8, 'The Thing', 'Horreur', date(1982, 6, 25)).genre)
+        self.assertFalse(hasattr(film, '__dict__'))
+
+        for _ in range(120):
+            film.approve(admin_id=1)
+        self.assertEqual(len(film.logs), 100)
+        self.assertEqual({log['action'] for log in film.logs}, {'approved'})
+
+
+class FilmIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.films = [
+            Film(1, "Alien", "Horreur", date(1979, 5, 25), approved=True),
+            Film(2, "Aliens, le retour", "Action", date(1986, 7, 18), approved=True),
+            Film(3, "The Thing", "Horreur", date(1982, 6, 25), approved=True),
+            Film(4, "Les Dents de la Mer", "Thriller", date(1975, 6, 20), approved=False),
+        ]
+        self.index = FilmIndex(self.films)
+
+    def test_substring_genre_and_year_search(self):
+        ids = [f.id for f in self.index.search(title="lien")]
+        self.assertEqual(ids, [1, 2])
+        ids = [f.id for f in self.index.search(title="li", genre="horreur")]
+        self.assertEqual(ids, [1])
+        ids = [f.id for f in self.index.search(start_year=1980, end_year=1990)]
+        self.assertEqual(ids, [2, 3])
+        self.assertEqual(self.index.search(title="dents"), [])
+        ids = [f.id for f in self.index.search(title="dents", approved_only=False)]
+        self.assertEqual(ids, [4])
+
+    def test_index_follows_film_updates(self):
+        self.films[2].update_info(title="La Chose", user_id=1)
+        self.assertEqual(self.index.search(title="thing"), [])
+        self.assertEqual([f.id for f in self.index.search(title="chose")], [3])
+
+        self.films[3].approve(admin_id=1)
+        self.assertEqual([f.id for f in self.index.search(title="mer")], [4])
+
+    def test_suggest_ranks_prefix_first_and_caps(self):
+        titles = [f.title for f in self.index.suggest("ali", limit=10)]
+        self.assertEqual(titles, ["Alien", "Aliens, le retour"])
+        # "lien" n'est préfixe d'aucun titre : correspondances internes seulement
+        titles = [f.title for f in self.index.suggest("lien", limit=10)]
+        self.assertEqual(titles, ["Alien", "Aliens, le retour"])
+        self.assertEqual(len(self.index.suggest("a", limit=1)), 1)
+        self.assertEqual(self.index.suggest("les", limit=5), [])
+
+    def test_columns_follow_mutations_and_match_scans(self):
+        self.films[0].update_info(genre="Science-fiction", user_id=1)
+        self.films[3].approve(admin_id=1)
+        self.index.remove(self.films[1])
+        tremors = Film(5, "Tremors", "Horreur", date(1990, 1, 19), approved=True, added_by_user_id=7)
+        self.index.add(tremors)
+        films = [self.films[0], self.films[2], self.films[3], tremors]
+
+        for columns in (self.index.columns, FilmColumns(films, use_numpy=False)):
+            self.assertEqual(columns.select(approved=True, start_year=1979, end_year=1985), [1, 3])
+            self.assertEqual(columns.select(genre="Horreur"), [3, 5])
+            self.assertEqual(columns.select(genre="horreur"), [])
+            self.assertEqual(columns.count(user_id=7), 1)
+            self.assertEqual(columns.count_by('genre'), {"Science-fiction": 1, "Horreur": 2, "Thriller": 1})
+            self.assertEqual(columns.count_by('year', genre="Horreur"), {1982: 1, 1990: 1})
+            self.assertEqual(columns.distinct('approved'), [True])
+
+
+class FilmControllerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.films_file = os.path.join(self.tmp_dir, "films.json")
+        self.user = User(1, "Jean", "Dupont", "jean@email.com", "jdupont", "hash")
+        self.admin = Admin(2, "Admin", "System", "admin@email.com", "admin", "hash")
+        self.films = FilmController(self.films_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def propose(self, title, year=2000):
+        film_data = {'title': title, 'genre': "Drame", 'release_date': date(year, 1, 1)}
+        self.assertTrue(self.films.add_film(film_data, self.user))
+        return self.films.get_all_films()[-1]
+
+    def test_ids_are_never_reused(self):
+        self.propose("Premier")
+        second = self.propose("Second")
+        self.assertTrue(self.films.delete_film(second.id, self.admin))
+
+        reloaded = FilmController(self.films_file)
+        self.assertIsNone(reloaded.get_film_by_id(second.id))
+        self.assertTrue(reloaded.add_film(
+            {'title': "Troisième", 'genre': "Drame", 'release_date': date(2001, 1, 1)}, self.user))
+        self.assertEqual(reloaded.get_all_films()[-1].id, second.id + 1)
+
+    def test_near_duplicates_are_rejected(self):
+        self.propose("Les Dents de la Mer (Jaws)", 1975)
+        duplicate = {'title': "les dents de la mer", 'genre': "Thriller", 'release_date': date(1975, 1, 1)}
+        self.assertFalse(self.films.add_film(duplicate, self.user))
+        # Même titre, autre date : ce n'est pas un doublon
+        remake = {'title': "Les dents de la mer", 'genre': "Thriller", 'release_date': date(2030, 1, 1)}
+        self.assertTrue(self.films.add_film(remake, self.user))
+
+    def test_non_latin_titles_are_distinct(self):
+        for title in ("Сталкер", "Солярис", "七人の侍", "生きる"):
+            self.propose(title, 1979)
+        duplicate = {'title': "СТАЛКЕР", 'genre': "Drame", 'release_date': date(1979, 1, 1)}
+        self.assertFalse(self.films.add_film(duplicate, self.user))
+
+    def test_journal_mode_replays_and_compacts(self):
+        self.films = FilmController(self.films_file, storage="journal")
+        first = self.propose("Premier")
+        second = self.propose("Second")
+        self.assertTrue(self.films.validate_film(first.id, self.admin))
+        self.assertTrue(self.films.delete_film(second.id, self.admin))
+        # Aucune réécriture de l'instantané avant compaction
+        self.assertFalse(os.path.exists(self.films_file))
+
+        reloaded = FilmController(self.films_file, storage="journal")
+        self.assertEqual([f.title for f in reloaded.get_all_films()], ["Premier"])
+        self.assertTrue(reloaded.get_film_by_id(first.id).approved)
+
+        reloaded.compact(background=False)
+        self.assertFalse(os.path.exists(reloaded.storage.journal.journal_file))
+        self.assertTrue(os.path.exists(self.films_file))
+        third = FilmController(self.films_file, storage="journal")
+        self.assertEqual([f.id for f in third.get_all_films()], [first.id])
+        self.assertEqual(third._get_next_film_id(), second.id + 1)
+
+    def test_sqlite_mode_imports_json_and_writes_rows(self):
+        first = self.propose("Premier")  # catalogue JSON existant, importé à l'ouverture
+        films = FilmController(self.films_file, storage="sqlite")
+        self.films = films
+        second = self.propose("Second", 1999)
+        self.assertTrue(films.validate_film(second.id, self.admin))
+        self.assertTrue(films.delete_film(first.id, self.admin))
+        films.close()
+
+        reloaded = FilmController(self.films_file, storage="sqlite")
+        self.assertEqual([f.id for f in reloaded.get_all_films()], [second.id])
+        actions = [log['action'] for log in reloaded.get_film_by_id(second.id).logs]
+        self.assertEqual(actions, ['proposed', 'approved'])
+        reloaded.close()
+
+        users_file = os.path.join(self.tmp_dir, "users.json")
+        auth = AuthController(users_file, storage="sqlite")
+        self.assertIsNotNone(auth.register_user("Jean", "Dupont", "jean@email.com", "jdupont", "Pass123!"))
+        self.assertEqual(AuthController(users_file, storage="sqlite").get_users_count(), 1)
+
+    def test_sqlite_store_keeps_non_standard_log_entries(self):
+        db_path = os.path.join(self.tmp_dir, "film.db")
+        # Ancienne base : une colonne par champ de log, migrée à l'ouverture
+        old = sqlite3.connect(db_path)
+        old.execute("CREATE TABLE film_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, film_id INTEGER NOT NULL, "
+                    "action TEXT NOT NULL, user_id INTEGER NOT NULL, timestamp TEXT NOT NULL)")
+        old.execute("INSERT INTO film_logs(film_id, action, user_id, timestamp) "
+                    "VALUES (1, 'proposed', 1, '2024-01-01T10:00:00')")
+        old.commit()
+        old.close()
+
+        store = SqliteStore(db_path)
+        film_data = {'id': 1, 'title': "Premier", 'genre': "Drame", 'release_date': "2000-01-01"}
+        store.conn.execute("INSERT INTO films(id, title, title_key, genre, genre_key, release_date, release_year) "
+                           "VALUES (1, 'Premier', 'premier', 'Drame', 'drame', '2000-01-01', 2000)")
+        self.assertEqual(store.load_films()['films'][0]['logs'],
+                         [{'action': 'proposed', 'user_id': 1, 'timestamp': '2024-01-01T10:00:00', 'film_id': 1}])
+
+        logs = [{'action': 'proposed', 'user_id': 1, 'timestamp': '2024-01-01T10:00:00', 'film_id': 1},
+                {'action': 'imported', 'timestamp': '2024-01-01', 'source': 'csv', 'film_id': 1}]
+        store.save_films([{**film_data, 'logs': logs}])
+        store.close()
+        self.assertEqual(SqliteStore(db_path).load_films()['films'][0]['logs'], logs)
+
+    def test_facets_follow_every_mutation(self):
+        ids = [self.propose(f"Film {i}", 1990 + i % 2).id for i in range(4)]
+        self.assertEqual(self.films.get_facets(approved_only=False),
+                         {'genre': {"Drame": 4}, 'year': {1990: 2, 1991: 2}, 'approved': {False: 4}})
+        self.assertEqual(self.films.get_facets(), {'genre': {}, 'year': {}, 'approved': {}})
+
+        self.films.validate_films(ids[:3], self.admin)
+        self.films.update_film(ids[0], {'genre': "Thriller"}, self.admin)
+        self.films.delete_film(ids[1], self.admin)
+        self.assertEqual(self.films.get_facets(),
+                         {'genre': {"Thriller": 1, "Drame": 1}, 'year': {1990: 2}, 'approved': {True: 2}})
+        self.assertEqual(self.films.get_facets(approved_only=False)['approved'], {True: 2, False: 1})
+
+        films, facets = self.films.search_with_facets(title="film", genre="drame")
+        self.assertEqual([f.id for f in films], [ids[2]])
+        self.assertEqual(facets, {'genre': {"Drame": 1}, 'year': {1990: 1}, 'approved': {True: 1}})
+
+    def test_search_pages_follow_cursor_and_report_total(self):
+        for i in range(7):
+            self.propose(f"Film {i}", 1990 + i)
+        expected = [f.id for f in self.films.search_films(title="film", approved_only=False)]
+
+        seen, cursor = [], None
+        while True:
+            page = self.films.search_page(title="film", approved_only=False, limit=3, cursor=cursor)
+            self.assertEqual(page.total, 7)
+            seen.extend(f.id for f in page.films)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+        page = self.films.search_page(title="film", approved_only=False, limit=2, offset=5)
+        self.assertEqual([f.id for f in page.films], expected[5:7])
+        self.assertIsNone(page.next_cursor)
+
+        cursor = self.films.search_page(title="film", approved_only=False, limit=2).next_cursor
+        with self.assertRaises(ValueError):
+            self.films.search_page(title="autre", approved_only=False, cursor=cursor)
+
+    def test_memory_backend_round_trips_without_io(self):
+        storage = MemoryBackend(collection='films')
+        self.films = FilmController(self.films_file, storage=storage)
+        first = self.propose("Premier")
+        second = self.propose("Second")
+        self.assertTrue(self.films.delete_film(second.id, self.admin))
+        self.assertFalse(os.path.exists(self.films_file))
+
+        reloaded = FilmController(self.films_file, storage=storage)
+        self.assertEqual([f.id for f in reloaded.get_all_films()], [first.id])
+        self.assertEqual(reloaded._get_next_film_id(), second.id + 1)
+        self.assertEqual(storage.saves, 3)
+
+    def test_batch_and_deferred_saves_are_coalesced(self):
+        storage = MemoryBackend(collection='films')
+        self.films = FilmController(self.films_file, storage=storage)
+        with self.films.batch():
+            ids = [self.propose(f"Film {i}").id for i in range(5)]
+            for film_id in ids:
+                self.assertTrue(self.films.validate_film(film_id, self.admin))
+            self.assertEqual(storage.saves, 0)
+        self.assertEqual(storage.saves, 1)
+        self.assertTrue(all(item['approved'] for item in storage.items.values()))
+
+        storage.set_durability('deferred', flush_interval=60)
+        self.assertTrue(self.films.delete_film(ids[0], self.admin))
+        self.propose("Film 5")
+        self.assertEqual(storage.saves, 1)
+        self.assertTrue(storage.has_pending())
+        self.films.close()
+        self.assertEqual(storage.saves, 2)
+        self.assertEqual(len(storage.items), 5)
+        self.assertEqual(storage.meta['next_film_id'], ids[-1] + 2)
+
+    def test_bulk_operations_return_per_id_results_and_save_once(self):
+        storage = MemoryBackend(collection='films')
+        self.films = FilmController(self.films_file, storage=storage)
+        ids = [self.propose(f"Film {i}", 1990 + i).id for i in range(6)]
+        saves = storage.saves
+
+        self.assertEqual(self.films.validate_films(ids[:3] + [999], self.admin),
+                         {ids[0]: True, ids[1]: True, ids[2]: True, 999: False})
+        self.assertEqual(self.films.validate_films([ids[0]], self.admin), {ids[0]: True})
+        self.assertEqual(self.films.reject_films([ids[2]], self.admin), {ids[2]: True})
+        self.assertEqual([f.id for f in self.films.get_approved_films()], ids[:2])
+
+        patches = {ids[3]: {'title': "Zorro"}, ids[4]: {'genre': "Western"}, ids[5]: {'title': "Film 5"}}
+        self.assertEqual(self.films.update_films(patches, self.admin),
+                         {ids[3]: True, ids[4]: True, ids[5]: False})
+        self.assertEqual(self.films.suggest_titles("zor", approved_only=False), ["Zorro"])
+
+        self.assertEqual(self.films.delete_films([ids[1], ids[3], 999], self.admin),
+                         {ids[1]: True, ids[3]: True, 999: False})
+        self.assertEqual(self.films.suggest_titles("zor", approved_only=False), [])
+        self.assertEqual(self.films.search_films(title="film", approved_only=False),
+                         [self.films.get_film_by_id(i) for i in (ids[0], ids[2], ids[4], ids[5])])
+        # Une écriture par opération groupée (la seconde validation n'a rien changé)
+        self.assertEqual(storage.saves - saves, 4)
+        self.assertEqual(sorted(storage.items), [ids[0], ids[2], ids[4], ids[5]])
+
+    def test_invalid_patch_fails_alone_and_others_are_saved(self):
+        storage = MemoryBackend(collection='films')
+        self.films = FilmController(self.films_file, storage=storage)
+        ids = [self.propose(f"A{i}").id for i in range(3)]
+
+        patches = {ids[0]: {'title': "Changed"}, ids[1]: {'title': "Half", 'rating': 5},
+                   ids[2]: {'genre': "Western"}}
+        self.assertEqual(self.films.update_films(patches, self.admin),
+                         {ids[0]: True, ids[1]: False, ids[2]: True})
+        self.assertEqual(self.films.get_film_by_id(ids[1]).title, "A1")
+        self.assertEqual([storage.items[i]['title'] for i in ids], ["Changed", "A1", "A2"])
+        self.assertEqual(storage.items[ids[2]]['genre'], "Western")
+
+    def test_streaming_load_yields_batches_and_defers_logs(self):
+        ids = [self.propose(f"Film {i}", 1990 + i).id for i in range(5)]
+        self.assertTrue(self.films.validate_film(ids[0], self.admin))
+        self.assertTrue(self.films.delete_film(ids[4], self.admin))
+
+        progress = []
+        films = FilmController(self.films_file, autoload=False)
+        loader = films.iter_load(batch_size=2, progress=lambda done, total: progress.append((done, total)))
+        first_batch = next(loader)
+        self.assertEqual([f.id for f in first_batch], ids[:2])
+        self.assertTrue(films.is_loading())
+        self.assertEqual(films.search_films(title="film"), [first_batch[0]])
+        self.assertIsNotNone(first_batch[0]._raw_logs)
+
+        # Une mutation termine d'abord le chargement (compteur d'IDs compris)
+        self.assertTrue(films.add_film({'title': "Nouveau", 'genre': "Drame",
+                                        'release_date': date(2020, 1, 1)}, self.user))
+        self.assertFalse(films.is_loading())
+        self.assertEqual([f.id for f in films.get_all_films()], ids[:4] + [ids[4] + 1])
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+        logs = films.get_film_by_id(ids[0]).logs
+        self.assertEqual([log['action'] for log in logs], ['proposed', 'approved'])
+        self.assertIsNone(films.get_film_by_id(ids[0])._raw_logs)
+        self.assertEqual(films.suggest_titles("nouv"), [])
+        self.assertEqual(films.suggest_titles("nouv", approved_only=False), ["Nouveau"])
+
+    def test_mutations_during_streaming_load_see_later_batches(self):
+        ids = [self.propose(f"Film {i}", 1990 + i).id for i in range(5)]
+
+        films = FilmController(self.films_file, autoload=False)
+        loader = films.iter_load(batch_size=2)
+        next(loader)
+        self.assertEqual(films.validate_films([ids[3]], self.admin), {ids[3]: True})
+        self.assertFalse(films.is_loading())
+        self.assertTrue(films.get_film_by_id(ids[3]).approved)
+
+        films = FilmController(self.films_file, autoload=False)
+        next(films.iter_load(batch_size=2))
+        self.assertEqual(films.get_film_by_id(ids[4]).title, "Film 4")
+        self.assertTrue(films.delete_film(ids[4], self.admin))
+
+        films = FilmController(self.films_file, autoload=False)
+        next(films.iter_load(batch_size=2))
+        self.assertEqual(films.delete_films([ids[2], ids[4]], self.admin), {ids[2]: True, ids[4]: False})
+        self.assertEqual([f.id for f in films.get_all_films()], [ids[0], ids[1], ids[3]])
+
+
+class DatabaseTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "films.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_rapid_saves_keep_a_bounded_set_of_backups(self):
+        db = Database(self.tmp_dir, keep_last=3, keep_hourly=0, keep_daily=0)
+        for i in range(20):
+            self.assertTrue(db.save_json(self.filename, {'version': i}))
+        self.assertEqual(db.load_json(self.filename), {'version': 19})
+        backups = db.list_backups(self.filename)
+        self.assertEqual([db.load_json(path)['version'] for _, path in backups], [18, 17, 16])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["backups", "films.json"])
+
+    def test_retention_keeps_one_backup_per_hour_and_day(self):
+        db = Database(self.tmp_dir, keep_last=1, keep_hourly=2, keep_daily=2)
+        # Anciennes sauvegardes à côté du fichier (format sans microsecondes)
+        for stamp in ("20250101_080000", "20250101_100000", "20250102_090000",
+                      "20250102_091500", "20250102_100000", "20250102_103000"):
+            open(f"{self.filename}.backup.{stamp}", 'w').close()
+        self.assertEqual(db.prune_backups(self.filename), 3)
+        kept = sorted(os.path.basename(path)[-15:] for _, path in db.list_backups(self.filename))
+        self.assertEqual(kept, ["20250101_100000", "20250102_091500", "20250102_103000"])
+
+    def test_failed_write_leaves_previous_file_intact(self):
+        db = Database(self.tmp_dir)
+        self.assertTrue(db.save_json(self.filename, {'version': 1}))
+        self.assertFalse(db.save_json(self.filename, {'version': object()}))
+        self.assertEqual(db.load_json(self.filename), {'version': 1})
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["backups", "films.json"])
+
+
+    @unittest.skipUnless(os.name == 'posix', "droits POSIX")
+    def test_saves_keep_file_permissions(self):
+        db = Database(self.tmp_dir)
+        umask = os.umask(0o022)
+        try:
+            self.assertTrue(db.save_json(self.filename, {'version': 1}))
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o644)
+        os.chmod(self.filename, 0o640)
+        self.assertTrue(db.save_json(self.filename, {'version': 2}))
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o640)
+
+class TrailerCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = TrailerCache(self.tmp_dir, budget_bytes=250)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def download(self, url, size=100, quality="720p"):
+        partial = self.cache.partial_path(url, quality)
+        with open(partial, 'wb') as f:
+            f.write(b"x" * size)
+        return self.cache.commit(url, quality, partial)
+
+    def test_entries_are_keyed_by_url_and_quality_and_published_atomically(self):
+        first = self.cache.partial_path("https://youtu.be/a", "720p")
+        second = self.cache.partial_path("https://youtu.be/a", "720p")
+        self.assertNotEqual(first, second)
+        self.assertIsNone(self.cache.get("https://youtu.be/a", "720p"))
+
+        path = self.download("https://youtu.be/a")
+        self.assertEqual(self.cache.get("https://youtu.be/a", "720p"), path)
+        self.assertIsNone(self.cache.get("https://youtu.be/a", "1080p"))
+        self.assertEqual(os.listdir(self.tmp_dir), [os.path.basename(path)])
+
+        open(first, 'w').close()
+        os.utime(first, (0, 0))
+        self.assertEqual(self.cache.clean_partials(), 1)
+
+    def test_least_recently_used_entries_are_evicted_over_budget(self):
+        old = self.download("a")
+        pinned = self.download("b")
+        os.utime(old, (1, 1))
+        os.utime(pinned, (0, 0))
+        self.cache.pin(pinned)
+        self.download("c")
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(pinned))
+        self.assertEqual(self.cache.size_bytes(), 200)
+
+    def test_replacing_an_entry_does_not_count_it_twice(self):
+        self.assertEqual(self.cache.size_bytes(), 0)
+        self.download("a")
+        self.download("a", size=120)
+        # Compteur tenu à jour sans rescanner le dossier
+        self.assertEqual(self.cache._size_bytes, 120)
+
+
+class StubDownloader:
+    """Téléchargeur local (sans réseau) : écrit `size` octets par blocs"""
+
+    def __init__(self, size=4000, chunk=500, delay=0.0):
+        self.size = size
+        self.chunk = chunk
+        self.delay = delay
+        self.calls = []
+        self.started = threading.Event()
+        self.cancelled = threading.Event()
+
+    def __call__(self, url, quality, dest, on_progress):
+        self.calls.append(url)
+        self.started.set()
+        with open(dest, 'wb') as f:
+            for done in range(self.chunk, self.size + 1, self.chunk):
+                f.write(b"x" * self.chunk)
+                f.flush()
+                try:
+                    on_progress(done, self.size)
+                except DownloadCancelled:
+                    self.cancelled.set()
+                    raise
+                time.sleep(self.delay)
+
+
+class TrailerPrefetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = TrailerCache(self.tmp_dir)
+        self.downloader = StubDownloader()
+        self.prefetcher = TrailerPrefetcher(self.cache, self.downloader, quality="720p")
+
+    def tearDown(self):
+        self.prefetcher.close(wait=True)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_queue_is_ordered_by_priority_without_duplicates(self):
+        partial = self.cache.partial_path("deja", "720p")
+        open(partial, 'w').close()
+        self.cache.commit("deja", "720p", partial)
+
+        with self.prefetcher.foreground():
+            self.assertTrue(self.prefetcher.request("c", 5))
+            self.assertTrue(self.prefetcher.request("a", 1))
+            self.assertTrue(self.prefetcher.request("b", 3))
+            self.assertTrue(self.prefetcher.request("c", 2))  # survolé : priorité relevée
+            self.assertFalse(self.prefetcher.request("a", 4))
+            self.assertFalse(self.prefetcher.request("deja", 0))
+            self.assertEqual(self.prefetcher.pending(), ["a", "c", "b"])
+
+        self.assertTrue(self.prefetcher.wait_idle(5))
+        self.assertEqual(self.downloader.calls, ["a", "c", "b"])
+        self.assertTrue(all(self.cache.contains(url, "720p") for url in "abc"))
+
+    def test_prefetch_yields_to_foreground_and_is_rate_limited(self):
+        self.downloader.size, self.downloader.chunk = 40000, 1000
+        self.prefetcher.limiter = RateLimiter(100000, burst_seconds=0)
+        self.prefetcher.request("lent")
+        self.assertTrue(self.downloader.started.wait(2))
+
+        self.prefetcher.begin_foreground()
+        self.assertTrue(self.downloader.cancelled.wait(1))
+        time.sleep(0.1)
+        self.assertEqual(self.prefetcher.pending(), ["lent"])
+        self.assertEqual(len(self.downloader.calls), 1)
+
+        start = time.monotonic()
+        self.prefetcher.end_foreground()
+        self.assertTrue(self.prefetcher.wait_idle(10))
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertEqual(os.listdir(self.tmp_dir), [os.path.basename(self.cache.path_for("lent", "720p"))])
+        self.assertEqual(self.prefetcher.stats, {'downloaded': 1, 'failed': 0, 'interrupted': 1})
+
+
+class FileDownloader:
+    """Source locale (sans réseau) : recopie un fichier par blocs, à débit réduit"""
+
+    def __init__(self, source, chunk=4096, delay=0.01, report_total=True):
+        self.source = source
+        self.chunk = chunk
+        self.delay = delay
+        self.report_total = report_total
+
+    def __call__(self, url, quality, dest, on_progress):
+        total = os.path.getsize(self.source) if self.report_total else None
+        with open(self.source, 'rb') as src, open(dest, 'wb') as out:
+            while True:
+                data = src.read(self.chunk)
+                if not data:
+                    break
+                out.write(data)
+                out.flush()
+                on_progress(out.tell(), total)
+                time.sleep(self.delay)
+
+
+class TrailerStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "source.mp4")
+        with open(self.source, 'wb') as f:
+            f.write(os.urandom(160 * 1024))
+        self.cache = TrailerCache(os.path.join(self.tmp_dir, "cache"))
+        self.server = TrailerStreamServer()
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_playback_starts_before_the_download_ends(self):
+        with open(self.source, 'rb') as f:
+            expected = f.read()
+        start = time.monotonic()
+        download = StreamingDownload(self.cache, "https://youtu.be/x", "720p", FileDownloader(self.source),
+                                     self.server, buffer_bytes=16 * 1024).start()
+        url = download.wait_ready(5)
+        with urllib.request.urlopen(url, timeout=5) as response:
+            response.read(1)
+            first_frame = time.monotonic() - start  # premier octet reçu par le lecteur
+            body = expected[:1] + response.read()
+        download.join(5)
+        full_download = time.monotonic() - start
+
+        self.assertEqual(body, expected)
+        self.assertLess(first_frame, full_download / 2)
+        self.assertEqual(download.path, self.cache.get("https://youtu.be/x", "720p"))
+
+        request = urllib.request.Request(url, headers={'Range': 'bytes=1000-1999'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            self.assertEqual(response.status, 206)
+            self.assertEqual(response.read(), expected[1000:2000])
+        download.close()
+
+    def test_open_range_streams_at_once_when_size_is_unknown(self):
+        with open(self.source, 'rb') as f:
+            expected = f.read()
+        download = StreamingDownload(self.cache, "https://youtu.be/y", "720p",
+                                     FileDownloader(self.source, report_total=False),
+                                     self.server, buffer_bytes=16 * 1024).start()
+        url = download.wait_ready(5)
+        request = urllib.request.Request(url, headers={'Range': 'bytes=0-'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            self.assertEqual(response.status, 200)
+            response.read(1)
+            self.assertFalse(download.growing.done)
+            body = expected[:1] + response.read()
+        self.assertEqual(body, expected)
+        download.close()
+
+
+class DownloadManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = TrailerCache(self.tmp_dir)
+        self.downloader = StubDownloader(delay=0.01)
+        self.prefetcher = TrailerPrefetcher(self.cache, StubDownloader(), quality="720p")
+        self.manager = DownloadManager(self.cache, self.downloader, max_workers=1,
+                                       buffer_bytes=1000, prefetcher=self.prefetcher)
+
+    def tearDown(self):
+        self.manager.close(wait=True)
+        self.prefetcher.close(wait=True)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_same_trailer_is_downloaded_once_and_others_queue(self):
+        updates = []
+        first = self.manager.request("a", "720p", lambda job: updates.append((job.status, job.percent)))
+        second = self.manager.request("a", "720p", lambda job: None)
+        other = self.manager.request("b", "720p")
+        self.assertIs(first, second)
+        self.assertEqual([job.url for job in self.manager.jobs()], ["a", "b"])
+        self.assertEqual(other.status, DownloadJob.QUEUED)
+        self.assertEqual(self.prefetcher._foreground, 1)
+
+        self.assertTrue(self.manager.wait_idle(5))
+        self.assertEqual(self.downloader.calls, ["a", "b"])
+        self.assertEqual(first.path, self.cache.get("a", "720p"))
+        self.assertEqual(other.status, DownloadJob.DONE)
+        self.assertEqual(self.prefetcher._foreground, 0)
+        percents = [percent for status, percent in updates if status == DownloadJob.DOWNLOADING and percent is not None]
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual(updates[-1], (DownloadJob.DONE, 100))
+        # Déjà en cache : terminé sans nouveau téléchargement
+        self.assertEqual(self.manager.request("a", "720p").status, DownloadJob.DONE)
+        self.assertEqual(len(self.downloader.calls), 2)
+
+    def test_releasing_quickly_cancels_without_leaking_threads_or_files(self):
+        self.downloader.delay = 0.05
+        listener = lambda job: None
+        for i in range(20):
+            job = self.manager.request(f"film-{i}", "720p", listener)
+            self.manager.release(job, listener)
+        self.assertTrue(self.manager.wait_idle(5))
+
+        statuses = {job.status for job in self.manager.jobs()}
+        self.assertEqual(statuses, {DownloadJob.CANCELLED})
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        workers = [t for t in threading.enumerate() if t.name.startswith("trailer-download")]
+        self.assertLessEqual(len(workers), 1)
+
+    def test_deferred_publish_is_done_and_published_on_release(self):
+        listener = lambda job: None
+        # Fichier encore ouvert par le lecteur sous Windows : déplacement impossible
+        with mock.patch.object(StreamingDownload, '_defer_publish', return_value=True):
+            job = self.manager.request("a", "720p", listener)
+            self.assertTrue(self.manager.wait_idle(5))
+        self.assertEqual(job.status, DownloadJob.DONE)
+        self.assertIsNone(job.path)
+        self.assertTrue(os.path.exists(job.stream_url))
+
+        self.manager.release(job, listener)
+        self.assertEqual(job.path, self.cache.get("a", "720p"))
+        self.assertEqual(os.listdir(self.tmp_dir), [os.path.basename(job.path)])
+
+
+# Faux lecteur : démarre lentement puis note ses arguments et les commandes rc reçues
+FAKE_PLAYER = """#!{python}
+import socket, sys, time
+log = open(sys.argv[0] + '.log', 'a', buffering=1)
+args = sys.argv[1:]
+host, port = args[args.index('--rc-host') + 1].rsplit(':', 1)
+log.write('start ' + args[-1] + '\\n')
+time.sleep(0.3)
+server = socket.socket()
+server.bind((host, int(port)))
+server.listen(1)
+connection, _ = server.accept()
+for line in connection.makefile():
+    log.write(line)
+    if line.strip() == 'quit':
+        break
+"""
+
+
+class PlayerServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fake = os.path.join(self.tmp_dir, "vlc")
+        with open(self.fake, 'w') as f:
+            f.write(FAKE_PLAYER.format(python=sys.executable))
+        os.chmod(self.fake, os.stat(self.fake).st_mode | stat.S_IEXEC)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_player_is_found_in_config_then_path(self):
+        old_path = os.environ.get('PATH', '')
+        os.environ['PATH'] = self.tmp_dir + os.pathsep + old_path
+        try:
+            self.assertEqual(find_player(), self.fake)
+            self.assertEqual(find_player(sys.executable), sys.executable)
+        finally:
+            os.environ['PATH'] = old_path
+
+    def test_repeated_plays_reuse_one_player(self):
+        player = PlayerService(self.fake)
+        start = time.monotonic()
+        player.play("/films/a.mp4")
+        player.play("http://127.0.0.1:1/b")
+        player.play("/films/c.mp4")
+        # Le démarrage (0,3 s) a lieu dans le thread du lecteur, pas chez l'appelant
+        caller = time.monotonic() - start
+        player.close()
+
+        with open(self.fake + '.log') as f:
+            log = f.read().splitlines()
+        self.assertEqual(log, ["start /films/a.mp4", "add http://127.0.0.1:1/b", "add /films/c.mp4", "quit"])
+        self.assertLess(caller, 0.3)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,10 +6,11 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem,
     QMessageBox, QTabWidget, QTextEdit, QDialog, QDialogButtonBox,
-    QSizePolicy, QFormLayout, QComboBox, QDateEdit, QGridLayout, QScrollArea,
-    QFrame, QGroupBox
+    QSizePolicy, QFormLayout, QComboBox, QDateEdit, QScrollArea,
+    QFrame, QGroupBox, QCompleter, QListView, QAbstractItemView, QStyledItemDelegate, QStyle
 )
-from PyQt5.QtCore import Qt, QDate, QSize, pyqtSignal, QUrl, QPropertyAnimation, QEasingCurve, pyqtProperty, QTimer
+from PyQt5.QtCore import Qt, QDate, QSize, pyqtSignal, QUrl, QPropertyAnimation, QEasingCurve, pyqtProperty, QTimer, QStringListModel
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QRectF
 from PyQt5.QtCore import Qt, QCoreApplication
 try:
     from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
@@ -29,16 +30,22 @@ except ImportError:
     print("WebEngine import failed!")
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QPainter, QPainterPath, QColor, QBrush
 
-import subprocess
 import tempfile
 import os
 import threading
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.filmcontroller import FilmController
+from core.player import PlayerService
 from core.admins import Admin
+from core.download_manager import DownloadJob, DownloadManager
+from core.downloads import HAVE_YT_DLP
+from core.trailer_cache import TrailerCache
+from core.trailer_prefetch import TrailerPrefetcher
+from core.trailer_stream import TrailerStreamServer
+from ui.poster_loader import poster_loader
 
 
 class NetflixPosterCard(QLabel):
@@ -46,12 +53,13 @@ class NetflixPosterCard(QLabel):
 
     clicked = pyqtSignal(object)
 
-    def __init__(self, film, width=180, height=270, parent=None):
+    def __init__(self, film, width=180, height=270, lazy=False, parent=None):
         super().__init__(parent)
         self.film = film
         self.width = width
         self.height = height
         self._scale = 1.0
+        self.poster_loaded = False
 
         # Animations
         self.scale_animation = QPropertyAnimation(self, b"scale")
@@ -64,32 +72,56 @@ class NetflixPosterCard(QLabel):
             NetflixPosterCard {
                 border-radius: 8px;
                 background-color: #2d2d2d;
+                color: #666666;
+                font-weight: bold;
             }
         """)
 
-        self.load_poster()
+        if lazy:
+            self.show_placeholder()
+        else:
+            self.load_poster()
+
+    def show_placeholder(self):
+        """Cheap stand-in shown until the poster is loaded (no image decoding)"""
+        self.setText(self.film.title)
+        self.setWordWrap(True)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    def ensure_poster(self):
+        """Load the poster unless it is already there"""
+        if not self.poster_loaded:
+            self.load_poster()
 
     def load_poster(self):
-        """Load poster image"""
+        """Load poster image (decoded in the background, the placeholder stays until then)"""
+        self.poster_loaded = True
         poster_path = getattr(self.film, 'poster_path', '')
-        placeholder_text = self.film.title if hasattr(self.film, 'title') else 'No Poster'
-
-        if poster_path and os.path.exists(poster_path):
-            pixmap = QPixmap(poster_path)
+        if poster_path:
+            if not self.text():
+                self.show_placeholder()
+            poster_loader().request(poster_path, self.width, self.height, self.set_poster, radius=8, owner=self)
         else:
-            # Create placeholder
-            pixmap = QPixmap(self.width, self.height)
-            pixmap.fill(QColor('#2d2d2d'))
+            self.set_poster(None)
 
-            painter = QPainter(pixmap)
-            painter.setPen(QColor('#666666'))
-            painter.setFont(QFont('Arial', 10, QFont.Weight.Bold))
-            painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, placeholder_text)
-            painter.end()
+    def set_poster(self, pixmap):
+        """Show the decoded poster, or a drawn placeholder if there is none"""
+        if pixmap is not None:
+            self.setPixmap(pixmap)
+            return
+
+        placeholder_text = self.film.title if hasattr(self.film, 'title') else 'No Poster'
+        pixmap = QPixmap(self.width, self.height)
+        pixmap.fill(QColor('#2d2d2d'))
+
+        painter = QPainter(pixmap)
+        painter.setPen(QColor('#666666'))
+        painter.setFont(QFont('Arial', 10, QFont.Weight.Bold))
+        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, placeholder_text)
+        painter.end()
 
         # Apply rounded corners
-        rounded_pixmap = self._make_rounded_pixmap(pixmap, 8)
-        self.setPixmap(rounded_pixmap)
+        self.setPixmap(self._make_rounded_pixmap(pixmap, 8))
 
     def _make_rounded_pixmap(self, pixmap, radius):
         """Create pixmap with rounded corners"""
@@ -126,6 +158,11 @@ class NetflixPosterCard(QLabel):
         # Show tooltip
         self.setToolTip(f"{self.film.title}\n{self.film.genre} • {self.film.release_date.year}")
 
+        # Hovered films are the most likely to be opened: warm their trailer first
+        prefetcher = trailer_prefetcher()
+        if prefetcher and getattr(self.film, 'trailer_url', ''):
+            prefetcher.request(self.film.trailer_url, priority=0)
+
         super().enterEvent(event)
 
     def leaveEvent(self, event):
@@ -142,13 +179,208 @@ class NetflixPosterCard(QLabel):
             self.clicked.emit(self.film)
         super().mousePressEvent(event)
 
+class SearchResultsModel(QAbstractListModel):
+    """Search results, fetched page by page from the controller as the view scrolls"""
+
+    FilmRole = Qt.UserRole + 1
+
+    # (films fetched, total matches)
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, film_controller, criteria, page, page_size=48, parent=None):
+        super().__init__(parent)
+        self.film_controller = film_controller
+        self.criteria = criteria
+        self.page_size = page_size
+        self.films = list(page.films)
+        self.total = page.total
+        self.cursor = page.next_cursor
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.films)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        film = self.films[index.row()]
+        if role == self.FilmRole:
+            return film
+        if role == Qt.DisplayRole:
+            return film.title
+        if role == Qt.ToolTipRole:
+            return f"{film.title}\n{film.genre} • {film.release_date.year}"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Called by the view when its last rows come into sight"""
+        if not self.canFetchMore(parent):
+            return
+        try:
+            page = self.film_controller.search_page(limit=self.page_size, cursor=self.cursor, **self.criteria)
+        except ValueError as e:
+            print(f"Search paging error: {e}")
+            self.cursor = None
+            return
+        self.cursor = page.next_cursor
+        self.total = page.total
+        if page.films:
+            start = len(self.films)
+            self.beginInsertRows(QModelIndex(), start, start + len(page.films) - 1)
+            self.films.extend(page.films)
+            self.endInsertRows()
+        self.progress.emit(len(self.films), self.total)
+
+
+class PosterDelegate(QStyledItemDelegate):
+    """Paints a poster cell; the view only asks for the cells currently visible"""
+
+    def __init__(self, width=180, height=270, spacing=20, radius=8, parent=None):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.radius = radius
+        self.font = QFont('Arial', 10, QFont.Weight.Bold)
+        # Paths that could not be decoded, so they are not retried on every repaint
+        self.broken = set()
+        # poster path -> (loader ticket, row) of the posters being decoded
+        self.requests = {}
+
+    def sizeHint(self, option, index):
+        return QSize(self.width + self.spacing, self.height + self.spacing)
+
+    def poster_pixmap(self, film, row):
+        """Scaled poster from the loader's memory cache, or None for a placeholder
+
+        On a cache miss the poster is requested from the background loader
+        and the cell is repainted when it arrives.
+        """
+        poster_path = getattr(film, 'poster_path', '')
+        if not poster_path or poster_path in self.broken:
+            return None
+        pixmap = poster_loader().cached(poster_path, self.width, self.height)
+        if pixmap is not None:
+            return pixmap
+        if poster_path not in self.requests:
+            ticket = poster_loader().request(
+                poster_path, self.width, self.height,
+                lambda pixmap, poster_path=poster_path: self.on_poster_loaded(poster_path, pixmap),
+                owner=self
+            )
+            if ticket is not None:
+                self.requests[poster_path] = (ticket, row)
+        return None
+
+    def on_poster_loaded(self, poster_path, pixmap):
+        self.requests.pop(poster_path, None)
+        if pixmap is None:
+            self.broken.add(poster_path)
+            return
+        self.parent().viewport().update()
+
+    def drop_requests(self, first_row, last_row):
+        """Cancel decoding of posters whose cells have been scrolled away"""
+        for poster_path, (ticket, row) in list(self.requests.items()):
+            if not first_row <= row <= last_row:
+                poster_loader().cancel(ticket)
+                del self.requests[poster_path]
+
+    def paint(self, painter, option, index):
+        film = index.data(SearchResultsModel.FilmRole)
+        if film is None:
+            return
+        margin = self.spacing // 2
+        rect = QRect(option.rect.x() + margin, option.rect.y() + margin, self.width, self.height)
+        if option.state & QStyle.State_MouseOver:
+            # Hover zoom of NetflixPosterCard, drawn rather than animated
+            rect = rect.adjusted(-margin // 2, -margin // 2, margin // 2, margin // 2)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(rect), self.radius, self.radius)
+        painter.setClipPath(path)
+
+        pixmap = self.poster_pixmap(film, index.row())
+        if pixmap is not None:
+            # Centre crop, as the cards do
+            source = QRect((pixmap.width() - self.width) // 2, (pixmap.height() - self.height) // 2,
+                           self.width, self.height)
+            painter.drawPixmap(rect, pixmap, source)
+        else:
+            painter.fillRect(rect, QColor('#2d2d2d'))
+            painter.setPen(QColor('#666666'))
+            painter.setFont(self.font)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter | Qt.TextWordWrap, film.title)
+        painter.restore()
+
+
+class PosterGridView(QListView):
+    """Virtualized poster grid: no widget per film, only visible cells are painted"""
+
+    film_clicked = pyqtSignal(object)
+
+    def __init__(self, width=180, height=270, parent=None):
+        super().__init__(parent)
+        # Wrapping list mode rather than IconMode: with uniform item sizes the layout
+        # is computed arithmetically instead of keeping a geometry per item
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(30)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setItemDelegate(PosterDelegate(width, height, parent=self))
+        self.setStyleSheet("""
+            QListView {
+                background-color: transparent;
+                border: none;
+                padding: 10px;
+            }
+        """)
+        self.clicked.connect(self.on_index_clicked)
+
+    def on_index_clicked(self, index):
+        film = index.data(SearchResultsModel.FilmRole)
+        if film is not None:
+            self.film_clicked.emit(film)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        # Keep the (capped) decoding pool for the cells that can still be seen
+        rect = self.viewport().rect()
+        first = self.indexAt(rect.topLeft())
+        last = self.indexAt(rect.bottomRight())
+        if first.isValid():
+            last_row = last.row() if last.isValid() else self.model().rowCount() - 1
+            self.itemDelegate().drop_requests(first.row(), last_row)
+
+
 class NetflixRow(QWidget):
-    """Horizontal Netflix row with title and scrolling"""
+    """Horizontal Netflix row with title and scrolling
+
+    Cards are only created the first time the row comes into view, and
+    posters are only loaded for the cards in (or near) the visible part
+    of the row; see load_visible_posters.
+    """
+
+    # Posters this far outside the visible part of the row are loaded ahead of scrolling
+    PRELOAD_MARGIN = 200
 
     def __init__(self, title, films, on_film_click, parent=None):
         super().__init__(parent)
         self.films = films
         self.on_film_click = on_film_click
+        self.posters = []
         self.setFixedHeight(320)
 
         self.init_ui(title)
@@ -200,20 +432,33 @@ class NetflixRow(QWidget):
         self.posters_layout.setSpacing(15)
         self.posters_layout.setContentsMargins(10, 5, 10, 15)
 
-        self.create_posters()
-
         self.posters_container.setLayout(self.posters_layout)
         self.scroll_area.setWidget(self.posters_container)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.load_visible_posters)
 
         layout.addWidget(self.scroll_area)
         self.setLayout(layout)
 
     def create_posters(self):
-        """Create posters for this row"""
+        """Create posters for this row (placeholders, loaded by load_visible_posters)"""
         for film in self.films[:20]:  # Limit to 20 films per row
-            poster = NetflixPosterCard(film, 160, 240)
+            poster = NetflixPosterCard(film, 160, 240, lazy=True)
             poster.clicked.connect(self.on_film_click)
             self.posters_layout.addWidget(poster)
+            self.posters.append(poster)
+        self.posters_container.adjustSize()
+        self.posters_layout.activate()
+
+    def load_visible_posters(self):
+        """Called when the row scrolls into view or is scrolled horizontally"""
+        if not self.posters:
+            self.create_posters()
+        left = self.scroll_area.horizontalScrollBar().value() - self.PRELOAD_MARGIN
+        right = left + self.scroll_area.viewport().width() + 2 * self.PRELOAD_MARGIN
+        for poster in self.posters:
+            geometry = poster.geometry()  # cards shadow width()/height() with their target size
+            if geometry.left() < right and geometry.right() > left:
+                poster.ensure_poster()
 
 class NetflixSearchHeader(QWidget):
     """Netflix-style header with search bar"""
@@ -235,6 +480,8 @@ class NetflixSearchHeader(QWidget):
         self.current_genre = None
         self.current_year = None
         self.filters_panel = None
+        # Criteria of the last search, for facet counts of its results (None: whole catalogue)
+        self.result_criteria = None
 
         self.init_ui()
         self.load_filter_data()
@@ -282,6 +529,25 @@ class NetflixSearchHeader(QWidget):
         self.search_input.returnPressed.connect(self.perform_search)
         layout.addWidget(self.search_input)
 
+        # Type-ahead suggestions (ranked and capped by the controller)
+        self.suggestions_model = QStringListModel()
+        self.completer = QCompleter(self.suggestions_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(8)
+        self.completer.activated[str].connect(self.on_suggestion_chosen)
+        self.completer.popup().setStyleSheet("""
+            QListView {
+                background-color: #2d2d2d;
+                border: 1px solid #424242;
+                color: #ffffff;
+                font-size: 14px;
+            }
+            QListView::item:selected {
+                background-color: #e50914;
+            }
+        """)
+        self.search_input.setCompleter(self.completer)
+
         # Timer for real-time search (avoids too frequent searches)
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
@@ -335,25 +601,50 @@ class NetflixSearchHeader(QWidget):
     def on_text_changed(self, text):
         """Triggers search after delay"""
         self.search_timer.stop()
+        self.update_suggestions(text)
         if text.strip():  # Only search if text is entered
             self.search_timer.start(300)  # 300ms delay
 
+    def update_suggestions(self, text):
+        """Refresh completer entries for the typed prefix"""
+        try:
+            titles = self.film_controller.suggest_titles(text, limit=8) if text.strip() else []
+            self.suggestions_model.setStringList(titles)
+        except Exception as e:
+            print(f"Suggestion error: {e}")
+
+    def on_suggestion_chosen(self, title):
+        """Search immediately when a suggestion is picked"""
+        # The completer has already put the title in the line edit
+        self.search_timer.stop()
+        self.perform_search()
+
     def load_filter_data(self):
         """Load data for filters"""
         try:
-            films = self.film_controller.get_all_films()
+            # Facet counts are maintained by the controller on every change: no pass over the catalogue
+            self.facets = self.film_controller.get_facets(approved_only=True)
 
             # Unique genres
-            self.genres = sorted(set(film.genre for film in films if hasattr(film, 'genre') and film.genre))
+            self.genres = sorted(genre for genre in self.facets['genre'] if genre)
 
             # Unique years
-            self.years = sorted(set(film.release_date.year for film in films if hasattr(film, 'release_date')), reverse=True)
+            self.years = sorted(self.facets['year'], reverse=True)
 
         except Exception as e:
             print(f"Error loading filter data: {e}")
+            self.facets = {'genre': {}, 'year': {}}
             self.genres = []
             self.years = []
 
+    def set_result_criteria(self, criteria):
+        """Show counts for the current search results in the filter panel (None: whole catalogue)"""
+        self.result_criteria = criteria
+
+    @staticmethod
+    def facet_label(value, counts):
+        return f"{value} ({counts.get(value, 0):,})"
+
     def toggle_filters(self, checked):
         """Show/hide advanced filters"""
         if checked:
@@ -379,6 +670,13 @@ class NetflixSearchHeader(QWidget):
         """)
         self.filters_panel.setFixedSize(350, 250)
 
+        # Cheap now: refresh so genres/years added since startup show up with current counts
+        self.load_filter_data()
+        counts = self.facets
+        if self.result_criteria:
+            # Computed on demand: result pages are fetched lazily, facets need the whole result set
+            counts = self.film_controller.search_with_facets(**self.result_criteria)[1]
+
         layout = QVBoxLayout()
 
         # Title
@@ -392,7 +690,7 @@ class NetflixSearchHeader(QWidget):
         self.genre_combo = QComboBox()
         self.genre_combo.addItem("All genres", "")
         for genre in self.genres:
-            self.genre_combo.addItem(genre, genre)
+            self.genre_combo.addItem(self.facet_label(genre, counts['genre']), genre)
         # Restore previous selection
         if self.current_genre:
             index = self.genre_combo.findData(self.current_genre)
@@ -415,7 +713,7 @@ class NetflixSearchHeader(QWidget):
         self.year_combo = QComboBox()
         self.year_combo.addItem("All years", "")
         for year in self.years:
-            self.year_combo.addItem(str(year), year)
+            self.year_combo.addItem(self.facet_label(year, counts['year']), year)
         # Restore previous selection
         if self.current_year:
             index = self.year_combo.findData(self.current_year)
@@ -515,6 +813,7 @@ class NetflixSearchHeader(QWidget):
         self.search_input.clear()
         self.current_genre = None
         self.current_year = None
+        self.result_criteria = None
 
         criteria = {'title': None, 'genre': None, 'year': None}
         self.search_requested.emit(criteria)
@@ -536,10 +835,21 @@ class NetflixSearchHeader(QWidget):
 class NetflixGridView(QWidget):
     """Main Netflix-style view with multiple rows"""
 
+    # Rows this far below (or above) the viewport get their posters ahead of scrolling
+    PRELOAD_MARGIN = 320
+
     def __init__(self, film_controller, on_film_click, parent=None):
         super().__init__(parent)
         self.film_controller = film_controller
         self.on_film_click = on_film_click
+        self.rows = []
+
+        # Coalesces scroll/resize notifications; posters are loaded once the event loop is idle,
+        # so the rows and their placeholders are painted first
+        self.visibility_timer = QTimer(self)
+        self.visibility_timer.setSingleShot(True)
+        self.visibility_timer.setInterval(0)
+        self.visibility_timer.timeout.connect(self.load_visible_rows)
 
         self.init_ui()
         self.load_data()
@@ -569,13 +879,44 @@ class NetflixGridView(QWidget):
 
         self.rows_container.setLayout(self.rows_layout)
         self.main_scroll.setWidget(self.rows_container)
+        self.main_scroll.verticalScrollBar().valueChanged.connect(self.schedule_visible_rows)
 
         layout.addWidget(self.main_scroll)
         self.setLayout(layout)
 
+    # Trailers warmed in the background: first films of the first rows
+    PREFETCH_ROWS = 2
+    PREFETCH_PER_ROW = 4
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_visible_rows()
+
+    def prefetch_top_trailers(self):
+        prefetcher = trailer_prefetcher()
+        if not prefetcher:
+            return
+        for rank, row in enumerate(self.rows[:self.PREFETCH_ROWS]):
+            for film in row.films[:self.PREFETCH_PER_ROW]:
+                if film.trailer_url:
+                    prefetcher.request(film.trailer_url, priority=1 + rank)
+
+    def schedule_visible_rows(self, *args):
+        self.visibility_timer.start()
+
+    def load_visible_rows(self):
+        """Load posters of the rows in (or near) the viewport"""
+        self.rows_layout.activate()  # row positions must be up to date
+        top = self.main_scroll.verticalScrollBar().value() - self.PRELOAD_MARGIN
+        bottom = top + self.main_scroll.viewport().height() + 2 * self.PRELOAD_MARGIN
+        for row in self.rows:
+            if row.y() < bottom and row.y() + row.height() > top:
+                row.load_visible_posters()
+
     def load_data(self):
         """Load data and create rows"""
         # Clear old rows
+        self.rows = []
         for i in reversed(range(self.rows_layout.count())):
             item = self.rows_layout.itemAt(i)
             if item.widget():
@@ -611,9 +952,9 @@ class NetflixGridView(QWidget):
             }
 
             # Add rows by genre
-            genres = sorted(set(film.genre for film in all_films if hasattr(film, 'genre')))
+            genres = sorted(self.film_controller.count_films_by('genre', approved=True))
             for genre in genres[:4]:  # Maximum 4 genres
-                genre_films = [f for f in all_films if getattr(f, 'genre', '') == genre]
+                genre_films = self.film_controller.filter_films(genre=genre, approved=True)
                 if genre_films:
                     categories[f"{genre}"] = genre_films[:12]
 
@@ -622,8 +963,11 @@ class NetflixGridView(QWidget):
                 if films:  # Only create if there are films
                     row = NetflixRow(title, films, self.on_film_click)
                     self.rows_layout.addWidget(row)
+                    self.rows.append(row)
 
             self.rows_layout.addStretch()
+            self.schedule_visible_rows()
+            self.prefetch_top_trailers()
 
         except Exception as e:
             error_label = QLabel(f"Error loading movies:\n{str(e)}")
@@ -640,58 +984,144 @@ class NetflixGridView(QWidget):
             """)
             self.rows_layout.addWidget(error_label)
 
-class VideoDownloadThread(QThread):
-    """Thread to download video in background"""
-
-    progress_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal(str)
-    error_signal = pyqtSignal(str)
-
-    def __init__(self, youtube_url):
-        super().__init__()
-        self.youtube_url = youtube_url
-        self.temp_dir = "/mnt/c/Users/utilisateur/Desktop/UFSC/POO/Film_finder/data/"
-        self.video_path = None
-
-    def run(self):
-        try:
-            self.progress_signal.emit("📥 Downloading video...")
-
-            # Unique temporary filename
-            import uuid
-            filename = f"film_finder_trailer.mp4"
-            self.video_path = os.path.join(self.temp_dir, filename)
-
-            # yt-dlp options
-            ydl_opts = {
-                'format': 'best[height<=720]',  # Max 720p quality
-                'outtmpl': self.video_path,
-                'quiet': True,
-            }
-
-            # Download
-            import yt_dlp
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([self.youtube_url])
-
-            if os.path.exists(self.video_path):
-                self.progress_signal.emit("✅ Video downloaded! Launching VLC...")
-                self.finished_signal.emit(self.video_path)
-            else:
-                self.error_signal.emit("❌ Download failed")
-
-        except Exception as e:
-            self.error_signal.emit(f"❌ Error: {str(e)}")
+# yt-dlp format of the trailers, also part of their cache key
+TRAILER_QUALITY = 'best[height<=720]'  # Max 720p quality
+
+# Background trailer prefetching: one download at a time, capped at 512 KB/s
+PREFETCH_RATE_LIMIT = 512 * 1024
+# Playback starts once this much of the trailer is downloaded (a few seconds of 720p)
+STREAM_BUFFER_BYTES = 2 * 2**20
+# Trailers downloading at once for the dialogs; further requests wait in the queue
+DOWNLOAD_WORKERS = 2
+
+_trailer_cache = None
+_trailer_prefetcher = None
+_trailer_stream_server = None
+_trailer_downloads = None
+_player_service = None
+
+
+def trailer_cache():
+    """Trailer cache shared by the dialogs (partial files left by a crash are removed on first use)"""
+    global _trailer_cache
+    if _trailer_cache is None:
+        _trailer_cache = TrailerCache()
+        _trailer_cache.clean_partials()
+    return _trailer_cache
+
+
+def trailer_stream_server():
+    """Loopback HTTP server the player reads trailers from while they download"""
+    global _trailer_stream_server
+    if _trailer_stream_server is None:
+        _trailer_stream_server = TrailerStreamServer()
+    return _trailer_stream_server
+
+
+def trailer_prefetcher():
+    """Shared trailer prefetcher, or None when yt-dlp is not installed"""
+    global _trailer_prefetcher
+    if _trailer_prefetcher is None and HAVE_YT_DLP:
+        _trailer_prefetcher = TrailerPrefetcher(
+            trailer_cache(), quality=TRAILER_QUALITY, max_workers=1, rate_limit=PREFETCH_RATE_LIMIT
+        )
+    return _trailer_prefetcher
+
+
+def trailer_downloads():
+    """Download manager shared by the dialogs: one download per trailer, at most DOWNLOAD_WORKERS at once"""
+    global _trailer_downloads
+    if _trailer_downloads is None:
+        _trailer_downloads = DownloadManager(
+            trailer_cache(), max_workers=DOWNLOAD_WORKERS,
+            server=trailer_stream_server(),
+            buffer_bytes=STREAM_BUFFER_BYTES,
+            prefetcher=trailer_prefetcher()
+        )
+    return _trailer_downloads
+
+
+def player_service():
+    """VLC shared by the dialogs, started on the first play (FILM_FINDER_PLAYER overrides the executable)"""
+    global _player_service
+    if _player_service is None:
+        _player_service = PlayerService()
+    return _player_service
+
+
+def close_trailer_services():
+    """Close the shared trailer services; the next window (after a logout) creates fresh ones"""
+    global _trailer_downloads, _trailer_prefetcher, _trailer_stream_server, _player_service
+    if _trailer_downloads is not None:
+        _trailer_downloads.close()
+        _trailer_downloads = None
+    if _trailer_prefetcher is not None:
+        _trailer_prefetcher.close()
+        _trailer_prefetcher = None
+    if _trailer_stream_server is not None:
+        _trailer_stream_server.close()
+        _trailer_stream_server = None
+    if _player_service is not None:
+        _player_service.close()
+        _player_service = None
+
+
+def describe_download(job):
+    """One-line status of a trailer download (status label, downloads queue)"""
+    if job.status == DownloadJob.QUEUED:
+        ahead = trailer_downloads().queue_position(job)
+        return f"⏳ Waiting for {ahead} other download(s)..." if ahead else "⏳ Waiting for a download slot..."
+    if job.status == DownloadJob.DOWNLOADING:
+        if job.percent is None:
+            return f"📥 Downloading video... {job.downloaded / 2**20:.1f} MB"
+        return f"📥 Downloading video... {job.percent}%"
+    if job.status == DownloadJob.DONE:
+        return "✅ Downloaded"
+    if job.status == DownloadJob.CANCELLED:
+        return "⏹ Cancelled"
+    return f"❌ Error: {job.error}" if job.error else "❌ Download failed"
+
+
+class DownloadWatcher(QObject):
+    """Follows one trailer download, relaying its updates (sent from a worker thread) to the GUI thread"""
+
+    updated = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job = None
+        # Same callable for request and release
+        self._listener = self.updated.emit
+
+    def watch(self, url, label=""):
+        self.release()
+        self.job = trailer_downloads().request(url, TRAILER_QUALITY, self._listener, label=label)
+        # The state sent during request() arrived before self.job was set
+        self.updated.emit(self.job)
+        return self.job
+
+    def release(self):
+        """Stop following the download (cancelled if nobody else follows it)"""
+        if self.job is not None:
+            job, self.job = self.job, None
+            trailer_downloads().release(job, self._listener)
 
 class FilmViewDialog(QDialog):
     """Detailed film view with integrated VLC playback"""
 
+    # Launch failure reported by the player thread
+    player_error = pyqtSignal(str)
+
     def __init__(self, film, parent=None):
         super().__init__(parent)
         self.film = film
         self.video_path = None
-        self.download_thread = None
-        self.vlc_process = None
+        # Trailer download (shared with other dialogs of the same film)
+        self.download = DownloadWatcher(self)
+        self.download.updated.connect(self.on_download_update)
+        self.player_error.connect(lambda message: self.download_error(f"VLC launch error: {message}"))
+        self.play_when_ready = False
+        self.playing = False
 
         self.setWindowTitle(f"Film Finder - {film.title}")
         self.setMinimumSize(900, 700)
@@ -951,69 +1381,79 @@ class FilmViewDialog(QDialog):
         if not self.film.trailer_url:
             return
 
+        # Already downloaded (replay, or another dialog of the same film): play right away
+        cached_path = trailer_cache().get(self.film.trailer_url, TRAILER_QUALITY)
+        if cached_path:
+            self.launch_vlc(cached_path)
+            return
+        # Replay while the first download is still running (or not yet moved to the cache): same local stream
+        job = self.download.job
+        if job is not None and job.status in (DownloadJob.DOWNLOADING, DownloadJob.DONE) and job.stream_url:
+            self.launch_vlc(job.stream_url)
+            return
+
         # Disable button during download
         self.download_btn.setEnabled(False)
         self.status_label.setText("📥 Preparing download...")
 
-        # Launch download in separate thread
-        self.download_thread = VideoDownloadThread(self.film.trailer_url)
-        self.download_thread.progress_signal.connect(self.update_status)
-        self.download_thread.finished_signal.connect(self.launch_vlc)
-        self.download_thread.error_signal.connect(self.download_error)
-        self.download_thread.start()
+        # Playback starts from the local stream once enough is buffered
+        self.play_when_ready = True
+        try:
+            self.download.watch(self.film.trailer_url, label=self.film.title)
+        except Exception as e:
+            self.play_when_ready = False
+            self.download_error(f"❌ Error: {str(e)}")
+
+    def on_download_update(self, job):
+        """Progress of the trailer download (GUI thread)"""
+        if job is not self.download.job:
+            return  # update queued before the dialog let go of that download
+        if job.status == DownloadJob.DONE:
+            # No cache path yet if the player kept the file open (Windows): keep streaming it
+            self.download_finished(job.path or job.stream_url)
+        elif job.status in (DownloadJob.FAILED, DownloadJob.CANCELLED):
+            self.play_when_ready = False
+            self.download_error(describe_download(job))
+        else:
+            if self.play_when_ready and job.stream_url:
+                self.play_when_ready = False
+                self.launch_vlc(job.stream_url)
+            self.update_status(describe_download(job))
 
     def update_status(self, message):
         """Update download status"""
-        self.status_label.setText(message)
+        if not self.playing:
+            self.status_label.setText(message)
+
+    def download_finished(self, video_path):
+        """The whole trailer is in the cache (next plays start from the file)"""
+        self.video_path = video_path
+        if self.play_when_ready:
+            self.play_when_ready = False
+            self.launch_vlc(video_path)
+        elif self.playing:
+            self.status_label.setText("✅ Trailer downloaded and kept in cache for next time.")
 
     def launch_vlc(self, video_path):
-        """Launch VLC with downloaded video"""
+        """Play the trailer in the shared VLC (cached file, or local stream URL while downloading)"""
+        player = player_service()
+        if player.executable is None:
+            self.download_error("VLC not found. Install VLC or use browser button.")
+            return
         try:
             self.video_path = video_path
-            self.status_label.setText("🚀 Launching VLC...")
-
-            # Convert path for Windows if under WSL
-            if os.name == 'posix' and '/mnt/c/' in video_path:
-                vlc_path = video_path.replace("/mnt/c/", "C:\\").replace("/", "\\")
-            else:
-                vlc_path = video_path
-
-            # Look for VLC in common locations
-            vlc_executable = "/mnt/c/Program Files/VideoLAN/VLC/vlc.exe"
+            # Queued to the player thread: VLC start-up never blocks the dialog
+            player.play(video_path, on_error=self.player_error.emit)
+            self.playing = True
+            self.status_label.setText("✅ VLC launched! Video kept in cache for next time.")
 
-            if vlc_executable:
-                # Launch VLC
-                self.vlc_process = subprocess.Popen([vlc_executable, vlc_path])
-                self.status_label.setText("✅ VLC launched! Video will be deleted on close.")
-
-                # Re-enable button
-                self.download_btn.setEnabled(True)
-                self.download_btn.setText("🎬 Play Trailer Again")
-            else:
-                self.download_error("VLC not found. Install VLC or use browser button.")
+            # Re-enable button
+            self.download_btn.setEnabled(True)
+            self.download_btn.setText("🎬 Play Trailer Again")
 
         except Exception as e:
             self.download_error(f"VLC launch error: {str(e)}")
 
-    def find_vlc(self):
-        """Find VLC executable"""
-        possible_paths = [
-            # Windows
-            "C:\\Program Files\\VideoLAN\\VLC\\vlc.exe",
-            "C:\\Program Files (x86)\\VideoLAN\\VLC\\vlc.exe",
-            # Linux
-            "/usr/bin/vlc",
-            "/usr/local/bin/vlc",
-            # WSL
-            "/mnt/c/Program Files/VideoLAN/VLC/vlc.exe",
-            "/mnt/c/Program Files (x86)/VideoLAN/VLC/vlc.exe",
-        ]
-
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        return None
-
     def download_error(self, error_message):
         """Handle download errors"""
         self.status_label.setText(error_message)
@@ -1032,10 +1472,19 @@ class FilmViewDialog(QDialog):
         """Load poster image"""
         poster_path = getattr(self.film, 'poster_path', '')
 
-        if poster_path and os.path.exists(poster_path):
-            pixmap = QPixmap(poster_path)
-            scaled_pixmap = pixmap.scaled(280, 420, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            poster_label.setPixmap(scaled_pixmap)
+        if poster_path:
+            poster_label.setText("Loading...")
+            poster_loader().request(
+                poster_path, 280, 420, lambda image: self.set_poster(poster_label, image),
+                crop=False, owner=poster_label
+            )
+        else:
+            self.set_poster(poster_label, None)
+
+    def set_poster(self, poster_label, pixmap):
+        """Show the poster decoded in the background, or a placeholder"""
+        if pixmap is not None:
+            poster_label.setPixmap(pixmap)
         else:
             placeholder = QPixmap(280, 420)
             placeholder.fill(QColor('#2d2d2d'))
@@ -1048,30 +1497,109 @@ class FilmViewDialog(QDialog):
 
             poster_label.setPixmap(placeholder)
 
-    def close_dialog(self):
-        """Close dialog and clean temporary files"""
-        # Stop download thread if running
-        if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.terminate()
-            self.download_thread.wait()
-
-        # Delete temporary video file
-        if self.video_path and os.path.exists(self.video_path):
-            try:
-                os.remove(self.video_path)
-                print(f"✅ Temporary file deleted: {self.video_path}")
-            except Exception as e:
-                print(f"⚠️ Cannot delete file: {e}")
+    def done(self, result):
+        """However the dialog closes (button or window X): stop the trailer and let go of the download
 
-        # Close VLC if still open
-        if self.vlc_process:
-            try:
-                self.vlc_process.terminate()
-            except:
-                pass
+        The player stops first, since the local stream URL it may be reading
+        goes away with the download (cancelled if no other dialog follows it).
+        VLC itself stays open, ready for the next trailer.
+        """
+        if self.playing:
+            self.playing = False
+            player_service().stop()
+        self.download.release()
+        super().done(result)
 
+    def close_dialog(self):
+        """Close dialog (the trailer stays in the cache)"""
         self.accept()
 
+class DownloadsDialog(QDialog):
+    """Queue view of the trailer downloads (waiting, running, recently finished)"""
+
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Film Finder - Downloads")
+        self.setMinimumSize(600, 400)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #141414;
+                color: #ffffff;
+            }
+            QListWidget {
+                background-color: #2d2d2d;
+                border: 2px solid #404040;
+                border-radius: 8px;
+                padding: 10px;
+                color: #ffffff;
+                font-size: 14px;
+                outline: none;
+            }
+            QListWidget::item {
+                padding: 8px 10px;
+            }
+            QListWidget::item:selected {
+                background-color: #e50914;
+            }
+            QPushButton {
+                background-color: #e50914;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 10px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #f40612;
+            }
+        """)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        self.job_list = QListWidget()
+        layout.addWidget(self.job_list)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        cancel_btn = QPushButton("⏹ Cancel Download")
+        cancel_btn.clicked.connect(self.cancel_selected)
+        button_layout.addWidget(cancel_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        # Polled rather than wired to every download: the view only lives while it is open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        selected = self.job_list.currentItem()
+        selected_job = selected.data(Qt.UserRole) if selected else None
+        self.job_list.clear()
+        jobs = trailer_downloads().jobs()
+        if not jobs:
+            self.job_list.addItem("No trailer downloads yet")
+            return
+        for job in jobs:
+            item = QListWidgetItem(f"{job.label}  —  {describe_download(job)}")
+            item.setData(Qt.UserRole, job)
+            self.job_list.addItem(item)
+            if job is selected_job:
+                self.job_list.setCurrentItem(item)
+
+    def cancel_selected(self):
+        item = self.job_list.currentItem()
+        job = item.data(Qt.UserRole) if item else None
+        if job is not None and not job.finished:
+            trailer_downloads().cancel(job)
+            self.refresh()
+
 class FilmEditDialog(QDialog):
     """Dialog to propose a new film (or edit if needed)."""
 
@@ -1182,6 +1710,8 @@ class FilmEditDialog(QDialog):
             dest_path = os.path.join(poster_dest_dir, filename)
             try:
                 shutil.copyfile(poster, dest_path)
+                # A poster of the same name may already be shown (and cached in memory)
+                poster_loader().invalidate(dest_path)
                 film_data['poster_path'] = dest_path
             except Exception as e:
                 QMessageBox.warning(self, 'Warning', f"Cannot copy poster: {e}")
@@ -1314,42 +1844,30 @@ class AdminApprovalDialog(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
 
-        # List of pending films
+        # List of pending films (Ctrl/Shift-click to select many)
         self.pending_list = QListWidget()
-        self.pending_list.setSelectionMode(QListWidget.SingleSelection)
-
-        pending_films = self.film_controller.get_pending_films()
-        if pending_films:
-            for film in pending_films:
-                item_text = f"🎬 {film.title}\n   📅 {film.release_date} | 🎭 {film.genre}"
-                if hasattr(film, 'description') and film.description:
-                    # Limit description to 100 characters
-                    desc = film.description[:100] + "..." if len(film.description) > 100 else film.description
-                    item_text += f"\n   📝 {desc}"
-
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.UserRole, film)
-
-                # Custom style for item
-                item.setSizeHint(QSize(0, 80))  # Fixed height for each item
-                self.pending_list.addItem(item)
-        else:
-            # Message when no pending films
-            no_films_item = QListWidgetItem("No films pending approval")
-            no_films_item.setFlags(Qt.NoItemFlags)  # Make non-selectable
-            no_films_item.setTextAlignment(Qt.AlignCenter)
-            no_films_item.setSizeHint(QSize(0, 60))
-            self.pending_list.addItem(no_films_item)
-
+        self.pending_list.setSelectionMode(QListWidget.ExtendedSelection)
         layout.addWidget(self.pending_list)
 
         # Container for buttons
         button_layout = QHBoxLayout()
 
-        approve_btn = QPushButton("✅ Approve Film")
+        approve_btn = QPushButton("✅ Approve Selected")
         approve_btn.clicked.connect(self.approve_selected)
         approve_btn.setIcon(QIcon.fromTheme("dialog-ok-apply"))
 
+        select_all_btn = QPushButton("☑️ Select All")
+        select_all_btn.clicked.connect(self.pending_list.selectAll)
+        select_all_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #17a2b8;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #138496;
+            }
+        """)
+
         close_btn = QPushButton("🚪 Close")
         close_btn.clicked.connect(self.accept)
         close_btn.setStyleSheet("""
@@ -1363,14 +1881,15 @@ class AdminApprovalDialog(QDialog):
         """)
 
         button_layout.addWidget(approve_btn)
+        button_layout.addWidget(select_all_btn)
         button_layout.addStretch()
         button_layout.addWidget(close_btn)
 
         layout.addLayout(button_layout)
 
         # Status at bottom
-        status_label = QLabel(f"{len(pending_films)} film(s) pending approval")
-        status_label.setStyleSheet("""
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("""
             QLabel {
                 color: #cccccc;
                 font-size: 12px;
@@ -1378,37 +1897,68 @@ class AdminApprovalDialog(QDialog):
                 border-top: 1px solid #404040;
             }
         """)
-        status_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(status_label)
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
 
         self.setLayout(layout)
+        self.load_pending_films()
 
-    def approve_selected(self):
-        current_item = self.pending_list.currentItem()
-        if current_item and current_item.data(Qt.UserRole):
-            film = current_item.data(Qt.UserRole)
-            try:
-                self.film_controller.approve_film(film.id)
-                self.film_approved.emit()
+    def load_pending_films(self):
+        """(Re)fill the list in one pass, without repainting per row"""
+        self.pending_list.setUpdatesEnabled(False)
+        self.pending_list.clear()
+
+        pending_films = self.film_controller.get_pending_films()
+        if pending_films:
+            for film in pending_films:
+                item_text = f"🎬 {film.title}\n   📅 {film.release_date} | 🎭 {film.genre}"
+                if hasattr(film, 'description') and film.description:
+                    # Limit description to 100 characters
+                    desc = film.description[:100] + "..." if len(film.description) > 100 else film.description
+                    item_text += f"\n   📝 {desc}"
+
+                item = QListWidgetItem(item_text)
+                item.setData(Qt.UserRole, film)
+
+                # Custom style for item
+                item.setSizeHint(QSize(0, 80))  # Fixed height for each item
+                self.pending_list.addItem(item)
+        else:
+            # Message when no pending films
+            no_films_item = QListWidgetItem("No films pending approval")
+            no_films_item.setFlags(Qt.NoItemFlags)  # Make non-selectable
+            no_films_item.setTextAlignment(Qt.AlignCenter)
+            no_films_item.setSizeHint(QSize(0, 60))
+            self.pending_list.addItem(no_films_item)
 
-                # Remove item from list
-                self.pending_list.takeItem(self.pending_list.row(current_item))
+        self.pending_list.setUpdatesEnabled(True)
+        self.status_label.setText(f"{len(pending_films)} film(s) pending approval")
 
-                # Success message
-                QMessageBox.information(self, "Success", f"Film '{film.title}' approved successfully!")
+    def approve_selected(self):
+        films = [item.data(Qt.UserRole) for item in self.pending_list.selectedItems()
+                 if item.data(Qt.UserRole)]
+        if not films:
+            QMessageBox.warning(self, "Warning", "Please select at least one film to approve.")
+            return
 
-                # Update status
-                if self.pending_list.count() == 0:
-                    no_films_item = QListWidgetItem("No films pending approval")
-                    no_films_item.setFlags(Qt.NoItemFlags)
-                    no_films_item.setTextAlignment(Qt.AlignCenter)
-                    no_films_item.setSizeHint(QSize(0, 60))
-                    self.pending_list.addItem(no_films_item)
+        # One bulk call: one index update and one save, whatever the selection size
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            results = self.film_controller.validate_films([film.id for film in films], self.by_user)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Error", f"Approval error: {str(e)}")
+            return
+        QApplication.restoreOverrideCursor()
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Approval error: {str(e)}")
+        approved = sum(1 for ok in results.values() if ok)
+        self.load_pending_films()
+        self.film_approved.emit()
+
+        if approved == len(films):
+            QMessageBox.information(self, "Success", f"{approved} film(s) approved successfully!")
         else:
-            QMessageBox.warning(self, "Warning", "Please select a film to approve.")
+            QMessageBox.warning(self, "Warning", f"{approved} of {len(films)} film(s) approved.")
 
 class ManageFilmsDialog(QDialog):
     film_updated = pyqtSignal()
@@ -1517,9 +2067,9 @@ class ManageFilmsDialog(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
 
-        # List of all films
+        # List of all films (Ctrl/Shift-click to moderate many at once)
         self.films_list = QListWidget()
-        self.films_list.setSelectionMode(QListWidget.SingleSelection)
+        self.films_list.setSelectionMode(QListWidget.ExtendedSelection)
         self.films_list.itemSelectionChanged.connect(self.on_film_selected)
 
         self.load_films()
@@ -1610,6 +2160,40 @@ class ManageFilmsDialog(QDialog):
         self.delete_btn.clicked.connect(self.delete_film)
         self.delete_btn.setEnabled(False)
 
+        self.approve_btn = QPushButton("✅ Approve")
+        self.approve_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #28a745;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #218838;
+            }
+            QPushButton:disabled {
+                background-color: #6c757d;
+                color: #cccccc;
+            }
+        """)
+        self.approve_btn.clicked.connect(self.approve_films)
+        self.approve_btn.setEnabled(False)
+
+        self.reject_btn = QPushButton("⛔ Reject")
+        self.reject_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #fd7e14;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #e8590c;
+            }
+            QPushButton:disabled {
+                background-color: #6c757d;
+                color: #cccccc;
+            }
+        """)
+        self.reject_btn.clicked.connect(self.reject_films)
+        self.reject_btn.setEnabled(False)
+
         refresh_btn = QPushButton("🔄 Refresh")
         refresh_btn.setStyleSheet("""
             QPushButton {
@@ -1636,6 +2220,8 @@ class ManageFilmsDialog(QDialog):
 
         button_layout.addWidget(self.update_btn)
         button_layout.addWidget(self.delete_btn)
+        button_layout.addWidget(self.approve_btn)
+        button_layout.addWidget(self.reject_btn)
         button_layout.addStretch()
         button_layout.addWidget(refresh_btn)
         button_layout.addWidget(close_btn)
@@ -1645,6 +2231,7 @@ class ManageFilmsDialog(QDialog):
         self.setLayout(layout)
 
     def load_films(self):
+        self.films_list.setUpdatesEnabled(False)
         self.films_list.clear()
         films = self.film_controller.get_all_films()
 
@@ -1666,11 +2253,20 @@ class ManageFilmsDialog(QDialog):
             no_films_item.setTextAlignment(Qt.AlignCenter)
             no_films_item.setSizeHint(QSize(0, 60))
             self.films_list.addItem(no_films_item)
+        self.films_list.setUpdatesEnabled(True)
+
+    def selected_films(self):
+        return [item.data(Qt.UserRole) for item in self.films_list.selectedItems()
+                if item.data(Qt.UserRole)]
 
     def on_film_selected(self):
-        current_item = self.films_list.currentItem()
-        if current_item and current_item.data(Qt.UserRole):
-            film = current_item.data(Qt.UserRole)
+        films = self.selected_films()
+        # Bulk actions work on any selection, editing needs exactly one film
+        for btn in (self.delete_btn, self.approve_btn, self.reject_btn):
+            btn.setEnabled(bool(films))
+
+        if len(films) == 1:
+            film = films[0]
             self.current_film = film
 
             # Fill fields with film data
@@ -1687,13 +2283,10 @@ class ManageFilmsDialog(QDialog):
             self.poster_input.setText(getattr(film, 'poster_path', ''))
             self.trailer_input.setText(getattr(film, 'trailer_url', ''))
 
-            # Enable buttons
             self.update_btn.setEnabled(True)
-            self.delete_btn.setEnabled(True)
         else:
             self.current_film = None
             self.update_btn.setEnabled(False)
-            self.delete_btn.setEnabled(False)
 
     def update_film(self):
         if not self.current_film:
@@ -1726,42 +2319,102 @@ class ManageFilmsDialog(QDialog):
             QMessageBox.critical(self, "Error", f"Update error: {str(e)}")
 
     def delete_film(self):
-        if not self.current_film:
+        films = self.selected_films()
+        if not films:
             return
 
+        target = f"the film '{films[0].title}'" if len(films) == 1 else f"{len(films)} films"
         reply = QMessageBox.question(
             self,
             "Confirmation",
-            f"Are you sure you want to delete the film '{self.current_film.title}'?",
+            f"Are you sure you want to delete {target}?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                self.film_controller.delete_film(self.current_film.id, self.by_user)
-                QMessageBox.information(self, "Success", "Film deleted successfully!")
+            if self.run_bulk_action(self.film_controller.delete_films, films, "deleted"):
                 self.film_deleted.emit()
-                self.load_films()
                 self.current_film = None
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Deletion error: {str(e)}")
+    def approve_films(self):
+        if self.run_bulk_action(self.film_controller.validate_films, self.selected_films(), "approved"):
+            self.film_updated.emit()
+
+    def reject_films(self):
+        if self.run_bulk_action(self.film_controller.reject_films, self.selected_films(), "rejected"):
+            self.film_updated.emit()
+
+    def run_bulk_action(self, action, films, verb):
+        """Apply a bulk controller action (one index update, one save) and report per-film results"""
+        if not films:
+            return False
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            results = action([film.id for film in films], self.by_user)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Error", f"Error: {str(e)}")
+            return False
+        QApplication.restoreOverrideCursor()
+
+        done = sum(1 for ok in results.values() if ok)
+        self.load_films()
+        if done == len(films):
+            QMessageBox.information(self, "Success", f"{done} film(s) {verb} successfully!")
+        else:
+            QMessageBox.warning(self, "Warning", f"{done} of {len(films)} film(s) {verb}.")
+        return done > 0
 
 class MainWindow(QMainWindow):
     """Main window with Netflix-like interface"""
 
     logout_signal = pyqtSignal()
 
+    # Search results fetched per page as the results grid scrolls
+    SEARCH_PAGE_SIZE = 48
+
     def __init__(self, user):
         super().__init__()
         self.user = user
-        self.film_controller = FilmController()
+        # The catalogue is streamed in batches once the window is built (see start_catalogue_loading)
+        self.film_controller = FilmController(autoload=False)
         self.is_admin = isinstance(user, Admin)  # Check if user is admin
 
         self.setWindowTitle(f'Film Finder - {getattr(user, "username", "Guest")}')
         self.setMinimumSize(1200, 800)
         self.init_ui()
+        self.start_catalogue_loading()
+
+    def start_catalogue_loading(self):
+        """Load the catalogue batch by batch from the event loop, so the first rows show right away"""
+        self._catalogue_loader = self.film_controller.iter_load(progress=self.on_catalogue_progress)
+        self._first_batch_shown = False
+        QTimer.singleShot(0, self.load_next_batch)
+
+    def load_next_batch(self):
+        batch = next(self._catalogue_loader, None)
+        if batch is None:
+            # Done (or finished early by a mutation): final refresh with the whole catalogue
+            self.loading_label.hide()
+            self.netflix_view.load_data()
+            return
+
+        if not self._first_batch_shown:
+            self._first_batch_shown = True
+            self.netflix_view.load_data()
+        QTimer.singleShot(0, self.load_next_batch)
+
+    def on_catalogue_progress(self, done, total):
+        if total:
+            self.loading_label.setText(f"Loading catalogue... {100 * done // total}%")
+
+    def closeEvent(self, event):
+        """Write any coalesced film changes before the window goes away"""
+        self.film_controller.flush()
+        close_trailer_services()
+        super().closeEvent(event)
 
     def init_ui(self):
         central = QWidget()
@@ -1832,6 +2485,10 @@ class MainWindow(QMainWindow):
         user_info.setStyleSheet("color: #888888;")
         footer_layout.addWidget(user_info)
 
+        self.loading_label = QLabel("Loading catalogue...")
+        self.loading_label.setStyleSheet("color: #888888; margin-left: 20px;")
+        footer_layout.addWidget(self.loading_label)
+
         footer_layout.addStretch()
 
         # Button to suggest a film (for all users)
@@ -1853,6 +2510,11 @@ class MainWindow(QMainWindow):
         propose_btn.clicked.connect(self.propose_film)
         footer_layout.addWidget(propose_btn)
 
+        downloads_btn = QPushButton('📥 Downloads')
+        downloads_btn.setStyleSheet(propose_btn.styleSheet())
+        downloads_btn.clicked.connect(self.show_downloads)
+        footer_layout.addWidget(downloads_btn)
+
         logout_btn = QPushButton('Logout')
         logout_btn.setStyleSheet("""
             QPushButton {
@@ -1896,19 +2558,20 @@ class MainWindow(QMainWindow):
             genre = criteria.get('genre')
             year = criteria.get('year')
 
-            # Use existing search_films method
-            films = self.film_controller.search_films(
-                title=title,
-                genre=genre,
-                approved_only=True
-            )
+            search_criteria = {
+                'title': title,
+                'genre': genre,
+                'start_year': year or None,
+                'end_year': year or None,
+                'approved_only': True
+            }
 
-            # Filter by year if specified
-            if year:
-                films = [f for f in films if hasattr(f, 'release_date') and f.release_date.year == year]
+            # Only the first page is fetched; more pages load as the user scrolls
+            page = self.film_controller.search_page(limit=self.SEARCH_PAGE_SIZE, **search_criteria)
+            self.header.set_result_criteria(search_criteria if (title or genre or year) else None)
 
             # Display results
-            self.show_search_results(films, criteria)
+            self.show_search_results(page, search_criteria)
 
         except Exception as e:
             print(f"Search error: {e}")
@@ -1942,8 +2605,8 @@ class MainWindow(QMainWindow):
         """)
         error_msg.exec_()
 
-    def show_search_results(self, films, criteria):
-        """Display search results"""
+    def show_search_results(self, page, criteria):
+        """Display the first page of search results (next pages are fetched on scroll)"""
         # Hide normal Netflix view
         self.netflix_view.hide()
 
@@ -1961,7 +2624,7 @@ class MainWindow(QMainWindow):
         self.search_results_view.setLayout(search_results_layout)
 
         # Results title
-        results_title = QLabel(f"Search Results ({len(films)} movies found)")
+        results_title = QLabel(f"Search Results ({page.total:,} movies found)")
         results_title.setStyleSheet("""
             QLabel {
                 color: #ffffff;
@@ -1993,37 +2656,25 @@ class MainWindow(QMainWindow):
         search_results_layout.addWidget(back_btn)
 
         # Results grid
-        if films:
+        if page.films:
             results_container = QWidget()
             results_layout = QVBoxLayout()
             results_container.setLayout(results_layout)
 
-            results_grid = QWidget()
-            grid_layout = QGridLayout()
-            grid_layout.setSpacing(20)
-            grid_layout.setContentsMargins(20, 20, 20, 20)
-            results_grid.setLayout(grid_layout)
-
-            thumb_w = 180
-            thumb_h = 270
-            cols = 6
-            row = 0
-            col = 0
-
-            for film in films:
-                poster = NetflixPosterCard(film, thumb_w, thumb_h)
-                poster.clicked.connect(self.on_film_clicked)
-                grid_layout.addWidget(poster, row, col)
-
-                col += 1
-                if col >= cols:
-                    col = 0
-                    row += 1
+            # The model fetches further pages itself when the view reaches its last rows
+            self.results_model = SearchResultsModel(
+                self.film_controller, criteria, page, page_size=self.SEARCH_PAGE_SIZE, parent=self.search_results_view
+            )
+            results_grid = PosterGridView(180, 270)
+            results_grid.setModel(self.results_model)
+            results_grid.film_clicked.connect(self.on_film_clicked)
+            results_layout.addWidget(results_grid)
 
-            scroll_area = QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_area.setWidget(results_grid)
-            results_layout.addWidget(scroll_area)
+            self.results_status = QLabel()
+            self.results_status.setStyleSheet("color: #888888; padding: 0px 20px 10px 20px;")
+            results_layout.addWidget(self.results_status)
+            self.results_model.progress.connect(self.update_results_status)
+            self.update_results_status(len(page.films), page.total)
 
             search_results_layout.addWidget(results_container)
         else:
@@ -2042,6 +2693,9 @@ class MainWindow(QMainWindow):
         self.main_layout.insertWidget(1, self.search_results_view)
         self.search_results_view.show()
 
+    def update_results_status(self, shown, total):
+        self.results_status.setText(f"Showing {shown:,} of {total:,}")
+
     def show_main_view(self):
         """Return to main view"""
         if hasattr(self, 'search_results_view'):
@@ -2068,6 +2722,10 @@ class MainWindow(QMainWindow):
         dialog = FilmEditDialog(self.film_controller, self.user, parent=self)
         dialog.exec()
 
+    def show_downloads(self):
+        """Show the trailer downloads queue"""
+        DownloadsDialog(parent=self).exec()
+
     def show_admin_approval_panel(self):
         """Show approval panel for admins"""
         if not self.is_admin:
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage
+
+
+def memory_key(path, width, height, radius=0, crop=True):
+    """Memory cache key of a rendered poster (no filesystem access: looked up on every paint)"""
+    return (os.path.abspath(path), width, height, radius, bool(crop))
+
+
+def poster_key(path, width, height, radius=0, crop=True):
+    """Disk cache key of a rendered poster, or None if the file does not exist
+
+    The modification time is part of the key, so replacing a poster file
+    never serves a stale thumbnail. It costs a stat, so it is only computed
+    by the workers, when a poster is not in memory.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return (os.path.abspath(path), mtime, width, height, radius, bool(crop))
+
+
+class PosterMemoryCache:
+    """LRU of finished pixmaps, bounded by their size in bytes (GUI thread only)"""
+
+    def __init__(self, budget_bytes=64 * 2**20):
+        self.budget_bytes = budget_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key):
+        pixmap = self._entries.get(key)
+        if pixmap is not None:
+            self._entries.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size_bytes -= self.cost(old)
+        cost = self.cost(pixmap)
+        if cost > self.budget_bytes:
+            return
+        self._entries[key] = pixmap
+        self.size_bytes += cost
+        while self.size_bytes > self.budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= self.cost(evicted)
+
+    def discard_path(self, path):
+        """Drop every size rendered from path (see memory_key)"""
+        path = os.path.abspath(path)
+        for key in [key for key in self._entries if key[0] == path]:
+            self.size_bytes -= self.cost(self._entries.pop(key))
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PosterDiskCache:
+    """Pre-scaled thumbnails on disk, shared by the loader threads
+
+    Files are named after a hash of the key and written atomically
+    (temporary file + os.replace). Reading a thumbnail refreshes its
+    modification time; when the directory grows past its budget the least
+    recently used thumbnails are removed.
+    """
+
+    SUFFIX = '.png'
+
+    def __init__(self, cache_dir="data/cache/posters", budget_bytes=128 * 2**20):
+        self.cache_dir = cache_dir
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._size_bytes = None  # measured on the first write
+
+    def path_for(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + self.SUFFIX)
+
+    def load(self, key):
+        path = self.path_for(key)
+        image = QImage(path)
+        if image.isNull():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+
+    def store(self, key, image):
+        path = self.path_for(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if not image.save(tmp_path, 'PNG'):
+                raise OSError(f"cannot write {tmp_path}")
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Poster cache error: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = self._measure()
+            else:
+                self._size_bytes += size
+            if self._size_bytes > self.budget_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(self.SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _measure(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Remove the least recently used thumbnails until 90% of the budget is left"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.budget_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._size_bytes = total
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size_bytes = 0
@@ -0,0 +1,183 @@
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, QRectF, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPixmap
+
+from ui.poster_cache import PosterDiskCache, PosterMemoryCache, memory_key, poster_key
+
+
+def render_poster(path, width, height, radius=0, crop=True):
+    """Decode and scale a poster to a QImage (safe outside the GUI thread)
+
+    crop=True fills width x height (KeepAspectRatioByExpanding, clipped to
+    rounded corners when radius > 0, as the poster cards do); crop=False
+    fits the poster inside width x height. Returns None if the file cannot
+    be decoded.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    mode = Qt.KeepAspectRatioByExpanding if crop else Qt.KeepAspectRatio
+    size = reader.size()
+    target = size.scaled(width, height, mode) if size.isValid() else None
+    if target is not None:
+        # Lets the JPEG decoder skip most of the full-size work
+        reader.setScaledSize(target)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if target is None or image.size() != target:
+        image = image.scaled(width, height, mode, Qt.SmoothTransformation)
+    if not crop:
+        return image
+
+    poster = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    poster.fill(Qt.transparent)
+    painter = QPainter(poster)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    if radius:
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+        painter.setClipPath(path)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return poster
+
+
+class _PosterTask:
+    """State shared between a job and the loader; only the loader writes it"""
+
+    __slots__ = ('key', 'cancelled')
+
+    def __init__(self, key):
+        # (path, width, height, radius, crop), see memory_key
+        self.key = key
+        self.cancelled = False
+
+
+class _PosterSignals(QObject):
+    # (task, QImage or None), QPixmap is only created on the GUI thread
+    done = pyqtSignal(object, object)
+
+
+class PosterJob(QRunnable):
+    def __init__(self, task, signals, disk_cache=None):
+        super().__init__()
+        self.task = task
+        self.signals = signals
+        self.disk_cache = disk_cache
+
+    def run(self):
+        task = self.task
+        if task.cancelled:
+            return
+        # Stat off the GUI thread: None if the file is missing
+        disk_key = poster_key(*task.key)
+        image = self.disk_cache.load(disk_key) if self.disk_cache and disk_key else None
+        if image is None and disk_key is not None:
+            image = render_poster(*task.key)
+            if image is not None and self.disk_cache:
+                self.disk_cache.store(disk_key, image)
+        if not task.cancelled:
+            self.signals.done.emit(task, image)
+
+
+class PosterLoader(QObject):
+    """Decodes posters on a small thread pool and hands the QPixmap back on the GUI thread
+
+    Finished pixmaps are kept in a memory LRU, and pre-scaled thumbnails on
+    disk, so a poster already shown (in this run or a previous one) is not
+    decoded again from the full-size file.
+
+    request() calls the callback with the QPixmap (or None if the file is
+    missing or cannot be decoded): right away on a memory hit, in which case
+    it returns None, otherwise once the worker is done unless the returned
+    ticket was cancelled first. Requests made on behalf of a widget are cancelled when
+    that widget is destroyed. Identical requests share a single job.
+    """
+
+    def __init__(self, max_threads=2, memory_cache=None, disk_cache=None, parent=None):
+        super().__init__(parent)
+        self.memory_cache = memory_cache if memory_cache is not None else PosterMemoryCache()
+        self.disk_cache = disk_cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.signals = _PosterSignals(self)
+        self.signals.done.connect(self.on_done)
+        self._tickets = itertools.count(1)
+        # ticket -> (task, callback)
+        self._callbacks = {}
+        # key -> (task, set of tickets waiting for it)
+        self._waiting = {}
+
+    def cached(self, path, width, height, radius=0, crop=True):
+        """Pixmap from the memory cache, or None"""
+        return self.memory_cache.get(memory_key(path, width, height, radius, crop)) if path else None
+
+    def request(self, path, width, height, callback, radius=0, crop=True, owner=None):
+        if not path:
+            callback(None)
+            return None
+        key = memory_key(path, width, height, radius, crop)
+        pixmap = self.memory_cache.get(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return None
+
+        ticket = next(self._tickets)
+        waiting = self._waiting.get(key)
+        if waiting is None:
+            task = _PosterTask(key)
+            waiting = self._waiting[key] = (task, set())
+            self.pool.start(PosterJob(task, self.signals, self.disk_cache))
+        waiting[1].add(ticket)
+        self._callbacks[ticket] = (waiting[0], callback)
+        if owner is not None:
+            owner.destroyed.connect(lambda *args, ticket=ticket: self.cancel(ticket))
+        return ticket
+
+    def cancel(self, ticket):
+        """Forget a request; its job is dropped once nobody waits for it"""
+        entry = self._callbacks.pop(ticket, None)
+        if entry is None:
+            return
+        task = entry[0]
+        waiting = self._waiting.get(task.key)
+        if waiting is None or waiting[0] is not task:
+            return
+        waiting[1].discard(ticket)
+        if not waiting[1]:
+            del self._waiting[task.key]
+            # Queued jobs return immediately; a running one drops its result
+            task.cancelled = True
+
+    def pending(self):
+        return len(self._callbacks)
+
+    def invalidate(self, path):
+        """The file at path was replaced: drop its pixmaps (thumbnails on disk follow the mtime)"""
+        self.memory_cache.discard_path(path)
+
+    def on_done(self, task, image):
+        waiting = self._waiting.get(task.key)
+        if waiting is None or waiting[0] is not task:
+            return
+        del self._waiting[task.key]
+        pixmap = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+            self.memory_cache.put(task.key, pixmap)
+        for ticket in waiting[1]:
+            callback = self._callbacks.pop(ticket)[1]
+            callback(pixmap)
+
+
+_loader = None
+
+
+def poster_loader():
+    """Shared loader of the application (created on first use, needs a QApplication)"""
+    global _loader
+    if _loader is None:
+        _loader = PosterLoader(disk_cache=PosterDiskCache())
+    return _loader